@@ -4,6 +4,7 @@ import asyncio
 import os
 import logging
 from config.settings import BotConfig
+from utils.jobs import JobManager
 
 # Configuration du logging pour Render
 logging.basicConfig(
@@ -24,6 +25,7 @@ class FrenchBot(commands.Bot):
             case_insensitive=True
         )
         self.config = BotConfig()
+        self.jobs = JobManager()
         
     async def setup_hook(self):
         """Chargement des cogs au démarrage"""
@@ -32,6 +34,8 @@ class FrenchBot(commands.Bot):
             'cogs.moderation',
             'cogs.configuration', 
             'cogs.anti_spam',
+            'cogs.ban_sync',
+            'cogs.backup',
             'cogs.utility'
         ]
         
@@ -1,8 +1,8 @@
 import discord
 from discord.ext import commands
 from utils.embeds import EmbedBuilder
+from utils.links import find_links
 from datetime import datetime
-import re
 from typing import List
 
 class AntiSpam(commands.Cog):
@@ -11,14 +11,6 @@ class AntiSpam(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         
-        # Patterns pour détecter les liens
-        self.url_patterns = [
-            re.compile(r'https?://(?:[-\w.])+(?:\:[0-9]+)?(?:/(?:[\w/_.])*(?:\?(?:[\w&=%.])*)?(?:\#(?:[\w.])*)?)?'),
-            re.compile(r'www\.(?:[-\w.])+(?:\:[0-9]+)?(?:/(?:[\w/_.])*(?:\?(?:[\w&=%.])*)?(?:\#(?:[\w.])*)?)?'),
-            re.compile(r'(?:discord\.gg|discordapp\.com/invite)/[a-zA-Z0-9]+'),
-            re.compile(r'[a-zA-Z0-9-]+\.(?:com|net|org|fr|be|ca|uk|de|es|it|pl|ru|jp|br|mx|au|nl|se|no|dk|fi|ch|at|pt|gr|cz|hu|bg|ro|hr|sk|si|ee|lv|lt|ie|lu|mt|cy)(?:/[^\s]*)?')
-        ]
-        
         # Domaines autorisés par défaut
         self.allowed_domains = [
             'youtube.com', 'youtu.be', 'twitter.com', 'twitch.tv', 
@@ -47,13 +39,7 @@ class AntiSpam(commands.Cog):
     
     def _contains_links(self, content: str) -> List[str]:
         """Détecte les liens dans un message"""
-        found_links = []
-        
-        for pattern in self.url_patterns:
-            matches = pattern.findall(content.lower())
-            found_links.extend(matches)
-        
-        return found_links
+        return find_links(content)
     
     def _is_allowed_domain(self, url: str) -> bool:
         """Vérifie si un domaine est autorisé"""
@@ -70,6 +56,11 @@ class AntiSpam(commands.Cog):
         if message.author.bot or not message.guild:
             return
         
+        # Statistiques d'activité (tous les membres, modérateurs compris), fils comptés dans leur canal parent
+        channel = message.channel
+        channel_id = channel.parent_id if isinstance(channel, discord.Thread) else channel.id
+        self.bot.config.activity.record(message.guild.id, channel_id)
+        
         # Ignorer les modérateurs
         if self._is_moderator(message.author):
             return
@@ -77,17 +68,25 @@ class AntiSpam(commands.Cog):
         guild_config = self.bot.config.get_guild_config(message.guild.id)
         auto_mod = guild_config.get('auto_mod', {})
         
+        # Score de confiance en cache (opt-in): les membres établis sont dispensés de l'analyse des liens
+        trust_level = auto_mod.get('trust_level', 0)
+        trusted = trust_level and self.bot.config.trust.record_message(message.author) >= trust_level
+        
         # Vérification anti-spam
         if auto_mod.get('anti_spam', True):
             await self._check_spam(message, auto_mod)
         
         # Vérification anti-liens
-        if auto_mod.get('anti_links', True):
+        if auto_mod.get('anti_links', True) and not trusted:
             await self._check_links(message)
         
         # Vérification du nombre de mentions
         await self._check_mentions(message, auto_mod)
     
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        self.bot.config.trust.forget(member.guild.id, member.id)
+    
     async def _check_spam(self, message, auto_mod_config):
         """Vérifie le spam de messages"""
         message_limit = auto_mod_config.get('message_limit', 5)
@@ -133,11 +132,16 @@ class AntiSpam(commands.Cog):
             # Supprimer le message
             await message.delete()
             
+            self.bot.config.digest.record_automod(message.guild.id, 'spam', message.author.id)
+            
             # Ajouter un avertissement
             warning_count = self.bot.config.add_warning(message.guild.id, message.author.id)
             
             # Sanctions progressives basées sur le nombre d'avertissements
             action_taken = await self._apply_progressive_punishment(message.author, warning_count, reason)
+            await self.bot.config.cases.add(
+                message.guild.id, 'automod', message.author, self.bot.user, f"{action_taken} - {reason}"
+            )
             
             # Log de l'action
             logs_channel = self._get_logs_channel(message.guild)
@@ -171,12 +175,16 @@ class AntiSpam(commands.Cog):
         try:
             await message.delete()
             
+            self.bot.config.digest.record_automod(message.guild.id, 'links', message.author.id)
             warning_count = self.bot.config.add_warning(message.guild.id, message.author.id)
             action_taken = await self._apply_progressive_punishment(
                 message.author, 
                 warning_count, 
                 "Lien non autorisé"
             )
+            await self.bot.config.cases.add(
+                message.guild.id, 'automod', message.author, self.bot.user, f"{action_taken} - Lien non autorisé"
+            )
             
             # Log de l'action
             logs_channel = self._get_logs_channel(message.guild)
@@ -208,12 +216,16 @@ class AntiSpam(commands.Cog):
         try:
             await message.delete()
             
+            self.bot.config.digest.record_automod(message.guild.id, 'mentions', message.author.id)
             warning_count = self.bot.config.add_warning(message.guild.id, message.author.id)
             action_taken = await self._apply_progressive_punishment(
                 message.author, 
                 warning_count, 
                 f"Trop de mentions ({mention_count}/{max_mentions})"
             )
+            await self.bot.config.cases.add(
+                message.guild.id, 'automod', message.author, self.bot.user, f"{action_taken} - Trop de mentions ({mention_count}/{max_mentions})"
+            )
             
             # Log de l'action
             logs_channel = self._get_logs_channel(message.guild)
@@ -246,6 +258,9 @@ class AntiSpam(commands.Cog):
         try:
             if warning_count >= 5:
                 # 5+ avertissements = bannissement
+                logs = self.bot.get_cog('Logs')
+                if logs:
+                    logs.audit.expect(member.guild.id, discord.AuditLogAction.ban, member.id, self.bot.user, f"Auto-modération: {reason}")
                 await member.ban(reason=f"Auto-modération: {reason} (5+ avertissements)")
                 return "Bannissement automatique"
             
@@ -268,14 +283,10 @@ class AntiSpam(commands.Cog):
                 if mute_role:
                     await member.add_roles(mute_role, reason=f"Auto-modération: {reason} (2 avertissements)")
                     
-                    # Programmer le démute automatique
-                    import asyncio
-                    async def auto_unmute():
-                        await asyncio.sleep(600)  # 10 minutes
-                        if mute_role in member.roles:
-                            await member.remove_roles(mute_role, reason="Fin du mute automatique")
-                    
-                    asyncio.create_task(auto_unmute())
+                    # Programmer le démute automatique (10 minutes) en tâche de fond
+                    moderation = self.bot.get_cog('Moderation')
+                    if moderation:
+                        moderation.schedule_unmute(member, mute_role, 600, self.bot.user, "Fin du mute automatique")
                     return "Mute 10min automatique"
                 else:
                     return "Avertissement (mute non disponible)"
@@ -0,0 +1,120 @@
+import discord
+from discord.ext import commands
+from discord import app_commands
+from utils.embeds import EmbedBuilder
+from utils.checks import is_admin, bot_has_permissions
+from utils.backup import RestorePlan, apply_plan, snapshot_guild, write_backup, list_backups, read_backup
+from cogs.moderation import ConfirmView, MASS_ACTION_CONCURRENCY
+import asyncio
+from typing import Optional
+
+class Backup(commands.Cog):
+    """Sauvegarde et restauration des rôles, canaux et permissions"""
+    
+    backup = app_commands.Group(name="backup", description="Sauvegarde des rôles et des canaux du serveur")
+    
+    def __init__(self, bot):
+        self.bot = bot
+    
+    @backup.command(name="create", description="Sauvegarder les rôles, canaux et permissions")
+    @is_admin()
+    async def backup_create(self, interaction: discord.Interaction):
+        """Écrit une sauvegarde compacte sur disque"""
+        snapshot = snapshot_guild(interaction.guild)
+        name = await asyncio.to_thread(write_backup, interaction.guild.id, snapshot)
+        
+        embed = EmbedBuilder.success(
+            "Sauvegarde créée",
+            f"Sauvegarde `{name}`: **{len(snapshot['roles'])}** rôles et **{len(snapshot['channels'])}** canaux.\n"
+            f"Restauration: `/backup restore name:{name}`",
+            interaction.user
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await self._log_backup(interaction.guild, "Sauvegarde créée", f"Sauvegarde `{name}` créée.", interaction.user)
+    
+    @backup.command(name="list", description="Lister les sauvegardes du serveur")
+    @is_admin()
+    async def backup_list(self, interaction: discord.Interaction):
+        """Liste les sauvegardes disponibles"""
+        names = await asyncio.to_thread(list_backups, interaction.guild.id)
+        embed = EmbedBuilder.info(
+            "Sauvegardes",
+            "\n".join(f"`{name}`" for name in names) or "*Aucune sauvegarde. Utilisez `/backup create`.*"
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @backup.command(name="restore", description="Restaurer les rôles, canaux et permissions d'une sauvegarde")
+    @app_commands.describe(name="Nom de la sauvegarde (la plus récente par défaut)")
+    @is_admin()
+    @bot_has_permissions(manage_roles=True, manage_channels=True)
+    async def backup_restore(self, interaction: discord.Interaction, name: Optional[str] = None):
+        """Compare la sauvegarde au serveur et n'applique que les différences"""
+        guild = interaction.guild
+        if name is None:
+            names = await asyncio.to_thread(list_backups, guild.id)
+            name = names[0] if names else None
+        snapshot = await asyncio.to_thread(read_backup, guild.id, name) if name else None
+        if snapshot is None:
+            embed = EmbedBuilder.error("Sauvegarde introuvable", "Aucune sauvegarde valide ne correspond à ce nom.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        plan = RestorePlan(guild, snapshot)
+        if not plan.total:
+            embed = EmbedBuilder.info("Rien à restaurer", f"Le serveur est identique à la sauvegarde `{name}`.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        embed = EmbedBuilder.warning(
+            "Confirmation requise",
+            f"Restaurer la sauvegarde `{name}`?\n\n"
+            f"Rôles à recréer: **{len(plan.role_creates)}** • à rétablir: **{len(plan.role_edits)}**\n"
+            f"Canaux à recréer: **{len(plan.channel_creates)}** • à rétablir: **{len(plan.channel_edits)}**\n\n"
+            "*Les rôles et canaux créés depuis la sauvegarde ne sont pas supprimés.*"
+        )
+        view = ConfirmView(interaction.user)
+        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+        await view.wait()
+        if not view.value:
+            embed = EmbedBuilder.info("Action annulée", "La restauration a été annulée.")
+            await interaction.edit_original_response(embed=embed, view=None)
+            return
+        
+        status_message = await interaction.edit_original_response(
+            embed=EmbedBuilder.info("Restauration en attente", f"0/{plan.total} modifications..."), view=None
+        )
+        moderator = interaction.user
+        
+        async def run_restore(job):
+            async def report(completed, total):
+                await job.report(f"**{completed}**/{total} modifications appliquées...")
+            
+            done, failed = await apply_plan(plan, f"Restauration `{name}` par {moderator}",
+                                            MASS_ACTION_CONCURRENCY, report)
+            
+            summary = f"Sauvegarde `{name}`: **{done}** modification(s) appliquée(s), {failed} échec(s)."
+            await job.report("Terminé", embed=EmbedBuilder.success("Restauration terminée", summary, moderator), force=True)
+            await self._log_backup(guild, "Sauvegarde restaurée", summary, moderator)
+        
+        self.bot.jobs.submit(guild.id, moderator.id, f"Restauration {name}", run_restore,
+                             message=status_message, fallback=moderator)
+    
+    @backup_restore.autocomplete('name')
+    async def backup_restore_autocomplete(self, interaction: discord.Interaction, current: str):
+        names = await asyncio.to_thread(list_backups, interaction.guild.id)
+        return [app_commands.Choice(name=name, value=name) for name in names if name.startswith(current)][:25]
+    
+    async def _log_backup(self, guild, title, description, moderator):
+        """Log d'une sauvegarde ou d'une restauration"""
+        logs_channel_id = self.bot.config.get_guild_setting(guild.id, 'logs_channel')
+        logs_channel = guild.get_channel(logs_channel_id) if logs_channel_id else None
+        if logs_channel:
+            log_embed = EmbedBuilder.info(title, description)
+            log_embed.add_field(name="👮 Administrateur", value=moderator.mention, inline=True)
+            try:
+                await logs_channel.send(embed=log_embed)
+            except discord.HTTPException:
+                pass
+
+async def setup(bot):
+    await bot.add_cog(Backup(bot))
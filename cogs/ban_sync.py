@@ -0,0 +1,241 @@
+import discord
+from discord.ext import commands, tasks
+from discord import app_commands
+from utils.embeds import EmbedBuilder
+from utils.checks import is_admin, bot_has_permissions
+from cogs.logs import SUMMARY_RELEASE_DELAY
+import asyncio
+import io
+
+# Synchronisation: taille maximale d'un bannissement groupé, période du worker et pause entre deux requêtes
+BAN_SYNC_CHUNK = 200
+BAN_SYNC_INTERVAL = 10
+BAN_SYNC_REQUEST_DELAY = 1.0
+
+class BanSync(commands.Cog):
+    """Partage des bannissements entre les serveurs d'un même groupe"""
+    
+    bangroup = app_commands.Group(name="bangroup", description="Liste de bannissements partagée entre serveurs")
+    
+    def __init__(self, bot):
+        self.bot = bot
+        # guild_id cible -> user_id -> nom du serveur d'origine (dédoublonné avant envoi)
+        self.pending = {}
+        # (guild_id, user_id) bannis par la synchronisation: leur événement n'est pas re-propagé
+        self.synced = set()
+        self.stats = {}  # guild_id -> {'propagated', 'skipped', 'requests'}
+    
+    async def cog_load(self):
+        self.sync_loop.start()
+    
+    async def cog_unload(self):
+        self.sync_loop.cancel()
+    
+    @commands.Cog.listener()
+    async def on_member_ban(self, guild, user):
+        """Met à jour le cache des bannis et propage le bannissement au groupe"""
+        self.bot.config.bans.add(guild.id, user)
+        
+        if (guild.id, user.id) in self.synced:
+            self.synced.discard((guild.id, user.id))
+            return
+        
+        name = self.bot.config.get_ban_group(guild.id)
+        if not name:
+            return
+        
+        for member_id in self.bot.config.ban_groups[name]['members']:
+            if member_id != guild.id and not self.bot.config.bans.is_banned(member_id, user.id):
+                self.pending.setdefault(member_id, {})[user.id] = guild.name
+    
+    @commands.Cog.listener()
+    async def on_member_unban(self, guild, user):
+        """Met à jour le cache des bannis et annule une propagation pas encore envoyée"""
+        self.bot.config.bans.remove(guild.id, user.id)
+        
+        name = self.bot.config.get_ban_group(guild.id)
+        if not name:
+            return
+        for member_id in self.bot.config.ban_groups[name]['members']:
+            queued = self.pending.get(member_id)
+            if queued and queued.get(user.id) == guild.name:
+                del queued[user.id]
+    
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        """Oublie le cache et quitte le groupe quand le bot quitte un serveur"""
+        self.bot.config.bans.drop(guild.id)
+        self.bot.config.leave_ban_group(guild.id)
+        self.pending.pop(guild.id, None)
+        self.stats.pop(guild.id, None)
+    
+    @tasks.loop(seconds=BAN_SYNC_INTERVAL)
+    async def sync_loop(self):
+        """Envoie les bannissements en attente par paquets, serveur par serveur"""
+        for guild_id in list(self.pending):
+            queued = self.pending.pop(guild_id)
+            guild = self.bot.get_guild(guild_id)
+            name = self.bot.config.get_ban_group(guild_id)
+            if not queued or guild is None or name is None or not guild.me.guild_permissions.ban_members:
+                continue
+            
+            banned = await self.bot.config.bans.ensure(guild)
+            if banned is None:
+                continue
+            
+            user_ids = [user_id for user_id in queued if user_id not in banned]
+            self._stats(guild_id)['skipped'] += len(queued) - len(user_ids)
+            if user_ids:
+                await self._apply(guild, name, user_ids, queued)
+    
+    @sync_loop.before_loop
+    async def before_sync_loop(self):
+        await self.bot.wait_until_ready()
+    
+    def _forget_synced(self, guild_id, user_ids):
+        self.synced.difference_update((guild_id, user_id) for user_id in user_ids)
+    
+    def _stats(self, guild_id):
+        return self.stats.setdefault(guild_id, {'propagated': 0, 'skipped': 0, 'requests': 0})
+    
+    async def _apply(self, guild, name, user_ids, sources):
+        """Bannit les utilisateurs par paquets et envoie un seul log récapitulatif"""
+        logs = self.bot.get_cog('Logs')
+        if logs:
+            logs.summarize(guild.id, 'ban', user_ids)
+        
+        reason = f"Liste de bannissements partagée « {name} »"
+        banned = []
+        failed = []
+        for index in range(0, len(user_ids), BAN_SYNC_CHUNK):
+            chunk = [discord.Object(id=user_id) for user_id in user_ids[index:index + BAN_SYNC_CHUNK]]
+            self.synced.update((guild.id, user.id) for user in chunk)
+            try:
+                result = await guild.bulk_ban(chunk, reason=reason, delete_message_seconds=0)
+                banned.extend(result.banned)
+                failed.extend(user.id for user in result.failed)
+                for user in result.banned:
+                    self.bot.config.bans.add(guild.id, user)
+            except discord.HTTPException:
+                failed.extend(user.id for user in chunk)
+            self._stats(guild.id)['requests'] += 1
+            await asyncio.sleep(BAN_SYNC_REQUEST_DELAY)
+        
+        # Même règle de libération que les logs résumés
+        self._forget_synced(guild.id, failed)
+        self.bot.loop.call_later(SUMMARY_RELEASE_DELAY, self._forget_synced, guild.id, user_ids)
+        if logs:
+            logs.end_summary(guild.id, 'ban', user_ids, failed)
+        
+        self._stats(guild.id)['propagated'] += len(banned)
+        if not banned:
+            return
+        
+        logs_channel_id = self.bot.config.get_guild_setting(guild.id, 'logs_channel')
+        logs_channel = guild.get_channel(logs_channel_id) if logs_channel_id else None
+        if logs_channel:
+            origins = sorted({sources[user.id] for user in banned})
+            embed = EmbedBuilder.info(
+                "Synchronisation des bannissements",
+                f"**{len(banned)}** utilisateur(s) banni(s) via le groupe **{name}**."
+            )
+            embed.add_field(name="🌐 Serveurs d'origine", value=", ".join(origins)[:1024], inline=False)
+            ids_file = discord.File(io.BytesIO("\n".join(str(user.id) for user in banned).encode('utf-8')),
+                                    filename="bannissements.txt")
+            try:
+                await logs_channel.send(embed=embed, file=ids_file)
+            except discord.HTTPException:
+                pass
+    
+    @bangroup.command(name="create", description="Créer un groupe de bannissements partagés")
+    @app_commands.describe(name="Nom du groupe")
+    @is_admin()
+    async def bangroup_create(self, interaction: discord.Interaction, name: str):
+        """Crée un groupe et renvoie son code d'accès"""
+        if self.bot.config.get_ban_group(interaction.guild.id):
+            embed = EmbedBuilder.error("Déjà membre", "Ce serveur fait déjà partie d'un groupe. Utilisez `/bangroup leave`.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        if name in self.bot.config.ban_groups:
+            embed = EmbedBuilder.error("Nom indisponible", f"Le groupe **{name}** existe déjà.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        code = self.bot.config.create_ban_group(name, interaction.guild.id)
+        embed = EmbedBuilder.success(
+            "Groupe créé",
+            f"Le groupe **{name}** a été créé.\n"
+            f"Code d'accès: `{code}`\n\n"
+            f"Les autres serveurs le rejoignent avec `/bangroup join name:{name} code:{code}`.",
+            interaction.user
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @bangroup.command(name="join", description="Rejoindre un groupe de bannissements partagés")
+    @app_commands.describe(name="Nom du groupe", code="Code d'accès fourni par le serveur propriétaire")
+    @is_admin()
+    @bot_has_permissions(ban_members=True)
+    async def bangroup_join(self, interaction: discord.Interaction, name: str, code: str):
+        """Ajoute le serveur à un groupe existant"""
+        if self.bot.config.get_ban_group(interaction.guild.id):
+            embed = EmbedBuilder.error("Déjà membre", "Ce serveur fait déjà partie d'un groupe. Utilisez `/bangroup leave`.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        if not self.bot.config.join_ban_group(name, interaction.guild.id, code):
+            embed = EmbedBuilder.error("Accès refusé", "Groupe introuvable ou code invalide.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        members = len(self.bot.config.ban_groups[name]['members'])
+        embed = EmbedBuilder.success(
+            "Groupe rejoint",
+            f"Ce serveur fait maintenant partie du groupe **{name}** ({members} serveurs).\n"
+            "Les prochains bannissements seront partagés.",
+            interaction.user
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @bangroup.command(name="leave", description="Quitter le groupe de bannissements partagés")
+    @is_admin()
+    async def bangroup_leave(self, interaction: discord.Interaction):
+        """Retire le serveur de son groupe"""
+        name = self.bot.config.get_ban_group(interaction.guild.id)
+        if not name:
+            embed = EmbedBuilder.warning("Aucun groupe", "Ce serveur ne fait partie d'aucun groupe.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        self.bot.config.leave_ban_group(interaction.guild.id)
+        self.pending.pop(interaction.guild.id, None)
+        embed = EmbedBuilder.success("Groupe quitté", f"Ce serveur a quitté le groupe **{name}**.", interaction.user)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @bangroup.command(name="status", description="État du groupe de bannissements partagés")
+    @is_admin()
+    async def bangroup_status(self, interaction: discord.Interaction):
+        """Affiche les membres du groupe et l'état de la synchronisation"""
+        name = self.bot.config.get_ban_group(interaction.guild.id)
+        if not name:
+            embed = EmbedBuilder.info("Aucun groupe", "Ce serveur ne fait partie d'aucun groupe. Utilisez `/bangroup create` ou `/bangroup join`.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        group = self.bot.config.ban_groups[name]
+        members = []
+        for guild_id in sorted(group['members']):
+            guild = self.bot.get_guild(guild_id)
+            label = guild.name if guild else str(guild_id)
+            members.append(f"👑 {label}" if guild_id == group['owner'] else label)
+        
+        embed = EmbedBuilder.info("Groupe de bannissements", f"Groupe **{name}** - {len(members)} serveur(s)")
+        embed.add_field(name="🌐 Serveurs", value="\n".join(members)[:1024], inline=False)
+        embed.add_field(name="⏳ En attente ici", value=str(len(self.pending.get(interaction.guild.id, {}))), inline=True)
+        stats = self._stats(interaction.guild.id)
+        embed.add_field(name="🔨 Reçus", value=f"{stats['propagated']} ({stats['requests']} requêtes)", inline=True)
+        embed.add_field(name="♻️ Déjà bannis", value=str(stats['skipped']), inline=True)
+        if group['owner'] == interaction.guild.id:
+            embed.add_field(name="🔑 Code d'accès", value=f"`{group['code']}`", inline=False)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+async def setup(bot):
+    await bot.add_cog(BanSync(bot))
@@ -3,6 +3,7 @@ from discord.ext import commands
 from discord import app_commands
 from utils.embeds import EmbedBuilder
 from utils.checks import is_admin, is_moderator
+from config.settings import LogCategories
 from typing import Literal
 
 class Configuration(commands.Cog):
@@ -93,6 +94,13 @@ class Configuration(commands.Cog):
             inline=True
         )
         
+        trust_level = auto_mod.get('trust_level', 0)
+        embed.add_field(
+            name="🤝 Niveau de confiance",
+            value=f"{trust_level}/100" if trust_level else "*Désactivé*",
+            inline=True
+        )
+        
         # Statut du bot
         status_config = config.get('status', {})
         embed.add_field(
@@ -111,6 +119,7 @@ class Configuration(commands.Cog):
     async def setlogs(self, interaction: discord.Interaction, channel: discord.TextChannel):
         """Configure le canal de logs"""
         self.bot.config.set_guild_setting(interaction.guild.id, 'logs_channel', channel.id)
+        self.bot.dispatch('logs_config_update', interaction.guild.id)
         
         embed = EmbedBuilder.success(
             "Canal de logs configuré",
@@ -119,6 +128,94 @@ class Configuration(commands.Cog):
         )
         await interaction.response.send_message(embed=embed)
     
+    @app_commands.command(name="logcategories", description="Activer ou désactiver une catégorie de logs")
+    @app_commands.describe(
+        category="Catégorie de logs",
+        enabled="Activer ou désactiver la catégorie"
+    )
+    @is_admin()
+    async def logcategories(self, interaction: discord.Interaction,
+                            category: Literal['messages', 'members', 'bans', 'channels', 'roles', 'member_updates', 'voice'],
+                            enabled: bool):
+        """Active ou désactive une catégorie de logs"""
+        bit, label = LogCategories.NAMES[category]
+        mask = self.bot.config.get_guild_setting(interaction.guild.id, 'logs_categories', LogCategories.ALL)
+        mask = mask | bit if enabled else mask & ~bit
+        self.bot.config.set_guild_setting(interaction.guild.id, 'logs_categories', mask)
+        self.bot.dispatch('logs_config_update', interaction.guild.id)
+        
+        lines = [
+            f"{'✅' if mask & flag else '❌'} {name}"
+            for flag, name in LogCategories.NAMES.values()
+        ]
+        embed = EmbedBuilder.success(
+            "Catégories de logs configurées",
+            f"{label} est maintenant **{'activé' if enabled else 'désactivé'}**.\n\n" + "\n".join(lines),
+            interaction.user
+        )
+        await interaction.response.send_message(embed=embed)
+    
+    @app_commands.command(name="settranscript", description="Configurer le format des transcriptions de logs")
+    @app_commands.describe(format="Format des transcriptions de suppressions en masse")
+    @is_admin()
+    async def settranscript(self, interaction: discord.Interaction, format: Literal['txt', 'html']):
+        """Configure le format des transcriptions"""
+        self.bot.config.set_guild_setting(interaction.guild.id, 'logs_transcript_format', format)
+        
+        embed = EmbedBuilder.success(
+            "Format de transcription configuré",
+            f"Les suppressions en masse seront transcrites au format **{format}**.",
+            interaction.user
+        )
+        await interaction.response.send_message(embed=embed)
+    
+    @app_commands.command(name="voicelogs", description="Configurer les logs vocaux")
+    @app_commands.describe(mode="sessions: résumé en fin de session, digest: résumé périodique, live: chaque événement")
+    @is_admin()
+    async def voicelogs(self, interaction: discord.Interaction, mode: Literal['sessions', 'digest', 'live']):
+        """Configure le mode des logs vocaux"""
+        self.bot.config.set_guild_setting(interaction.guild.id, 'logs_voice_mode', mode)
+        
+        descriptions = {
+            'sessions': "un résumé sera envoyé à la fin de chaque session vocale",
+            'digest': "un digest des sessions sera envoyé toutes les 15 minutes",
+            'live': "chaque connexion, déconnexion et changement sera envoyé"
+        }
+        embed = EmbedBuilder.success(
+            "Logs vocaux configurés",
+            f"Mode **{mode}**: {descriptions[mode]}.",
+            interaction.user
+        )
+        await interaction.response.send_message(embed=embed)
+    
+    @app_commands.command(name="burstlogs", description="Configurer le résumé des rafales d'arrivées/départs")
+    @app_commands.describe(
+        threshold="Nombre d'arrivées ou de départs déclenchant le mode résumé",
+        window="Fenêtre de temps en secondes"
+    )
+    @is_admin()
+    async def burstlogs(self, interaction: discord.Interaction, threshold: int = 10, window: int = 30):
+        """Configure la détection des rafales dans les logs"""
+        if threshold < 2 or threshold > 500:
+            embed = EmbedBuilder.error("Paramètre invalide", "Le seuil doit être entre 2 et 500.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        if window < 10 or window > 600:
+            embed = EmbedBuilder.error("Paramètre invalide", "La fenêtre doit être entre 10 et 600 secondes.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        self.bot.config.set_guild_setting(interaction.guild.id, 'logs_burst.threshold', threshold)
+        self.bot.config.set_guild_setting(interaction.guild.id, 'logs_burst.window', window)
+        
+        embed = EmbedBuilder.success(
+            "Rafales configurées",
+            f"Au-delà de **{threshold}** arrivées ou départs en {window} secondes, les logs passent en mode résumé.",
+            interaction.user
+        )
+        await interaction.response.send_message(embed=embed)
+    
     @app_commands.command(name="setmodrole", description="Configurer le rôle de modérateur")
     @app_commands.describe(role="Le rôle de modérateur")
     @is_admin()
@@ -213,6 +310,57 @@ class Configuration(commands.Cog):
         )
         await interaction.response.send_message(embed=embed)
     
+    @app_commands.command(name="trustlevel", description="Configurer le niveau de confiance dispensant de l'analyse des liens")
+    @app_commands.describe(level="Score de confiance requis, de 1 à 100 (0 = désactivé)")
+    @is_admin()
+    async def trustlevel(self, interaction: discord.Interaction, level: int):
+        """Configure le score au-delà duquel les liens ne sont plus analysés"""
+        if level < 0 or level > 100:
+            embed = EmbedBuilder.error("Paramètre invalide", "Le niveau de confiance doit être entre 0 et 100.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        self.bot.config.set_guild_setting(interaction.guild.id, 'auto_mod.trust_level', level)
+        
+        if level:
+            description = (
+                f"Les messages des membres avec un score de confiance d'au moins **{level}**/100 ne passent plus "
+                "par l'analyse des liens (limite de messages et de mentions toujours appliquées).\n*Le score dépend de l'ancienneté, du nombre de messages et des avertissements.*"
+            )
+        else:
+            description = "Tous les membres passent par l'ensemble des vérifications d'auto-modération."
+        embed = EmbedBuilder.success("Niveau de confiance configuré", description, interaction.user)
+        await interaction.response.send_message(embed=embed)
+    
+    @app_commands.command(name="warnconfig", description="Configurer la décroissance des avertissements")
+    @app_commands.describe(
+        half_life_days="Nombre de jours après lesquels un avertissement perd la moitié de son poids (0 = pas de décroissance)",
+        expiry_days="Nombre de jours après lesquels un avertissement est oublié"
+    )
+    @is_admin()
+    async def warnconfig(self, interaction: discord.Interaction, half_life_days: int = 30, expiry_days: int = 90):
+        """Configure la décroissance et l'expiration des avertissements"""
+        if half_life_days < 0 or half_life_days > 365:
+            embed = EmbedBuilder.error("Paramètre invalide", "La demi-vie doit être entre 0 et 365 jours.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        if expiry_days < 1 or expiry_days > 730:
+            embed = EmbedBuilder.error("Paramètre invalide", "L'expiration doit être entre 1 et 730 jours.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        self.bot.config.set_guild_setting(interaction.guild.id, 'warnings.half_life_days', half_life_days)
+        self.bot.config.set_guild_setting(interaction.guild.id, 'warnings.expiry_days', expiry_days)
+        
+        decay = f"perdent la moitié de leur poids tous les **{half_life_days}** jours" if half_life_days else "ne décroissent pas"
+        embed = EmbedBuilder.success(
+            "Avertissements configurés",
+            f"Les avertissements {decay} et expirent après **{expiry_days}** jours.",
+            interaction.user
+        )
+        await interaction.response.send_message(embed=embed)
+    
     @app_commands.command(name="setstatus", description="Configurer le statut du bot")
     @app_commands.describe(
         activity_type="Type d'activité",
@@ -277,8 +425,8 @@ class Configuration(commands.Cog):
             await interaction.edit_original_response(embed=embed, view=None)
         elif view.value:
             # Réinitialiser la configuration
-            if interaction.guild.id in self.bot.config.guilds_config:
-                del self.bot.config.guilds_config[interaction.guild.id]
+            self.bot.config.reset_guild_config(interaction.guild.id)
+            self.bot.dispatch('logs_config_update', interaction.guild.id)
             
             embed = EmbedBuilder.success(
                 "Configuration réinitialisée",
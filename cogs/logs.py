@@ -1,13 +1,144 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
+import io
+from datetime import time, timezone
 from utils.embeds import EmbedBuilder
-from config.settings import Colors
+from utils.transcripts import build_transcript_file
+from utils.voice_sessions import VoiceSessionTracker, format_duration
+from utils.bursts import BurstDetector, account_age_distribution
+from utils.audit import AuditLogCorrelator
+from utils.digest import AUTOMOD_RULES
+from utils.cases import CASE_ACTIONS
+from config.settings import Colors, LogCategories
+
+# Délai avant de réafficher les logs individuels après une action de masse (secondes):
+# les événements de la passerelle arrivent après la réponse de l'API
+SUMMARY_RELEASE_DELAY = 60
+
+# Heure de publication du digest quotidien de modération
+DIGEST_TIME = time(hour=0, tzinfo=timezone.utc)
 
 class Logs(commands.Cog):
     """Module de logs complet pour toutes les activités du serveur"""
     
+    # Écouteurs de chaque catégorie, désinscrits quand aucun serveur ne la veut
+    CATEGORY_LISTENERS = {
+        LogCategories.MESSAGES: ['on_message_delete', 'on_raw_bulk_message_delete', 'on_message_edit'],
+        LogCategories.MEMBERS: ['on_member_join', 'on_member_remove'],
+        LogCategories.BANS: ['on_member_ban', 'on_member_unban'],
+        LogCategories.CHANNELS: ['on_guild_channel_create', 'on_guild_channel_delete', 'on_guild_channel_update'],
+        LogCategories.ROLES: ['on_guild_role_create', 'on_guild_role_delete'],
+        LogCategories.MEMBER_UPDATES: ['on_member_update'],
+        LogCategories.VOICE: ['on_voice_state_update']
+    }
+    
     def __init__(self, bot):
         self.bot = bot
+        self.voice_sessions = VoiceSessionTracker()
+        self.bursts = BurstDetector()
+        self.audit = AuditLogCorrelator()
+        # (guild_id, action) -> IDs dont l'événement est déjà résumé par une action de masse
+        self.summarized_targets = {}
+        self.active_categories = LogCategories.ALL
+    
+    async def cog_load(self):
+        self.voice_digest_loop.start()
+        self.burst_flush_loop.start()
+        self.moderation_digest_loop.start()
+    
+    async def cog_unload(self):
+        self.voice_digest_loop.cancel()
+        self.burst_flush_loop.cancel()
+        self.moderation_digest_loop.cancel()
+    
+    def _wants(self, guild, category):
+        """Vérifie via le masque précalculé si le serveur veut cette catégorie"""
+        return guild is not None and self.bot.config.get_log_mask(guild.id) & category
+    
+    def _refresh_listeners(self):
+        """Inscrit uniquement les écouteurs des catégories voulues par au moins un serveur"""
+        wanted = 0
+        for guild in self.bot.guilds:
+            wanted |= self.bot.config.get_log_mask(guild.id)
+        
+        for category, events in self.CATEGORY_LISTENERS.items():
+            was_active = self.active_categories & category
+            if bool(wanted & category) == bool(was_active):
+                continue
+            
+            for event in events:
+                if wanted & category:
+                    self.bot.add_listener(getattr(self, event), event)
+                else:
+                    self.bot.remove_listener(getattr(self, event), event)
+        
+        self.active_categories = wanted
+    
+    @commands.Cog.listener()
+    async def on_ready(self):
+        self._refresh_listeners()
+    
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        self._refresh_listeners()
+    
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self._refresh_listeners()
+        self.bot.config.digest.drop(guild.id)
+    
+    # Comptage pour le digest: toujours actif, indépendamment des catégories de logs
+    @commands.Cog.listener('on_member_join')
+    async def count_member_join(self, member):
+        self.bot.config.digest.record_join(member.guild.id)
+    
+    @commands.Cog.listener('on_member_remove')
+    async def count_member_remove(self, member):
+        self.bot.config.digest.record_leave(member.guild.id)
+    
+    @commands.Cog.listener()
+    async def on_logs_config_update(self, guild_id):
+        """Événement personnalisé émis par le module de configuration"""
+        self._refresh_listeners()
+    
+    async def _add_attribution(self, embed, guild, action, target_id):
+        """Ajoute l'auteur de l'action (journal d'audit mis en cache) à l'embed"""
+        attribution = await self.audit.attribute(guild, action, target_id)
+        if not attribution:
+            return
+        
+        moderator, reason = attribution
+        if moderator is None:
+            return
+        embed.add_field(name="👮 Par", value=f"{moderator.mention}\n`{moderator}`", inline=True)
+        if reason:
+            embed.add_field(name="📝 Raison", value=reason[:1024], inline=False)
+    
+    def summarize(self, guild_id, action, target_ids):
+        """Masque les logs individuels d'une action de masse (résumée par une seule entrée)"""
+        self.summarized_targets.setdefault((guild_id, action), set()).update(target_ids)
+    
+    def unsummarize(self, guild_id, action, target_ids):
+        """Retire les cibles d'une action de masse (échecs ou fin de l'action)"""
+        targets = self.summarized_targets.get((guild_id, action))
+        if targets is None:
+            return
+        targets.difference_update(target_ids)
+        if not targets:
+            del self.summarized_targets[(guild_id, action)]
+    
+    def end_summary(self, guild_id, action, target_ids, failed_ids=()):
+        """Fin d'une action de masse: les échecs sont libérés tout de suite (aucun événement
+        n'arrivera), les autres cibles après SUMMARY_RELEASE_DELAY"""
+        self.unsummarize(guild_id, action, failed_ids)
+        self.bot.loop.call_later(SUMMARY_RELEASE_DELAY, self.unsummarize, guild_id, action, list(target_ids))
+    
+    def _is_summarized(self, guild_id, action, target_id):
+        targets = self.summarized_targets.get((guild_id, action))
+        if not targets or target_id not in targets:
+            return False
+        self.unsummarize(guild_id, action, [target_id])
+        return True
     
     def _get_logs_channel(self, guild):
         """Récupère le canal de logs configuré"""
@@ -19,6 +150,9 @@ class Logs(commands.Cog):
     @commands.Cog.listener()
     async def on_message_delete(self, message):
         """Log des messages supprimés"""
+        if not self._wants(message.guild, LogCategories.MESSAGES):
+            return
+        
         if message.author.bot:
             return
         
@@ -32,9 +166,49 @@ class Logs(commands.Cog):
         except discord.Forbidden:
             pass
     
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload):
+        """Log des suppressions en masse: une seule transcription au lieu d'un embed par message"""
+        if payload.guild_id is None or not self.bot.config.get_log_mask(payload.guild_id) & LogCategories.MESSAGES:
+            return
+        
+        guild = self.bot.get_guild(payload.guild_id)
+        if not guild:
+            return
+        
+        logs_channel = self._get_logs_channel(guild)
+        if not logs_channel or logs_channel.id == payload.channel_id:
+            return
+        
+        # Les compteurs sont calculés après le filtrage des bots pour correspondre à la transcription
+        cached = [message for message in payload.cached_messages if not message.author.bot]
+        missing = len(payload.message_ids) - len(payload.cached_messages)
+        deleted = len(cached) + missing
+        if not deleted:
+            return
+        channel = guild.get_channel_or_thread(payload.channel_id)
+        
+        fmt = self.bot.config.get_guild_setting(guild.id, 'logs_transcript_format', 'txt')
+        transcript = build_transcript_file(
+            cached,
+            filename=f"suppression-{payload.channel_id}",
+            fmt=fmt,
+            title=f"Suppression en masse - #{channel.name if channel else payload.channel_id}",
+            missing=missing
+        )
+        
+        embed = EmbedBuilder.bulk_delete(channel, deleted, len(cached))
+        try:
+            await logs_channel.send(embed=embed, file=transcript)
+        except discord.Forbidden:
+            pass
+    
     @commands.Cog.listener()
     async def on_message_edit(self, before, after):
         """Log des messages édités"""
+        if not self._wants(before.guild, LogCategories.MESSAGES):
+            return
+        
         if before.author.bot or before.content == after.content:
             return
         
@@ -48,13 +222,30 @@ class Logs(commands.Cog):
         except discord.Forbidden:
             pass
     
+    def _in_burst(self, member, kind):
+        """Enregistre l'événement et le met de côté si le serveur est en rafale"""
+        threshold = self.bot.config.get_guild_setting(member.guild.id, 'logs_burst.threshold', 10)
+        window = self.bot.config.get_guild_setting(member.guild.id, 'logs_burst.window', 30)
+        
+        if not self.bursts.record(member.guild.id, kind, threshold, window):
+            return False
+        
+        self.bursts.add(member.guild.id, kind, window, member.id, str(member), member.created_at)
+        return True
+    
     @commands.Cog.listener()
     async def on_member_join(self, member):
         """Log des arrivées de membres"""
+        if not self._wants(member.guild, LogCategories.MEMBERS):
+            return
+        
         logs_channel = self._get_logs_channel(member.guild)
         if not logs_channel:
             return
         
+        if self._in_burst(member, 'join'):
+            return
+        
         embed = EmbedBuilder.member_join(member)
         try:
             await logs_channel.send(embed=embed)
@@ -64,10 +255,16 @@ class Logs(commands.Cog):
     @commands.Cog.listener()
     async def on_member_remove(self, member):
         """Log des départs de membres"""
+        if not self._wants(member.guild, LogCategories.MEMBERS):
+            return
+        
         logs_channel = self._get_logs_channel(member.guild)
         if not logs_channel:
             return
         
+        if self._in_burst(member, 'leave'):
+            return
+        
         embed = EmbedBuilder.member_leave(member)
         try:
             await logs_channel.send(embed=embed)
@@ -76,7 +273,13 @@ class Logs(commands.Cog):
     
     @commands.Cog.listener()
     async def on_member_ban(self, guild, user):
-        """Log des bannissements (si pas fait par le bot)"""
+        """Log des bannissements avec leur auteur"""
+        if not self._wants(guild, LogCategories.BANS):
+            return
+        
+        if self._is_summarized(guild.id, 'ban', user.id):
+            return
+        
         logs_channel = self._get_logs_channel(guild)
         if not logs_channel:
             return
@@ -93,6 +296,8 @@ class Logs(commands.Cog):
         embed.set_thumbnail(url=user.display_avatar.url)
         embed.set_footer(text=f"ID: {user.id}")
         
+        await self._add_attribution(embed, guild, discord.AuditLogAction.ban, user.id)
+        
         try:
             await logs_channel.send(embed=embed)
         except discord.Forbidden:
@@ -101,6 +306,9 @@ class Logs(commands.Cog):
     @commands.Cog.listener()
     async def on_member_unban(self, guild, user):
         """Log des débannissements"""
+        if not self._wants(guild, LogCategories.BANS):
+            return
+        
         logs_channel = self._get_logs_channel(guild)
         if not logs_channel:
             return
@@ -117,6 +325,8 @@ class Logs(commands.Cog):
         embed.set_thumbnail(url=user.display_avatar.url)
         embed.set_footer(text=f"ID: {user.id}")
         
+        await self._add_attribution(embed, guild, discord.AuditLogAction.unban, user.id)
+        
         try:
             await logs_channel.send(embed=embed)
         except discord.Forbidden:
@@ -125,6 +335,9 @@ class Logs(commands.Cog):
     @commands.Cog.listener()
     async def on_guild_channel_create(self, channel):
         """Log de création de canaux"""
+        if not self._wants(channel.guild, LogCategories.CHANNELS):
+            return
+        
         logs_channel = self._get_logs_channel(channel.guild)
         if not logs_channel or logs_channel == channel:
             return
@@ -140,6 +353,8 @@ class Logs(commands.Cog):
         embed.add_field(name="🏷️ Type", value=channel_type, inline=True)
         embed.add_field(name="🆔 ID", value=str(channel.id), inline=True)
         
+        await self._add_attribution(embed, channel.guild, discord.AuditLogAction.channel_create, channel.id)
+        
         try:
             await logs_channel.send(embed=embed)
         except discord.Forbidden:
@@ -148,6 +363,9 @@ class Logs(commands.Cog):
     @commands.Cog.listener()
     async def on_guild_channel_delete(self, channel):
         """Log de suppression de canaux"""
+        if not self._wants(channel.guild, LogCategories.CHANNELS):
+            return
+        
         logs_channel = self._get_logs_channel(channel.guild)
         if not logs_channel:
             return
@@ -163,6 +381,8 @@ class Logs(commands.Cog):
         embed.add_field(name="🏷️ Type", value=channel_type, inline=True)
         embed.add_field(name="🆔 ID", value=str(channel.id), inline=True)
         
+        await self._add_attribution(embed, channel.guild, discord.AuditLogAction.channel_delete, channel.id)
+        
         try:
             await logs_channel.send(embed=embed)
         except discord.Forbidden:
@@ -171,6 +391,9 @@ class Logs(commands.Cog):
     @commands.Cog.listener()
     async def on_guild_channel_update(self, before, after):
         """Log de modification de canaux"""
+        if not self._wants(after.guild, LogCategories.CHANNELS):
+            return
+        
         logs_channel = self._get_logs_channel(after.guild)
         if not logs_channel:
             return
@@ -205,6 +428,9 @@ class Logs(commands.Cog):
     @commands.Cog.listener()
     async def on_guild_role_create(self, role):
         """Log de création de rôles"""
+        if not self._wants(role.guild, LogCategories.ROLES):
+            return
+        
         logs_channel = self._get_logs_channel(role.guild)
         if not logs_channel:
             return
@@ -219,6 +445,8 @@ class Logs(commands.Cog):
         embed.add_field(name="🎨 Couleur", value=str(role.color), inline=True)
         embed.add_field(name="🆔 ID", value=str(role.id), inline=True)
         
+        await self._add_attribution(embed, role.guild, discord.AuditLogAction.role_create, role.id)
+        
         try:
             await logs_channel.send(embed=embed)
         except discord.Forbidden:
@@ -227,6 +455,9 @@ class Logs(commands.Cog):
     @commands.Cog.listener()
     async def on_guild_role_delete(self, role):
         """Log de suppression de rôles"""
+        if not self._wants(role.guild, LogCategories.ROLES):
+            return
+        
         logs_channel = self._get_logs_channel(role.guild)
         if not logs_channel:
             return
@@ -241,6 +472,8 @@ class Logs(commands.Cog):
         embed.add_field(name="🎨 Couleur", value=str(role.color), inline=True)
         embed.add_field(name="🆔 ID", value=str(role.id), inline=True)
         
+        await self._add_attribution(embed, role.guild, discord.AuditLogAction.role_delete, role.id)
+        
         try:
             await logs_channel.send(embed=embed)
         except discord.Forbidden:
@@ -249,10 +482,17 @@ class Logs(commands.Cog):
     @commands.Cog.listener()
     async def on_member_update(self, before, after):
         """Log des modifications de membres (rôles, pseudo, etc.)"""
+        if not self._wants(after.guild, LogCategories.MEMBER_UPDATES):
+            return
+        
         logs_channel = self._get_logs_channel(after.guild)
         if not logs_channel:
             return
         
+        # Rôles modifiés par une action de masse: déjà résumés par un log unique
+        if self._is_summarized(after.guild.id, 'role_update', after.id) and before.display_name == after.display_name:
+            return
+        
         changes = []
         
         # Changement de pseudo
@@ -294,11 +534,150 @@ class Logs(commands.Cog):
     
     @commands.Cog.listener()
     async def on_voice_state_update(self, member, before, after):
-        """Log des activités vocales"""
+        """Log des activités vocales, agrégées en sessions"""
+        if not self._wants(member.guild, LogCategories.VOICE):
+            return
+        
+        if before.channel == after.channel:
+            return
+        
         logs_channel = self._get_logs_channel(member.guild)
         if not logs_channel:
             return
         
+        mode = self.bot.config.get_guild_setting(member.guild.id, 'logs_voice_mode', 'sessions')
+        if mode == 'live':
+            await self._send_live_voice_event(logs_channel, member, before, after)
+            return
+        
+        guild_id = member.guild.id
+        if before.channel is None:
+            self.voice_sessions.join(guild_id, member.id, after.channel.id)
+            return
+        if after.channel is not None:
+            self.voice_sessions.move(guild_id, member.id, before.channel.id, after.channel.id)
+            return
+        
+        session = self.voice_sessions.leave(guild_id, member.id, before.channel.id)
+        if mode == 'digest':
+            self.voice_sessions.queue_for_digest(guild_id, session)
+            return
+        
+        embed = EmbedBuilder.voice_session(
+            member,
+            self._format_voice_channels(member.guild, session.channels),
+            format_duration(session.duration),
+            session.moves
+        )
+        try:
+            await logs_channel.send(embed=embed)
+        except discord.Forbidden:
+            pass
+    
+    def _format_voice_channels(self, guild, channel_ids):
+        """Mentions des canaux visités (nom brut si le canal n'existe plus)"""
+        channels = []
+        for channel_id in channel_ids:
+            channel = guild.get_channel(channel_id)
+            channels.append(channel.mention if channel else f"`{channel_id}`")
+        return channels
+    
+    @tasks.loop(minutes=15)
+    async def voice_digest_loop(self):
+        """Publie périodiquement le digest des sessions vocales terminées"""
+        for guild_id, sessions in self.voice_sessions.drain_digests().items():
+            guild = self.bot.get_guild(guild_id)
+            if not guild:
+                continue
+            
+            logs_channel = self._get_logs_channel(guild)
+            if not logs_channel:
+                continue
+            
+            lines = []
+            total = 0
+            for session in sessions:
+                member = guild.get_member(session.member_id)
+                name = member.mention if member else f"`{session.member_id}`"
+                channels = ", ".join(self._format_voice_channels(guild, session.channels))
+                lines.append(f"{name} • {format_duration(session.duration)} • {channels}")
+                total += session.duration or 0
+            
+            embed = EmbedBuilder.voice_digest(lines, len(sessions), format_duration(total))
+            try:
+                await logs_channel.send(embed=embed)
+            except discord.Forbidden:
+                pass
+    
+    @tasks.loop(seconds=5)
+    async def burst_flush_loop(self):
+        """Envoie les résumés de rafales dont la fenêtre est écoulée"""
+        for guild_id, kind, summary in self.bursts.due():
+            guild = self.bot.get_guild(guild_id)
+            if not guild:
+                continue
+            
+            logs_channel = self._get_logs_channel(guild)
+            if not logs_channel:
+                continue
+            
+            members = summary['members']
+            seconds = int((summary['until'] - summary['since']).total_seconds())
+            embed = EmbedBuilder.member_burst(
+                kind == 'join',
+                len(members),
+                seconds,
+                account_age_distribution([created_at for _, _, created_at in members]),
+                guild.member_count
+            )
+            
+            ids = "\n".join(f"{member_id}\t{name}" for member_id, name, _ in members)
+            ids_file = discord.File(io.BytesIO(ids.encode('utf-8')), filename=f"{kind}-{guild_id}.txt")
+            try:
+                await logs_channel.send(embed=embed, file=ids_file)
+            except discord.Forbidden:
+                pass
+    
+    @tasks.loop(time=DIGEST_TIME)
+    async def moderation_digest_loop(self):
+        """Publie le digest quotidien à partir des compteurs agrégés (sans relire l'historique)"""
+        for guild_id, counters in self.bot.config.digest.drain().items():
+            guild = self.bot.get_guild(guild_id)
+            if not guild or counters.empty:
+                continue
+            
+            logs_channel = self._get_logs_channel(guild)
+            if not logs_channel:
+                continue
+            
+            actions = [f"{CASE_ACTIONS.get(action, action)}: **{count}**" for action, count in counters.actions.most_common()]
+            automod = [f"{AUTOMOD_RULES.get(rule, rule)}: **{count}**" for rule, count in counters.automod.most_common()]
+            offenders = []
+            for user_id, count in counters.offenders.top():
+                member = guild.get_member(user_id)
+                name = f"{member.mention} `{member}`" if member else f"`{user_id}`"
+                offenders.append(f"{name} • {count}")
+            
+            embed = EmbedBuilder.moderation_digest(actions, automod, offenders, counters.joins, counters.leaves, counters.since)
+            try:
+                await logs_channel.send(embed=embed)
+            except discord.Forbidden:
+                pass
+    
+    @moderation_digest_loop.before_loop
+    async def before_moderation_digest_loop(self):
+        await self.bot.wait_until_ready()
+    
+    @burst_flush_loop.before_loop
+    async def before_burst_flush_loop(self):
+        await self.bot.wait_until_ready()
+    
+    @voice_digest_loop.before_loop
+    async def before_voice_digest_loop(self):
+        await self.bot.wait_until_ready()
+    
+    async def _send_live_voice_event(self, logs_channel, member, before, after):
+        """Log d'une transition vocale en direct (mode live)"""
         # Rejoindre un canal vocal
         if before.channel is None and after.channel is not None:
             embed = discord.Embed(
@@ -1,17 +1,57 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 from utils.embeds import EmbedBuilder
-from utils.checks import is_moderator, is_admin, bot_has_permissions, can_moderate_member, get_mute_role
-from datetime import datetime, timedelta
+from utils.checks import (
+    is_moderator, is_admin, bot_has_permissions, user_has_permissions, can_moderate_member, get_mute_role,
+    apply_mute_overwrite, mute_provisioning
+)
+from utils.purge import StreamingPurger, build_message_filter, compile_user_pattern
+from utils.notifications import DMQueue
+from utils.jobs import JOB_STATUSES
+from utils.transcripts import export_channel_history
+from datetime import datetime, timedelta, timezone
 import asyncio
+import io
+import os
+import re
 from typing import Optional
 
+# Nombre maximal de messages supprimables par /clear
+MAX_CLEAR_AMOUNT = 50000
+
+# Actions de masse: taille maximale d'un bannissement groupé et parallélisme des autres actions
+MASS_BAN_CHUNK = 200
+MASS_ACTION_CONCURRENCY = 5
+
+# Délai maximal accordé au MP de sanction avant une expulsion ou un bannissement (secondes)
+DM_HEAD_START = 1.0
+
 class Moderation(commands.Cog):
     """Module de modération complet"""
     
+    lockdown = app_commands.Group(name="lockdown", description="Verrouillage de tout le serveur")
+    role = app_commands.Group(name="role", description="Gestion des rôles des membres")
+    role_bulk = app_commands.Group(name="bulk", description="Ajouter ou retirer un rôle en masse", parent=role)
+    
     def __init__(self, bot):
         self.bot = bot
+        # guild_id -> {channel_id: overwrite @everyone avant verrouillage (None si absent)}
+        self.lockdown_snapshots = {}
+        self.notifier = DMQueue()
+    
+    async def cog_load(self):
+        self.warning_compaction.start()
+        self.notifier.start()
+    
+    async def cog_unload(self):
+        self.warning_compaction.cancel()
+        self.notifier.stop()
+    
+    @tasks.loop(hours=6)
+    async def warning_compaction(self):
+        """Compacte régulièrement les avertissements expirés pour borner la mémoire"""
+        self.bot.config.compact_warnings()
     
     @app_commands.command(name="kick", description="Expulser un membre du serveur")
     @app_commands.describe(
@@ -28,15 +68,12 @@ class Moderation(commands.Cog):
             return
         
         try:
-            # Envoyer un message privé avant le kick
-            try:
-                dm_embed = EmbedBuilder.warning(
-                    "Expulsion",
-                    f"Vous avez été expulsé du serveur **{interaction.guild.name}**\n\n**Raison:** {reason}"
-                )
-                await member.send(embed=dm_embed)
-            except discord.Forbidden:
-                pass  # L'utilisateur a désactivé les MPs
+            # Message privé via la file d'envoi (léger délai pour qu'il parte avant l'expulsion)
+            dm_embed = EmbedBuilder.warning(
+                "Expulsion",
+                f"Vous avez été expulsé du serveur **{interaction.guild.name}**\n\n**Raison:** {reason}"
+            )
+            await self._notify(member, dm_embed, head_start=DM_HEAD_START)
             
             # Expulser le membre
             await member.kick(reason=f"Par {interaction.user} - {reason}")
@@ -50,7 +87,8 @@ class Moderation(commands.Cog):
             await interaction.response.send_message(embed=embed)
             
             # Log de l'action
-            await self._log_moderation("Expulsion", member, interaction.user, reason)
+            case_id = await self._record_case(interaction.guild, 'kick', member, interaction.user, reason)
+            await self._log_moderation("Expulsion", member, interaction.user, reason, case_id)
             
         except discord.Forbidden:
             embed = EmbedBuilder.error("Permission insuffisante", "Je n'ai pas les permissions pour expulser ce membre.")
@@ -81,17 +119,15 @@ class Moderation(commands.Cog):
             return
         
         try:
-            # Envoyer un message privé avant le ban
-            try:
-                dm_embed = EmbedBuilder.error(
-                    "Bannissement",
-                    f"Vous avez été banni du serveur **{interaction.guild.name}**\n\n**Raison:** {reason}"
-                )
-                await member.send(embed=dm_embed)
-            except discord.Forbidden:
-                pass
+            # Message privé via la file d'envoi (léger délai pour qu'il parte avant le ban)
+            dm_embed = EmbedBuilder.error(
+                "Bannissement",
+                f"Vous avez été banni du serveur **{interaction.guild.name}**\n\n**Raison:** {reason}"
+            )
+            await self._notify(member, dm_embed, head_start=DM_HEAD_START)
             
             # Bannir le membre
+            self._expect_audit(interaction.guild, discord.AuditLogAction.ban, member.id, interaction.user, reason)
             await member.ban(reason=f"Par {interaction.user} - {reason}", delete_message_days=delete_days)
             
             # Réponse de confirmation
@@ -103,7 +139,8 @@ class Moderation(commands.Cog):
             await interaction.response.send_message(embed=embed)
             
             # Log de l'action
-            await self._log_moderation("Bannissement", member, interaction.user, reason)
+            case_id = await self._record_case(interaction.guild, 'ban', member, interaction.user, reason)
+            await self._log_moderation("Bannissement", member, interaction.user, reason, case_id)
             
         except discord.Forbidden:
             embed = EmbedBuilder.error("Permission insuffisante", "Je n'ai pas les permissions pour bannir ce membre.")
@@ -114,7 +151,7 @@ class Moderation(commands.Cog):
     
     @app_commands.command(name="unban", description="Débannir un utilisateur")
     @app_commands.describe(
-        user_id="L'ID de l'utilisateur à débannir",
+        user_id="L'utilisateur banni (nom ou ID)",
         reason="Raison du débannissement"
     )
     @is_moderator()
@@ -123,8 +160,13 @@ class Moderation(commands.Cog):
         """Débannit un utilisateur"""
         try:
             user_id = int(user_id)
-            user = await self.bot.fetch_user(user_id)
+            if self.bot.config.bans.is_banned(interaction.guild.id, user_id) is False:
+                embed = EmbedBuilder.error("Utilisateur non banni", "Cet utilisateur n'est pas banni de ce serveur.")
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+            user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
             
+            self._expect_audit(interaction.guild, discord.AuditLogAction.unban, user.id, interaction.user, reason)
             await interaction.guild.unban(user, reason=f"Par {interaction.user} - {reason}")
             
             embed = EmbedBuilder.success(
@@ -135,7 +177,8 @@ class Moderation(commands.Cog):
             await interaction.response.send_message(embed=embed)
             
             # Log de l'action
-            await self._log_moderation("Débannissement", user, interaction.user, reason)
+            case_id = await self._record_case(interaction.guild, 'unban', user, interaction.user, reason)
+            await self._log_moderation("Débannissement", user, interaction.user, reason, case_id)
             
         except ValueError:
             embed = EmbedBuilder.error("ID invalide", "L'ID utilisateur fourni n'est pas valide.")
@@ -147,6 +190,20 @@ class Moderation(commands.Cog):
             embed = EmbedBuilder.error("Erreur", f"Une erreur s'est produite: {str(e)}")
             await interaction.response.send_message(embed=embed, ephemeral=True)
     
+    @unban.autocomplete('user_id')
+    async def unban_autocomplete(self, interaction: discord.Interaction, current: str):
+        """Suggère les bannis par préfixe de nom ou d'ID depuis l'index en mémoire"""
+        try:
+            # Le premier appel charge la liste des bannis une fois; les suivants répondent depuis la mémoire
+            await asyncio.wait_for(self.bot.config.bans.ensure(interaction.guild), timeout=2.0)
+        except asyncio.TimeoutError:
+            return []
+        
+        return [
+            app_commands.Choice(name=f"{name or 'Inconnu'} ({user_id})"[:100], value=str(user_id))
+            for user_id, name in self.bot.config.bans.search(interaction.guild.id, current)
+        ]
+    
     @app_commands.command(name="mute", description="Rendre muet un membre")
     @app_commands.describe(
         member="Le membre à rendre muet",
@@ -183,17 +240,23 @@ class Moderation(commands.Cog):
                 f"{member.mention} a été rendu muet{duration_text}.",
                 interaction.user
             )
+            
+            progress = mute_provisioning.get(interaction.guild.id)
+            if progress and progress['done'] < progress['total']:
+                embed.add_field(
+                    name="⏳ Configuration du rôle",
+                    value=f"Permissions appliquées sur {progress['done']}/{progress['total']} canaux",
+                    inline=False
+                )
             await interaction.response.send_message(embed=embed)
             
             # Log de l'action
-            await self._log_moderation(f"Mute{duration_text}", member, interaction.user, reason)
+            case_id = await self._record_case(interaction.guild, 'mute', member, interaction.user, reason, duration)
+            await self._log_moderation(f"Mute{duration_text}", member, interaction.user, reason, case_id)
             
-            # Démute automatique si durée spécifiée
+            # Démute automatique programmé en tâche de fond si durée spécifiée
             if duration:
-                await asyncio.sleep(duration * 60)
-                if mute_role in member.roles:
-                    await member.remove_roles(mute_role, reason="Fin du mute temporaire")
-                    await self._log_moderation("Démute automatique", member, self.bot.user, "Fin de la durée")
+                self.schedule_unmute(member, mute_role, duration * 60, interaction.user)
             
         except discord.Forbidden:
             embed = EmbedBuilder.error("Permission insuffisante", "Je n'ai pas les permissions pour modifier les rôles de ce membre.")
@@ -225,7 +288,8 @@ class Moderation(commands.Cog):
             await interaction.response.send_message(embed=embed)
             
             # Log de l'action
-            await self._log_moderation("Démute", member, interaction.user, reason)
+            case_id = await self._record_case(interaction.guild, 'unmute', member, interaction.user, reason)
+            await self._log_moderation("Démute", member, interaction.user, reason, case_id)
             
         except discord.Forbidden:
             embed = EmbedBuilder.error("Permission insuffisante", "Je n'ai pas les permissions pour modifier les rôles de ce membre.")
@@ -264,7 +328,8 @@ class Moderation(commands.Cog):
             await interaction.response.send_message(embed=embed)
             
             # Log de l'action
-            await self._log_moderation(f"Timeout ({duration}min)", member, interaction.user, reason)
+            case_id = await self._record_case(interaction.guild, 'timeout', member, interaction.user, reason, duration)
+            await self._log_moderation(f"Timeout ({duration}min)", member, interaction.user, reason, case_id)
             
         except discord.Forbidden:
             embed = EmbedBuilder.error("Permission insuffisante", "Je n'ai pas les permissions pour mettre ce membre en timeout.")
@@ -272,52 +337,127 @@ class Moderation(commands.Cog):
     
     @app_commands.command(name="clear", description="Supprimer des messages")
     @app_commands.describe(
-        amount="Nombre de messages à supprimer",
-        member="Supprimer uniquement les messages de ce membre (optionnel)"
+        amount=f"Nombre de messages à supprimer (max {MAX_CLEAR_AMOUNT})",
+        member="Supprimer uniquement les messages de ce membre (optionnel)",
+        links="Uniquement les messages contenant des liens",
+        attachments="Uniquement les messages avec pièces jointes",
+        embeds="Uniquement les messages avec embeds",
+        bots="Uniquement les messages de bots",
+        regex="Uniquement les messages correspondant à cette expression régulière",
+        min_mentions="Uniquement les messages avec au moins ce nombre de mentions",
+        before="Uniquement les messages avant cet ID de message",
+        after="Uniquement les messages après cet ID de message"
     )
     @is_moderator()
     @bot_has_permissions(manage_messages=True)
-    async def clear(self, interaction: discord.Interaction, amount: int, member: Optional[discord.Member] = None):
-        """Supprime des messages"""
-        if amount <= 0 or amount > 100:
-            embed = EmbedBuilder.error("Nombre invalide", "Le nombre de messages doit être entre 1 et 100.")
+    async def clear(self, interaction: discord.Interaction, amount: int, member: Optional[discord.Member] = None,
+                    links: bool = False, attachments: bool = False, embeds: bool = False, bots: bool = False,
+                    regex: Optional[str] = None, min_mentions: int = 0,
+                    before: Optional[str] = None, after: Optional[str] = None):
+        """Supprime des messages filtrés en un seul parcours de l'historique"""
+        if amount <= 0 or amount > MAX_CLEAR_AMOUNT:
+            embed = EmbedBuilder.error("Nombre invalide", f"Le nombre de messages doit être entre 1 et {MAX_CLEAR_AMOUNT}.")
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
-        await interaction.response.defer(ephemeral=True)
+        try:
+            pattern = compile_user_pattern(regex) if regex else None
+        except re.error as e:
+            embed = EmbedBuilder.error("Expression invalide", f"L'expression régulière n'est pas valide: {e}")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
         
         try:
-            if member:
-                # Supprimer les messages d'un membre spécifique
-                def check(message):
-                    return message.author == member
-                
-                deleted = await interaction.channel.purge(limit=amount, check=check)
-            else:
-                # Supprimer tous les messages
-                deleted = await interaction.channel.purge(limit=amount)
+            before_id = min(int(before), interaction.id) if before else interaction.id
+            after_id = int(after) if after else None
+        except ValueError:
+            embed = EmbedBuilder.error("ID invalide", "Les IDs de message fournis ne sont pas valides.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        check = build_message_filter(
+            member_id=member.id if member else None,
+            bots=bots,
+            attachments=attachments,
+            embeds=embeds,
+            min_mentions=max(min_mentions, 0),
+            links=links,
+            pattern=pattern
+        )
+        
+        filters = [
+            label for enabled, label in (
+                (links, "liens"), (attachments, "pièces jointes"), (embeds, "embeds"), (bots, "bots"),
+                (regex, f"regex `{regex}`"), (min_mentions > 0, f"{min_mentions}+ mentions"),
+                (before, f"avant {before}"), (after, f"après {after}")
+            ) if enabled
+        ]
+        
+        await interaction.response.defer(ephemeral=True)
+        
+        progress_message = await interaction.followup.send(
+            embed=EmbedBuilder.info("Suppression en cours", f"0/{amount} messages supprimés..."),
+            ephemeral=True,
+            wait=True
+        )
+        
+        channel = interaction.channel
+        moderator = interaction.user
+        
+        async def run_clear(job):
+            async def report(result):
+                await job.report(f"**{result.deleted}**/{amount} messages supprimés ({result.scanned} parcourus)...")
+            
+            purger = StreamingPurger(
+                channel,
+                amount,
+                check=check,
+                before=discord.Object(id=before_id),
+                after=discord.Object(id=after_id) if after_id else None,
+                on_progress=report,
+                reason=f"Par {moderator} - /clear"
+            )
+            
+            try:
+                result = await purger.run()
+            except discord.Forbidden:
+                embed = EmbedBuilder.error("Permission insuffisante", "Je n'ai pas les permissions pour supprimer des messages.")
+                await job.report("Permission insuffisante", embed=embed, force=True)
+                return
+            except asyncio.CancelledError:
+                embed = EmbedBuilder.warning(
+                    "Suppression annulée",
+                    f"**{purger.result.deleted}** messages supprimés avant l'annulation."
+                )
+                await job.report("Annulée", embed=embed, force=True)
+                raise
             
             embed = EmbedBuilder.success(
                 "Messages supprimés",
-                f"**{len(deleted)}** messages ont été supprimés" + (f" de {member.mention}" if member else "") + ".",
-                interaction.user
+                f"**{result.deleted}** messages ont été supprimés" + (f" de {member.mention}" if member else "") + ".\n"
+                f"Messages parcourus: {result.scanned}\n"
+                f"Requêtes: **{result.requests}** (historique: {result.history_requests}, "
+                f"groupées: {result.bulk_requests}, individuelles: {result.single_requests})",
+                moderator
             )
-            await interaction.followup.send(embed=embed, ephemeral=True)
+            await job.report(f"{result.deleted} messages supprimés", embed=embed, force=True)
             
             # Log de l'action
-            logs_channel = self._get_logs_channel(interaction.guild)
+            logs_channel = self._get_logs_channel(channel.guild)
             if logs_channel:
                 log_embed = EmbedBuilder.info(
                     "Messages supprimés en masse",
-                    f"**{len(deleted)}** messages supprimés dans {interaction.channel.mention}" + 
+                    f"**{result.deleted}** messages supprimés dans {channel.mention}" + 
                     (f" de {member.mention}" if member else "")
                 )
-                log_embed.add_field(name="👮 Modérateur", value=interaction.user.mention, inline=True)
+                log_embed.add_field(name="👮 Modérateur", value=moderator.mention, inline=True)
+                if filters:
+                    log_embed.add_field(name="🔍 Filtres", value=", ".join(filters)[:1024], inline=True)
                 await logs_channel.send(embed=log_embed)
-            
-        except discord.Forbidden:
-            embed = EmbedBuilder.error("Permission insuffisante", "Je n'ai pas les permissions pour supprimer des messages.")
-            await interaction.followup.send(embed=embed, ephemeral=True)
+        
+        # La suppression s'exécute en tâche de fond: l'interaction est libérée immédiatement
+        self.bot.jobs.submit(interaction.guild.id, moderator.id, f"/clear dans #{channel}", run_clear,
+                             message=progress_message, fallback=moderator)
     
     @app_commands.command(name="warn", description="Avertir un membre")
     @app_commands.describe(
@@ -335,15 +475,12 @@ class Moderation(commands.Cog):
         # Ajouter l'avertissement
         warning_count = self.bot.config.add_warning(interaction.guild.id, member.id)
         
-        # Envoyer un message privé
-        try:
-            dm_embed = EmbedBuilder.warning(
-                "Avertissement",
-                f"Vous avez reçu un avertissement sur **{interaction.guild.name}**\n\n**Raison:** {reason}\n**Total d'avertissements:** {warning_count}"
-            )
-            await member.send(embed=dm_embed)
-        except discord.Forbidden:
-            pass
+        # Envoyer un message privé (en arrière-plan)
+        dm_embed = EmbedBuilder.warning(
+            "Avertissement",
+            f"Vous avez reçu un avertissement sur **{interaction.guild.name}**\n\n**Raison:** {reason}\n**Total d'avertissements:** {warning_count}"
+        )
+        await self._notify(member, dm_embed)
         
         embed = EmbedBuilder.warning(
             "Membre averti",
@@ -353,18 +490,25 @@ class Moderation(commands.Cog):
         await interaction.response.send_message(embed=embed)
         
         # Log de l'action
-        await self._log_moderation(f"Avertissement ({warning_count})", member, interaction.user, reason)
+        case_id = await self._record_case(interaction.guild, 'warn', member, interaction.user, reason)
+        await self._log_moderation(f"Avertissement ({warning_count})", member, interaction.user, reason, case_id)
     
     @app_commands.command(name="warnings", description="Voir les avertissements d'un membre")
     @app_commands.describe(member="Le membre dont voir les avertissements")
     @is_moderator()
     async def warnings(self, interaction: discord.Interaction, member: discord.Member):
         """Affiche les avertissements d'un membre"""
+        score = self.bot.config.get_warning_score(interaction.guild.id, member.id)
         warning_count = self.bot.config.get_warning_count(interaction.guild.id, member.id)
+        half_life = self.bot.config.get_guild_setting(interaction.guild.id, 'warnings.half_life_days', 30)
+        if half_life:
+            decay = f"Le poids d'un avertissement diminue de moitié tous les {half_life} jours."
+        else:
+            decay = "Le poids des avertissements ne décroît pas."
         
         embed = EmbedBuilder.info(
             "Avertissements",
-            f"{member.mention} a **{warning_count}** avertissement(s)."
+            f"{member.mention} a **{warning_count}** avertissement(s) actif(s) (score: {score:.2f}).\n*{decay}*"
         )
         embed.set_thumbnail(url=member.display_avatar.url)
         
@@ -510,21 +654,171 @@ class Moderation(commands.Cog):
             embed = EmbedBuilder.error("Permission insuffisante", "Je n'ai pas les permissions pour modifier ce canal.")
             await interaction.response.send_message(embed=embed, ephemeral=True)
     
+    @lockdown.command(name="start", description="Verrouiller tous les canaux textuels (ou une catégorie)")
+    @app_commands.describe(
+        category="Catégorie à verrouiller (optionnel, tout le serveur par défaut)",
+        reason="Raison du verrouillage"
+    )
+    @is_moderator()
+    @bot_has_permissions(manage_channels=True)
+    async def lockdown_start(self, interaction: discord.Interaction, category: Optional[discord.CategoryChannel] = None,
+                             reason: str = "Aucune raison spécifiée"):
+        """Verrouille le serveur en sauvegardant les permissions actuelles"""
+        guild = interaction.guild
+        if guild.id in self.lockdown_snapshots:
+            embed = EmbedBuilder.warning("Déjà verrouillé", "Un verrouillage est déjà actif. Utilisez `/lockdown end`.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        # Emplacement réservé avant le premier await: un second /lockdown start concurrent est refusé
+        snapshot = {}
+        self.lockdown_snapshots[guild.id] = snapshot
+        try:
+            await interaction.response.defer()
+        except discord.HTTPException:
+            del self.lockdown_snapshots[guild.id]
+            raise
+        
+        everyone = guild.default_role
+        channels = category.text_channels if category else guild.text_channels
+        
+        # Seuls les canaux dont la permission change sont sauvegardés et modifiés
+        for channel in channels:
+            if channel.overwrites_for(everyone).send_messages is False:
+                continue
+            snapshot[channel.id] = channel.overwrites.get(everyone)
+        
+        full_reason = f"Verrouillage par {interaction.user} - {reason}"
+        
+        async def lock(channel):
+            overwrite = channel.overwrites_for(everyone)
+            overwrite.send_messages = False
+            overwrite.send_messages_in_threads = False
+            await channel.set_permissions(everyone, overwrite=overwrite, reason=full_reason)
+        
+        locked, failed = await self._apply_to_channels(guild, snapshot, lock)
+        for channel_id in failed:
+            snapshot.pop(channel_id, None)
+        
+        scope = f"la catégorie **{category.name}**" if category else "le serveur"
+        if not locked:
+            # Aucun canal modifié: le serveur n'est pas considéré comme verrouillé
+            del self.lockdown_snapshots[guild.id]
+            if failed:
+                embed = EmbedBuilder.error(
+                    "Verrouillage impossible",
+                    f"Aucun canal n'a pu être verrouillé dans {scope} ({len(failed)} échec(s)). Vérifiez mes permissions."
+                )
+            else:
+                embed = EmbedBuilder.info("Rien à verrouiller", f"Tous les canaux de {scope} sont déjà verrouillés.")
+            await interaction.followup.send(embed=embed)
+            return
+        
+        embed = EmbedBuilder.warning(
+            "Serveur verrouillé",
+            f"🔒 **{locked}** canaux verrouillés dans {scope}" + (f" ({len(failed)} échec(s))" if failed else "") +
+            f".\n**Raison:** {reason}\nUtilisez `/lockdown end` pour restaurer les permissions.",
+            interaction.user
+        )
+        await interaction.followup.send(embed=embed)
+        
+        await self._log_lockdown("Serveur verrouillé", f"🔒 **{locked}** canaux verrouillés dans {scope}.", interaction.user, reason)
+    
+    @lockdown.command(name="end", description="Restaurer les permissions d'avant le verrouillage")
+    @app_commands.describe(reason="Raison du déverrouillage")
+    @is_moderator()
+    @bot_has_permissions(manage_channels=True)
+    async def lockdown_end(self, interaction: discord.Interaction, reason: str = "Aucune raison spécifiée"):
+        """Restaure exactement les permissions sauvegardées"""
+        guild = interaction.guild
+        snapshot = self.lockdown_snapshots.get(guild.id)
+        if snapshot is None:
+            embed = EmbedBuilder.warning("Aucun verrouillage", "Aucun verrouillage n'est actif sur ce serveur.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        await interaction.response.defer()
+        
+        everyone = guild.default_role
+        full_reason = f"Fin du verrouillage par {interaction.user} - {reason}"
+        
+        async def restore(channel):
+            await channel.set_permissions(everyone, overwrite=snapshot[channel.id], reason=full_reason)
+        
+        restored, failed = await self._apply_to_channels(guild, snapshot, restore)
+        if failed:
+            self.lockdown_snapshots[guild.id] = {channel_id: snapshot[channel_id] for channel_id in failed}
+        else:
+            del self.lockdown_snapshots[guild.id]
+        
+        embed = EmbedBuilder.success(
+            "Serveur déverrouillé",
+            f"🔓 **{restored}** canaux restaurés" +
+            (f" ({len(failed)} échec(s), relancez `/lockdown end`)" if failed else "") + ".",
+            interaction.user
+        )
+        await interaction.followup.send(embed=embed)
+        
+        await self._log_lockdown("Serveur déverrouillé", f"🔓 **{restored}** canaux restaurés.", interaction.user, reason)
+    
+    async def _log_lockdown(self, title, description, moderator, reason):
+        """Log d'un verrouillage ou déverrouillage du serveur"""
+        logs_channel = self._get_logs_channel(moderator.guild)
+        if logs_channel:
+            log_embed = EmbedBuilder.info(title, description)
+            log_embed.add_field(name="👮 Modérateur", value=moderator.mention, inline=True)
+            log_embed.add_field(name="📝 Raison", value=reason, inline=False)
+            await logs_channel.send(embed=log_embed)
+    
+    async def _apply_to_channels(self, guild, channel_ids, action):
+        """Applique une action aux canaux en parallèle limité; renvoie (réussites, IDs en échec)"""
+        semaphore = asyncio.Semaphore(MASS_ACTION_CONCURRENCY)
+        done = 0
+        failed = []
+        
+        async def run(channel_id):
+            nonlocal done
+            channel = guild.get_channel(channel_id)
+            if channel is None:
+                return
+            async with semaphore:
+                try:
+                    await action(channel)
+                    done += 1
+                except discord.HTTPException:
+                    failed.append(channel_id)
+        
+        await asyncio.gather(*(run(channel_id) for channel_id in list(channel_ids)))
+        return done, failed
+    
     @app_commands.command(name="nuke", description="Supprimer et recréer un canal")
     @app_commands.describe(
         channel="Canal à recréer (optionnel)",
-        reason="Raison de la suppression"
+        reason="Raison de la suppression",
+        export="Archiver l'historique du canal sur disque avant suppression"
     )
     @is_moderator()
     @bot_has_permissions(manage_channels=True)
-    async def nuke(self, interaction: discord.Interaction, channel: Optional[discord.TextChannel] = None, reason: str = "Nettoyage du canal"):
+    async def nuke(self, interaction: discord.Interaction, channel: Optional[discord.TextChannel] = None,
+                   reason: str = "Nettoyage du canal", export: bool = False):
         """Supprime et recrée un canal (nuke)"""
         target_channel = channel or interaction.channel
         
+        # Sans accès à l'historique, l'archive serait vide alors que le canal est détruit
+        permissions = target_channel.permissions_for(interaction.guild.me)
+        if export and not (permissions.read_messages and permissions.read_message_history):
+            embed = EmbedBuilder.error(
+                "Permission insuffisante",
+                f"Je ne peux pas lire l'historique de {target_channel.mention}: l'archivage est impossible."
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
         # Demander confirmation
         embed = EmbedBuilder.warning(
             "Confirmation requise",
-            f"Êtes-vous sûr de vouloir supprimer et recréer {target_channel.mention}?\n\n**⚠️ Tous les messages seront perdus!**"
+            f"Êtes-vous sûr de vouloir supprimer et recréer {target_channel.mention}?\n\n" +
+            ("*L'historique sera archivé avant la suppression.*" if export else "**⚠️ Tous les messages seront perdus!**")
         )
         
         view = ConfirmView(interaction.user)
@@ -541,60 +835,551 @@ class Moderation(commands.Cog):
             await interaction.edit_original_response(embed=embed, view=None)
             return
         
+        moderator = interaction.user
+        guild = interaction.guild
+        status_message = await interaction.edit_original_response(
+            embed=EmbedBuilder.info("Nuke en attente", f"La recréation de {target_channel.mention} va démarrer..."),
+            view=None
+        )
+        
+        async def run_nuke(job):
+            try:
+                archive = None
+                if export:
+                    async def report(count):
+                        await job.report(f"Archivage de l'historique: **{count}** messages...")
+                    
+                    fmt = self.bot.config.get_guild_setting(guild.id, 'logs_transcript_format', 'txt')
+                    archive = await export_channel_history(target_channel, fmt, report)
+                
+                await job.report(f"Recréation de #{target_channel.name}...", force=True)
+                
+                # Copie complète des paramètres (sujet, NSFW, mode lent, permissions, catégorie)
+                new_channel = await target_channel.clone(reason=f"Recréé après nuke par {moderator}")
+                if new_channel.position != target_channel.position:
+                    await new_channel.edit(position=target_channel.position)
+                
+                # Les webhooks sont déplacés vers le nouveau canal plutôt que perdus
+                if guild.me.guild_permissions.manage_webhooks:
+                    for webhook in await target_channel.webhooks():
+                        try:
+                            await webhook.edit(channel=new_channel, reason=f"Nuke par {moderator}")
+                        except discord.HTTPException:
+                            pass
+                
+                # Supprimer l'ancien canal
+                self._expect_audit(guild, discord.AuditLogAction.channel_delete, target_channel.id, moderator, reason)
+                await target_channel.delete(reason=f"Nuke par {moderator} - {reason}")
+                
+                # Message de confirmation dans le nouveau canal
+                nuke_embed = EmbedBuilder.success(
+                    "Canal recréé",
+                    f"💥 Ce canal a été nettoyé par {moderator.mention}.\n**Raison:** {reason}"
+                )
+                await new_channel.send(embed=nuke_embed)
+                await job.report(
+                    f"{new_channel.mention} recréé",
+                    embed=EmbedBuilder.success("Canal recréé", f"{new_channel.mention} a été recréé.", moderator),
+                    force=True
+                )
+                
+                # Log de l'action
+                logs_channel = self._get_logs_channel(guild)
+                if logs_channel and logs_channel != new_channel:
+                    log_embed = EmbedBuilder.moderation("Nuke de canal", new_channel, moderator, reason)
+                    if archive:
+                        path, count = archive
+                        log_embed.add_field(name="🗄️ Historique archivé", value=f"{count} messages\n`{os.path.basename(path)}`", inline=False)
+                    await logs_channel.send(embed=log_embed)
+                
+            except discord.Forbidden:
+                embed = EmbedBuilder.error("Permission insuffisante", "Je n'ai pas les permissions pour supprimer/créer des canaux.")
+                await job.report("Permission insuffisante", embed=embed, force=True)
+        
+        self.bot.jobs.submit(guild.id, moderator.id, f"Nuke de #{target_channel.name}", run_nuke,
+                             message=status_message, fallback=moderator)
+    
+    @app_commands.command(name="massban", description="Bannir en masse (nettoyage après un raid)")
+    @app_commands.describe(
+        ids="IDs d'utilisateurs séparés par des espaces ou des virgules",
+        joined_within="Membres arrivés dans les N dernières minutes",
+        account_younger_than="Comptes créés il y a moins de N jours",
+        name_pattern="Expression régulière sur le nom d'utilisateur ou le pseudo",
+        reason="Raison du bannissement",
+        delete_days="Nombre de jours de messages à supprimer (0-7)"
+    )
+    @is_moderator()
+    @bot_has_permissions(ban_members=True)
+    async def massban(self, interaction: discord.Interaction, ids: Optional[str] = None,
+                      joined_within: Optional[int] = None, account_younger_than: Optional[int] = None,
+                      name_pattern: Optional[str] = None, reason: str = "Nettoyage de raid", delete_days: int = 1):
+        """Bannit en masse les utilisateurs correspondant aux critères"""
+        if delete_days < 0 or delete_days > 7:
+            embed = EmbedBuilder.error("Paramètre invalide", "Le nombre de jours doit être entre 0 et 7.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        targets = await self._select_mass_targets(interaction, ids, joined_within, account_younger_than,
+                                                  name_pattern, members_only=False)
+        if targets is None or not await self._confirm_mass_action(interaction, "bannir", targets):
+            return
+        
+        full_reason = f"Par {interaction.user} - {reason}"
+        logs = self.bot.get_cog('Logs')
+        target_ids = [target.id for target in targets]
+        if logs:
+            logs.summarize(interaction.guild.id, 'ban', target_ids)
+        
+        banned = []
+        failed = []
+        for index in range(0, len(targets), MASS_BAN_CHUNK):
+            chunk = targets[index:index + MASS_BAN_CHUNK]
+            try:
+                result = await interaction.guild.bulk_ban(
+                    chunk, reason=full_reason, delete_message_seconds=delete_days * 86400
+                )
+                # L'API ne renvoie que des IDs: on retrouve les cibles (membres ou utilisateurs en cache)
+                by_id = {target.id: target for target in chunk}
+                for results, objects in ((banned, result.banned), (failed, result.failed)):
+                    for obj in objects:
+                        target = by_id.get(obj.id, obj)
+                        if not isinstance(target, discord.Member):
+                            target = self.bot.get_user(obj.id) or target
+                        results.append(target)
+            except discord.HTTPException:
+                failed.extend(chunk)
+            
+            await interaction.edit_original_response(embed=EmbedBuilder.info(
+                "Bannissement en cours",
+                f"**{len(banned)}**/{len(targets)} utilisateurs bannis..."
+            ), view=None)
+        
+        if logs:
+            logs.end_summary(interaction.guild.id, 'ban', target_ids, [target.id for target in failed])
+        
+        self.bot.config.digest.record_action(interaction.guild.id, 'ban', [target.id for target in banned])
+        await self.bot.config.cases.add_many(interaction.guild.id, 'ban', banned, interaction.user, reason)
+        await self._finish_mass_action(interaction, "Bannissement de masse", banned, failed, reason)
+    
+    @app_commands.command(name="masstimeout", description="Timeout en masse (nettoyage après un raid)")
+    @app_commands.describe(
+        duration="Durée en minutes",
+        ids="IDs de membres séparés par des espaces ou des virgules",
+        joined_within="Membres arrivés dans les N dernières minutes",
+        account_younger_than="Comptes créés il y a moins de N jours",
+        name_pattern="Expression régulière sur le nom d'utilisateur ou le pseudo",
+        reason="Raison du timeout"
+    )
+    @is_moderator()
+    @bot_has_permissions(moderate_members=True)
+    async def masstimeout(self, interaction: discord.Interaction, duration: int, ids: Optional[str] = None,
+                          joined_within: Optional[int] = None, account_younger_than: Optional[int] = None,
+                          name_pattern: Optional[str] = None, reason: str = "Nettoyage de raid"):
+        """Met en timeout en masse les membres correspondant aux critères"""
+        if duration <= 0 or duration > 40320:  # Max 28 jours
+            embed = EmbedBuilder.error("Durée invalide", "La durée doit être entre 1 minute et 28 jours (40320 minutes).")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        targets = await self._select_mass_targets(interaction, ids, joined_within, account_younger_than,
+                                                  name_pattern, members_only=True)
+        if targets is None or not await self._confirm_mass_action(interaction, "mettre en timeout", targets):
+            return
+        
+        until = discord.utils.utcnow() + timedelta(minutes=duration)
+        full_reason = f"Par {interaction.user} - {reason}"
+        semaphore = asyncio.Semaphore(MASS_ACTION_CONCURRENCY)
+        done = []
+        failed = []
+        
+        async def apply_timeout(member):
+            async with semaphore:
+                try:
+                    await member.timeout(until, reason=full_reason)
+                    done.append(member)
+                except discord.HTTPException:
+                    failed.append(member)
+        
+        tasks = [asyncio.create_task(apply_timeout(member)) for member in targets]
+        while True:
+            await asyncio.wait(tasks, timeout=3)
+            if len(done) + len(failed) >= len(targets):
+                break
+            await interaction.edit_original_response(embed=EmbedBuilder.info(
+                "Timeout en cours",
+                f"**{len(done)}**/{len(targets)} membres mis en timeout..."
+            ), view=None)
+        
+        self.bot.config.digest.record_action(interaction.guild.id, 'timeout', [target.id for target in done])
+        await self.bot.config.cases.add_many(interaction.guild.id, 'timeout', done, interaction.user, reason, duration)
+        await self._finish_mass_action(interaction, f"Timeout de masse ({duration}min)", done, failed, reason)
+    
+    @role_bulk.command(name="add", description="Ajouter un rôle à tous les membres filtrés")
+    @app_commands.describe(
+        role="Le rôle à ajouter",
+        has_role="Uniquement les membres ayant ce rôle",
+        joined_before="Uniquement les membres arrivés avant cette date (AAAA-MM-JJ)",
+        include_bots="Inclure les bots (par défaut: humains uniquement)"
+    )
+    @is_moderator()
+    @user_has_permissions(manage_roles=True)
+    @bot_has_permissions(manage_roles=True)
+    async def role_bulk_add(self, interaction: discord.Interaction, role: discord.Role,
+                            has_role: Optional[discord.Role] = None, joined_before: Optional[str] = None,
+                            include_bots: bool = False):
+        """Ajoute un rôle en masse dans une tâche de fond"""
+        await self._role_bulk(interaction, True, role, has_role, joined_before, include_bots)
+    
+    @role_bulk.command(name="remove", description="Retirer un rôle à tous les membres filtrés")
+    @app_commands.describe(
+        role="Le rôle à retirer",
+        has_role="Uniquement les membres ayant ce rôle",
+        joined_before="Uniquement les membres arrivés avant cette date (AAAA-MM-JJ)",
+        include_bots="Inclure les bots (par défaut: humains uniquement)"
+    )
+    @is_moderator()
+    @user_has_permissions(manage_roles=True)
+    @bot_has_permissions(manage_roles=True)
+    async def role_bulk_remove(self, interaction: discord.Interaction, role: discord.Role,
+                               has_role: Optional[discord.Role] = None, joined_before: Optional[str] = None,
+                               include_bots: bool = False):
+        """Retire un rôle en masse dans une tâche de fond"""
+        await self._role_bulk(interaction, False, role, has_role, joined_before, include_bots)
+    
+    async def _role_bulk(self, interaction, add, role, has_role, joined_before, include_bots):
+        """Sélectionne les membres, demande confirmation puis lance la tâche de fond"""
+        guild = interaction.guild
+        if role.is_default() or role.managed or role >= guild.me.top_role:
+            embed = EmbedBuilder.error("Rôle invalide", "Je ne peux pas attribuer ce rôle (rôle géré ou au-dessus du mien).")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        if interaction.user.id != guild.owner_id and role >= interaction.user.top_role:
+            embed = EmbedBuilder.error("Permission refusée", "Ce rôle est au-dessus de votre rôle le plus élevé.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
         try:
-            # Sauvegarder les informations du canal
-            channel_name = target_channel.name
-            channel_topic = target_channel.topic
-            channel_category = target_channel.category
-            channel_position = target_channel.position
-            channel_overwrites = target_channel.overwrites
-            
-            # Supprimer le canal
-            await target_channel.delete(reason=f"Nuke par {interaction.user} - {reason}")
-            
-            # Recréer le canal
-            new_channel = await interaction.guild.create_text_channel(
-                name=channel_name,
-                topic=channel_topic,
-                category=channel_category,
-                position=channel_position,
-                overwrites=channel_overwrites,
-                reason=f"Recréé après nuke par {interaction.user}"
-            )
+            cutoff = datetime.strptime(joined_before, "%Y-%m-%d").replace(tzinfo=timezone.utc) if joined_before else None
+        except ValueError:
+            embed = EmbedBuilder.error("Date invalide", "La date doit être au format AAAA-MM-JJ.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        # Les membres déjà dans l'état voulu sont écartés dès la sélection
+        targets = []
+        skipped = 0
+        for member in guild.members:
+            if member.bot and not include_bots:
+                continue
+            if has_role is not None and has_role not in member.roles:
+                continue
+            if cutoff is not None and (member.joined_at is None or member.joined_at >= cutoff):
+                continue
+            if (role in member.roles) == add:
+                skipped += 1
+                continue
+            targets.append(member)
+        
+        verb = "ajouter" if add else "retirer"
+        if not targets:
+            embed = EmbedBuilder.info("Rien à faire", f"Aucun membre à modifier ({skipped} déjà à jour).")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        filters = [
+            label for enabled, label in (
+                (has_role, f"rôle {has_role.mention if has_role else ''}"),
+                (joined_before, f"arrivés avant le {joined_before}"),
+                (not include_bots, "humains uniquement")
+            ) if enabled
+        ]
+        embed = EmbedBuilder.warning(
+            "Confirmation requise",
+            f"{verb.capitalize()} {role.mention} à **{len(targets)}** membre(s)?\n"
+            f"Déjà à jour: {skipped}\nFiltres: {', '.join(filters) or 'aucun'}"
+        )
+        view = ConfirmView(interaction.user)
+        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+        await view.wait()
+        if not view.value:
+            embed = EmbedBuilder.info("Action annulée", "Aucun rôle n'a été modifié.")
+            await interaction.edit_original_response(embed=embed, view=None)
+            return
+        
+        status_message = await interaction.edit_original_response(
+            embed=EmbedBuilder.info("Modification en attente", f"0/{len(targets)} membres..."), view=None
+        )
+        moderator = interaction.user
+        reason = f"Par {moderator} - /role bulk"
+        
+        async def run_role_bulk(job):
+            logs = self.bot.get_cog('Logs')
+            target_ids = [member.id for member in targets]
+            if logs:
+                logs.summarize(guild.id, 'role_update', target_ids)
             
-            # Message de confirmation dans le nouveau canal
-            nuke_embed = EmbedBuilder.success(
-                "Canal recréé",
-                f"💥 Ce canal a été nettoyé par {interaction.user.mention}.\n**Raison:** {reason}"
-            )
-            await new_channel.send(embed=nuke_embed)
+            remaining = iter(targets)
+            done = []
+            failed = []
             
-            # Log de l'action
-            logs_channel = self._get_logs_channel(interaction.guild)
-            if logs_channel and logs_channel != new_channel:
-                log_embed = EmbedBuilder.moderation("Nuke de canal", new_channel, interaction.user, reason)
-                await logs_channel.send(embed=log_embed)
+            async def worker():
+                # Nombre fixe de workers: le parallélisme reste borné quelle que soit la taille de la sélection
+                for member in remaining:
+                    try:
+                        if add:
+                            await member.add_roles(role, reason=reason)
+                        else:
+                            await member.remove_roles(role, reason=reason)
+                        done.append(member)
+                    except discord.HTTPException:
+                        failed.append(member)
+                    await job.report(f"**{len(done)}**/{len(targets)} membres modifiés ({len(failed)} échec(s))...")
             
-        except discord.Forbidden:
-            embed = EmbedBuilder.error("Permission insuffisante", "Je n'ai pas les permissions pour supprimer/créer des canaux.")
             try:
-                await interaction.edit_original_response(embed=embed, view=None)
-            except:
-                await interaction.followup.send(embed=embed, ephemeral=True)
+                await asyncio.gather(*(worker() for _ in range(MASS_ACTION_CONCURRENCY)))
+            finally:
+                if logs:
+                    logs.end_summary(guild.id, 'role_update', target_ids, [member.id for member in failed])
+                await self._log_role_bulk(guild, moderator, role, add, done, failed, skipped, filters)
+            
+            embed = EmbedBuilder.success(
+                "Rôles modifiés",
+                f"{role.mention}: **{len(done)}** membre(s) modifié(s), {len(failed)} échec(s), {skipped} déjà à jour.",
+                moderator
+            )
+            await job.report("Terminé", embed=embed, force=True)
+        
+        self.bot.jobs.submit(guild.id, moderator.id, f"Rôle {role.name} ({verb})", run_role_bulk,
+                             message=status_message, fallback=moderator)
+    
+    async def _log_role_bulk(self, guild, moderator, role, add, done, failed, skipped, filters):
+        """Log unique d'une modification de rôle en masse"""
+        logs_channel = self._get_logs_channel(guild)
+        if not logs_channel:
+            return
+        
+        log_embed = EmbedBuilder.info(
+            "Rôle ajouté en masse" if add else "Rôle retiré en masse",
+            f"{role.mention}: **{len(done)}** membre(s) modifié(s), {len(failed)} échec(s), {skipped} déjà à jour."
+        )
+        log_embed.add_field(name="👮 Modérateur", value=moderator.mention, inline=True)
+        if filters:
+            log_embed.add_field(name="🔍 Filtres", value=", ".join(filters)[:1024], inline=True)
+        
+        ids = "\n".join(str(member.id) for member in done)
+        ids_file = discord.File(io.BytesIO(ids.encode('utf-8')), filename="membres.txt")
+        try:
+            await logs_channel.send(embed=log_embed, file=ids_file)
+        except discord.HTTPException:
+            pass
+    
+    async def _select_mass_targets(self, interaction, ids, joined_within, account_younger_than,
+                                   name_pattern, members_only):
+        """Sélectionne les cibles d'une action de masse (None si la requête est invalide)"""
+        if not any((ids, joined_within, account_younger_than, name_pattern)):
+            embed = EmbedBuilder.error("Aucun critère", "Indiquez des IDs ou au moins un filtre.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return None
+        
+        try:
+            pattern = compile_user_pattern(name_pattern) if name_pattern else None
+        except re.error as e:
+            embed = EmbedBuilder.error("Expression invalide", f"L'expression régulière n'est pas valide: {e}")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return None
+        
+        guild = interaction.guild
+        now = discord.utils.utcnow()
+        has_filters = any((joined_within, account_younger_than, pattern))
+        
+        if ids:
+            candidates = []
+            for raw_id in dict.fromkeys(re.findall(r'\d{15,20}', ids)):
+                member = guild.get_member(int(raw_id))
+                if member is not None:
+                    candidates.append(member)
+                elif not members_only and not has_filters:
+                    candidates.append(discord.Object(id=int(raw_id)))
+        else:
+            candidates = guild.members
+        
+        joined_cutoff = now - timedelta(minutes=joined_within) if joined_within else None
+        created_cutoff = now - timedelta(days=account_younger_than) if account_younger_than else None
+        
+        targets = []
+        for candidate in candidates:
+            if isinstance(candidate, discord.Member):
+                if candidate.bot or not await can_moderate_member(interaction.user, candidate):
+                    continue
+                if candidate.top_role >= guild.me.top_role:
+                    continue
+                if joined_cutoff and (candidate.joined_at is None or candidate.joined_at < joined_cutoff):
+                    continue
+                if created_cutoff and candidate.created_at < created_cutoff:
+                    continue
+                if pattern and not (pattern.search(candidate.name) or pattern.search(candidate.display_name)):
+                    continue
+            elif candidate.id in (interaction.user.id, guild.owner_id, self.bot.user.id):
+                continue
+            targets.append(candidate)
+        
+        if not targets:
+            embed = EmbedBuilder.warning("Aucune cible", "Aucun utilisateur ne correspond à ces critères.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return None
+        
+        return targets
+    
+    async def _confirm_mass_action(self, interaction, verb, targets):
+        """Affiche l'aperçu d'une action de masse et attend la confirmation"""
+        preview = "\n".join(
+            f"`{target}` ({target.id})" if isinstance(target, discord.Member) else f"`{target.id}`"
+            for target in targets[:15]
+        )
+        if len(targets) > 15:
+            preview += f"\n... et {len(targets) - 15} autre(s)"
+        
+        embed = EmbedBuilder.warning(
+            "Confirmation requise",
+            f"Voulez-vous vraiment **{verb} {len(targets)}** utilisateur(s)?\n\n{preview}"
+        )
+        view = ConfirmView(interaction.user)
+        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+        await view.wait()
+        
+        if not view.value:
+            embed = EmbedBuilder.info("Action annulée", "Aucune sanction n'a été appliquée.")
+            await interaction.edit_original_response(embed=embed, view=None)
+            return False
+        
+        await interaction.edit_original_response(
+            embed=EmbedBuilder.info("Exécution en cours", f"0/{len(targets)}..."), view=None
+        )
+        return True
     
-    async def _log_moderation(self, action: str, target, moderator, reason: str):
+    async def _finish_mass_action(self, interaction, action, done, failed, reason):
+        """Réponse finale et log unique d'une action de masse"""
+        embed = EmbedBuilder.success(
+            action,
+            f"**{len(done)}** utilisateur(s) sanctionné(s)" + (f", **{len(failed)}** échec(s)" if failed else "") + ".",
+            interaction.user
+        )
+        await interaction.edit_original_response(embed=embed, view=None)
+        
+        logs_channel = self._get_logs_channel(interaction.guild)
+        if logs_channel:
+            log_embed = EmbedBuilder.info(action, f"**{len(done)}** utilisateur(s) sanctionné(s), {len(failed)} échec(s).")
+            log_embed.add_field(name="👮 Modérateur", value=interaction.user.mention, inline=True)
+            log_embed.add_field(name="📝 Raison", value=reason, inline=False)
+            
+            ids = "\n".join(str(target.id) for target in done)
+            ids_file = discord.File(io.BytesIO(ids.encode('utf-8')), filename="sanctions.txt")
+            await logs_channel.send(embed=log_embed, file=ids_file)
+    
+    @app_commands.command(name="case", description="Afficher un dossier de modération")
+    @app_commands.describe(case_id="Numéro du dossier")
+    @is_moderator()
+    async def case(self, interaction: discord.Interaction, case_id: int):
+        """Affiche un dossier de modération"""
+        case = await self.bot.config.cases.get(interaction.guild.id, case_id)
+        if case is None:
+            embed = EmbedBuilder.error("Dossier introuvable", f"Aucun dossier #{case_id} sur ce serveur.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        await interaction.response.send_message(embed=EmbedBuilder.case_detail(case))
+    
+    @app_commands.command(name="history", description="Historique de modération d'un utilisateur")
+    @app_commands.describe(user="L'utilisateur dont voir l'historique")
+    @is_moderator()
+    async def history(self, interaction: discord.Interaction, user: discord.User):
+        """Affiche l'historique paginé des sanctions d'un utilisateur"""
+        total = await self.bot.config.cases.count_for(interaction.guild.id, user.id)
+        view = CaseHistoryView(self.bot.config.cases, interaction.user, interaction.guild.id, user, total)
+        cases = await view.load_page()
+        
+        embed = EmbedBuilder.case_history(user, cases, 0, total, CaseHistoryView.PER_PAGE)
+        await interaction.response.send_message(embed=embed, view=view if total > CaseHistoryView.PER_PAGE else discord.utils.MISSING)
+    
+    @app_commands.command(name="jobs", description="Lister ou annuler les tâches de fond")
+    @app_commands.describe(cancel="ID de la tâche à annuler (optionnel)")
+    @is_moderator()
+    async def jobs(self, interaction: discord.Interaction, cancel: Optional[int] = None):
+        """Liste les tâches de fond du serveur ou en annule une"""
+        if cancel is None:
+            embed = EmbedBuilder.job_list(self.bot.jobs.list(interaction.guild.id)[:15], JOB_STATUSES)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        if not self.bot.jobs.cancel(interaction.guild.id, cancel):
+            embed = EmbedBuilder.error("Tâche introuvable", f"Aucune tâche #{cancel} en cours sur ce serveur.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        embed = EmbedBuilder.success("Tâche annulée", f"La tâche #{cancel} a été annulée.", interaction.user)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        """Applique les permissions du rôle de mute aux nouveaux canaux"""
+        mute_role_id = self.bot.config.get_guild_setting(channel.guild.id, 'mute_role')
+        mute_role = channel.guild.get_role(mute_role_id) if mute_role_id else None
+        if not mute_role:
+            return
+        
+        try:
+            await apply_mute_overwrite(channel, mute_role)
+        except discord.HTTPException:
+            pass
+    
+    def schedule_unmute(self, member, mute_role, delay: float, moderator, reason: str = "Fin de la durée"):
+        """Programme le démute d'un membre sans garder la commande en attente"""
+        guild = member.guild
+        member_id = member.id
+        role_id = mute_role.id
+        
+        async def unmute(job):
+            # Le membre et le rôle sont relus au moment du démute
+            target = guild.get_member(member_id)
+            role = guild.get_role(role_id)
+            if target and role and role in target.roles:
+                await target.remove_roles(role, reason="Fin du mute temporaire")
+                await self._log_moderation("Démute automatique", target, self.bot.user, reason)
+        
+        return self.bot.jobs.submit(guild.id, moderator.id, f"Démute de {member}", unmute, delay=delay)
+    
+    async def _log_moderation(self, action: str, target, moderator, reason: str, case_id: Optional[int] = None):
         """Log une action de modération"""
         logs_channel = self._get_logs_channel(target.guild if hasattr(target, 'guild') else moderator.guild)
         if logs_channel:
             embed = EmbedBuilder.moderation(action, target, moderator, reason)
+            if case_id is not None:
+                embed.set_footer(text=f"Cas #{case_id} | ID: {target.id}")
             await logs_channel.send(embed=embed)
     
+    async def _record_case(self, guild, action, target, moderator, reason, duration=None):
+        """Enregistre la sanction dans la base des dossiers (et le digest) et renvoie son numéro"""
+        self.bot.config.digest.record_action(guild.id, action, [target.id])
+        return await self.bot.config.cases.add(guild.id, action, target, moderator, reason, duration)
+    
     def _get_logs_channel(self, guild):
         """Récupère le canal de logs configuré"""
         logs_channel_id = self.bot.config.get_guild_setting(guild.id, 'logs_channel')
         if logs_channel_id:
             return guild.get_channel(logs_channel_id)
         return None
+    
+    async def _notify(self, user, embed, head_start: float = 0):
+        """Envoie un MP via la file; attend au plus head_start secondes qu'il soit parti"""
+        future = self.notifier.enqueue(user, embed)
+        if head_start:
+            await asyncio.wait({future}, timeout=head_start)
+    
+    def _expect_audit(self, guild, action, target_id, moderator, reason):
+        """Signale une action du bot au module de logs (évite une lecture du journal d'audit)"""
+        logs = self.bot.get_cog('Logs')
+        if logs:
+            logs.audit.expect(guild.id, action, target_id, moderator, reason)
 
 class ConfirmView(discord.ui.View):
     """Vue de confirmation pour les actions importantes"""
@@ -622,5 +1407,55 @@ class ConfirmView(discord.ui.View):
         self.value = False
         self.stop()
 
+class CaseHistoryView(discord.ui.View):
+    """Pagination paresseuse de l'historique: chaque page est lue à la demande"""
+    
+    PER_PAGE = 10
+    
+    def __init__(self, store, user, guild_id, target, total):
+        super().__init__(timeout=180)
+        self.store = store
+        self.user = user
+        self.guild_id = guild_id
+        self.target = target
+        self.total = total
+        self.page = 0
+        self.cursors = [None]  # curseur de début de chaque page visitée
+        self._update_buttons()
+    
+    async def load_page(self):
+        cases = await self.store.page_for(self.guild_id, self.target.id, self.cursors[self.page], self.PER_PAGE)
+        if cases and len(self.cursors) == self.page + 1:
+            self.cursors.append(cases[-1].case_id)
+        self._update_buttons()
+        return cases
+    
+    def _update_buttons(self):
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = (self.page + 1) * self.PER_PAGE >= self.total
+    
+    async def _show(self, interaction):
+        cases = await self.load_page()
+        embed = EmbedBuilder.case_history(self.target, cases, self.page, self.total, self.PER_PAGE)
+        await interaction.response.edit_message(embed=embed, view=self)
+    
+    @discord.ui.button(label="◀️ Précédent", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if interaction.user != self.user:
+            await interaction.response.send_message("❌ Vous ne pouvez pas utiliser ce bouton.", ephemeral=True)
+            return
+        
+        self.page -= 1
+        await self._show(interaction)
+    
+    @discord.ui.button(label="Suivant ▶️", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if interaction.user != self.user:
+            await interaction.response.send_message("❌ Vous ne pouvez pas utiliser ce bouton.", ephemeral=True)
+            return
+        
+        self.page += 1
+        await self._show(interaction)
+
 async def setup(bot):
     await bot.add_cog(Moderation(bot))
@@ -2,16 +2,103 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from utils.embeds import EmbedBuilder
+from utils.stats import StatsTracker
+from utils.cache import ResponseCache
+from utils.member_index import MemberSearch
+from utils.activity import current_minute, bucket, sparkline
 from datetime import datetime
 import platform
 import psutil
 import os
+from typing import Optional
+
+# Durée de vie des réponses en cache (secondes)
+SERVERINFO_TTL = 60
+BOTINFO_TTL = 30
+HELP_TTL = 3600
 
 class Utility(commands.Cog):
     """Module d'utilitaires et commandes diverses"""
     
     def __init__(self, bot):
         self.bot = bot
+        self.stats = StatsTracker()
+        self.cache = ResponseCache()
+        self.search = MemberSearch()
+    
+    @commands.Cog.listener()
+    async def on_ready(self):
+        """Initialise les statistiques une fois les serveurs chargés"""
+        for guild in self.bot.guilds:
+            self.stats.initialize(guild)
+    
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        self.stats.initialize(guild)
+        self.cache.invalidate(None, 'botinfo')
+    
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.stats.remove(guild.id)
+        self.cache.invalidate(guild.id)
+        self.search.drop(guild.id)
+        self.bot.config.activity.drop_guild(guild.id, [channel.id for channel in guild.channels])
+        self.cache.invalidate(None, 'botinfo')
+    
+    @commands.Cog.listener()
+    async def on_guild_update(self, before, after):
+        self.stats.guild_updated(after)
+        self.cache.invalidate(after.id, 'serverinfo')
+    
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        self.stats.member_joined(member)
+        self.search.member_added(member)
+    
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        self.stats.member_left(member)
+        self.search.member_removed(member)
+    
+    @commands.Cog.listener()
+    async def on_member_update(self, before, after):
+        if before.nick != after.nick:
+            self.search.member_added(after)
+    
+    @commands.Cog.listener()
+    async def on_user_update(self, before, after):
+        """Réindexe un utilisateur renommé dans les serveurs où il est présent"""
+        if before.name == after.name and before.global_name == after.global_name:
+            return
+        for guild in after.mutual_guilds:
+            member = guild.get_member(after.id)
+            if member:
+                self.search.member_added(member)
+    
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        self.stats.channel_created(channel)
+        self.cache.invalidate(channel.guild.id, 'serverinfo')
+    
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        self.stats.channel_deleted(channel)
+        self.bot.config.activity.drop_channel(channel.id)
+        self.cache.invalidate(channel.guild.id, 'serverinfo')
+    
+    # Les arrivées et départs n'invalident pas /serverinfo: les compteurs de membres
+    # peuvent avoir jusqu'à SERVERINFO_TTL secondes de retard pendant un afflux
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role):
+        self.cache.invalidate(role.guild.id, 'serverinfo')
+    
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        self.cache.invalidate(role.guild.id, 'serverinfo')
+    
+    @commands.Cog.listener()
+    async def on_guild_emojis_update(self, guild, before, after):
+        self.cache.invalidate(guild.id, 'serverinfo')
     
     @app_commands.command(name="ping", description="Afficher la latence du bot")
     async def ping(self, interaction: discord.Interaction):
@@ -40,8 +127,15 @@ class Utility(commands.Cog):
     @app_commands.command(name="serverinfo", description="Informations sur le serveur")
     async def serverinfo(self, interaction: discord.Interaction):
         """Affiche les informations du serveur"""
-        guild = interaction.guild
+        embed = self.cache.get(interaction.guild.id, 'serverinfo')
+        if embed is None:
+            embed = self._build_serverinfo(interaction.guild)
+            self.cache.set(interaction.guild.id, 'serverinfo', embed, SERVERINFO_TTL)
         
+        await interaction.response.send_message(embed=embed)
+    
+    def _build_serverinfo(self, guild) -> discord.Embed:
+        """Construit l'embed des informations du serveur"""
         embed = discord.Embed(
             title=f"📊 Informations - {guild.name}",
             color=0x00ff00,
@@ -53,24 +147,19 @@ class Utility(commands.Cog):
         embed.add_field(name="👑 Propriétaire", value=guild.owner.mention if guild.owner else "Inconnu", inline=True)
         embed.add_field(name="📅 Créé le", value=f"<t:{int(guild.created_at.timestamp())}:F>", inline=True)
         
-        # Statistiques des membres
-        total_members = guild.member_count
-        bots = sum(1 for member in guild.members if member.bot)
-        humans = total_members - bots
-        
-        embed.add_field(name="👥 Membres", value=f"Total: {total_members}\nHumains: {humans}\nBots: {bots}", inline=True)
+        # Statistiques des membres et des canaux (compteurs tenus à jour par les événements)
+        stats = self.stats.get(guild)
+        total_members = guild.member_count or stats.humans + stats.bots
         
-        # Statistiques des canaux
-        text_channels = len(guild.text_channels)
-        voice_channels = len(guild.voice_channels)
-        categories = len(guild.categories)
+        embed.add_field(name="👥 Membres", value=f"Total: {total_members}\nHumains: {stats.humans}\nBots: {stats.bots}", inline=True)
         
-        embed.add_field(name="📝 Canaux", value=f"Texte: {text_channels}\nVocal: {voice_channels}\nCatégories: {categories}", inline=True)
+        channels = stats.channels
+        embed.add_field(name="📝 Canaux", value=f"Texte: {channels['text']}\nVocal: {channels['voice']}\nCatégories: {channels['category']}", inline=True)
         
         # Autres statistiques
         embed.add_field(name="🎭 Rôles", value=str(len(guild.roles)), inline=True)
         embed.add_field(name="😀 Émojis", value=str(len(guild.emojis)), inline=True)
-        embed.add_field(name="📈 Niveau de boost", value=f"Niveau {guild.premium_tier} ({guild.premium_subscription_count} boosts)", inline=True)
+        embed.add_field(name="📈 Niveau de boost", value=f"Niveau {guild.premium_tier} ({stats.boosts} boosts)", inline=True)
         
         # Niveau de vérification
         verification_levels = {
@@ -87,7 +176,7 @@ class Utility(commands.Cog):
         
         embed.set_footer(text=f"Serveur créé il y a {(datetime.utcnow() - guild.created_at).days} jours")
         
-        await interaction.response.send_message(embed=embed)
+        return embed
     
     @app_commands.command(name="userinfo", description="Informations sur un utilisateur")
     @app_commands.describe(user="L'utilisateur dont voir les informations (optionnel)")
@@ -156,6 +245,72 @@ class Utility(commands.Cog):
         
         await interaction.response.send_message(embed=embed)
     
+    @app_commands.command(name="find", description="Rechercher un membre par nom, pseudo ou ID")
+    @app_commands.describe(query="Nom, pseudo ou ID (les fautes de frappe sont tolérées)")
+    async def find(self, interaction: discord.Interaction, query: str):
+        """Recherche des membres dans l'index du serveur"""
+        guild = interaction.guild
+        index = self.search.indexes.get(guild.id)
+        if index is None or not index.ready:
+            # Premier appel sur ce serveur: l'index est construit une seule fois
+            await interaction.response.defer()
+            index = await self.search.get(guild)
+        
+        members = [guild.get_member(member_id) for member_id in index.search(query)]
+        members = [member for member in members if member is not None]
+        
+        embed = discord.Embed(
+            title=f"🔎 Recherche - {query[:100]}",
+            description="\n".join(
+                f"{member.mention} • `{member}`" + (f" • *{member.nick}*" if member.nick else "") + f" • {member.id}"
+                for member in members
+            ) or "*Aucun membre trouvé*",
+            color=0x00ff00,
+            timestamp=datetime.utcnow()
+        )
+        embed.set_footer(text=f"{len(members)} résultat(s) sur {len(index.keys)} membres indexés")
+        
+        if interaction.response.is_done():
+            await interaction.followup.send(embed=embed)
+        else:
+            await interaction.response.send_message(embed=embed)
+    
+    @app_commands.command(name="activity", description="Activité des messages sur 24 heures et 30 jours")
+    @app_commands.describe(channel="Canal à analyser (tout le serveur par défaut)")
+    async def activity(self, interaction: discord.Interaction, channel: Optional[discord.TextChannel] = None):
+        """Affiche l'activité sous forme de graphiques compacts"""
+        series = self.bot.config.activity.get(interaction.guild.id, channel.id if channel else None)
+        scope = channel.mention if channel else f"**{interaction.guild.name}**"
+        
+        embed = discord.Embed(
+            title="📈 Activité",
+            description=f"Messages dans {scope} depuis le démarrage du bot",
+            color=0x00ff00,
+            timestamp=datetime.utcnow()
+        )
+        
+        if series is None:
+            embed.description += "\n\n*Aucun message enregistré.*"
+            await interaction.response.send_message(embed=embed)
+            return
+        
+        minute = current_minute()
+        day = bucket(series.minutes.window(minute), 30)  # 48 demi-heures
+        month = bucket(series.hours.window(minute // 60), 24)  # 30 jours
+        
+        embed.add_field(
+            name="🕐 24 dernières heures (par 30 min)",
+            value=f"`{sparkline(day)}`\nTotal: **{sum(day)}** • Pic: {max(day)} • Dernière heure: {sum(day[-2:])}",
+            inline=False
+        )
+        embed.add_field(
+            name="📅 30 derniers jours (par jour)",
+            value=f"`{sparkline(month)}`\nTotal: **{sum(month)}** • Pic: {max(month)} • Moyenne: {sum(month) / len(month):.0f}/jour",
+            inline=False
+        )
+        
+        await interaction.response.send_message(embed=embed)
+    
     @app_commands.command(name="avatar", description="Afficher l'avatar d'un utilisateur")
     @app_commands.describe(user="L'utilisateur dont voir l'avatar (optionnel)")
     async def avatar(self, interaction: discord.Interaction, user: discord.Member = None):
@@ -177,6 +332,15 @@ class Utility(commands.Cog):
     @app_commands.command(name="botinfo", description="Informations sur le bot")
     async def botinfo(self, interaction: discord.Interaction):
         """Affiche les informations du bot"""
+        embed = self.cache.get(None, 'botinfo')
+        if embed is None:
+            embed = self._build_botinfo()
+            self.cache.set(None, 'botinfo', embed, BOTINFO_TTL)
+        
+        await interaction.response.send_message(embed=embed)
+    
+    def _build_botinfo(self) -> discord.Embed:
+        """Construit l'embed des informations du bot"""
         embed = discord.Embed(
             title=f"🤖 Informations - {self.bot.user.name}",
             color=0x00ff00,
@@ -189,9 +353,9 @@ class Utility(commands.Cog):
         embed.add_field(name="🏓 Latence", value=f"{round(self.bot.latency * 1000)}ms", inline=True)
         
         # Statistiques
-        total_members = sum(guild.member_count for guild in self.bot.guilds)
+        total_members = self.stats.total_humans + self.stats.total_bots
         embed.add_field(name="🏠 Serveurs", value=str(len(self.bot.guilds)), inline=True)
-        embed.add_field(name="👥 Utilisateurs", value=str(total_members), inline=True)
+        embed.add_field(name="👥 Utilisateurs", value=f"{total_members}\n(dont {self.stats.total_bots} bots)", inline=True)
         embed.add_field(name="📝 Commandes", value=str(len(self.bot.tree.get_commands())), inline=True)
         
         # Informations système
@@ -205,6 +369,15 @@ class Utility(commands.Cog):
         except:
             pass
         
+        moderation = self.bot.get_cog('Moderation')
+        if moderation:
+            notifier = moderation.notifier
+            embed.add_field(
+                name="✉️ MPs de sanction",
+                value=f"Envoyés: {notifier.sent}\nÉchecs: {notifier.failed}\nEn attente: {notifier.queue.qsize()}",
+                inline=True
+            )
+        
         embed.add_field(name="🐍 Python", value=platform.python_version(), inline=True)
         embed.add_field(name="📚 discord.py", value=discord.__version__, inline=True)
         embed.add_field(name="💻 OS", value=platform.system(), inline=True)
@@ -212,11 +385,20 @@ class Utility(commands.Cog):
         embed.set_thumbnail(url=self.bot.user.display_avatar.url)
         embed.set_footer(text="Bot de modération français avec système de logs complet")
         
-        await interaction.response.send_message(embed=embed)
+        return embed
     
     @app_commands.command(name="help", description="Afficher l'aide du bot")
     async def help(self, interaction: discord.Interaction):
         """Affiche l'aide du bot"""
+        embed = self.cache.get(None, 'help')
+        if embed is None:
+            embed = self._build_help()
+            self.cache.set(None, 'help', embed, HELP_TTL)
+        
+        await interaction.response.send_message(embed=embed)
+    
+    def _build_help(self) -> discord.Embed:
+        """Construit l'embed d'aide (identique pour tous les serveurs)"""
         embed = discord.Embed(
             title="📚 Aide - Commandes du Bot",
             description="Voici toutes les commandes disponibles organisées par catégories.",
@@ -228,18 +410,25 @@ class Utility(commands.Cog):
         moderation_commands = [
             "`/kick` - Expulser un membre",
             "`/ban` - Bannir un membre", 
+            "`/massban` - Bannissement de masse (raid)",
             "`/unban` - Débannir un utilisateur",
             "`/mute` - Rendre muet un membre",
             "`/unmute` - Enlever le mute",
             "`/timeout` - Mettre en timeout",
+            "`/masstimeout` - Timeout de masse (raid)",
             "`/clear` - Supprimer des messages",
             "`/warn` - Avertir un membre",
             "`/warnings` - Voir les avertissements",
             "`/clearwarn` - Effacer les avertissements",
+            "`/case` - Afficher un dossier",
+            "`/history` - Historique de modération",
+            "`/role bulk` - Ajouter/retirer un rôle en masse",
             "`/slowmode` - Mode lent d'un canal",
             "`/lock` - Verrouiller un canal",
             "`/unlock` - Déverrouiller un canal",
-            "`/nuke` - Supprimer et recréer un canal"
+            "`/lockdown` - Verrouiller tout le serveur",
+            "`/nuke` - Supprimer et recréer un canal",
+            "`/jobs` - Tâches de fond en cours"
         ]
         embed.add_field(
             name="🔨 Modération",
@@ -252,11 +441,19 @@ class Utility(commands.Cog):
             "`/panel` - Panneau de configuration interactif",
             "`/config` - Voir la configuration",
             "`/setlogs` - Définir le canal de logs",
+            "`/logcategories` - Catégories de logs",
+            "`/settranscript` - Format des transcriptions",
+            "`/voicelogs` - Mode des logs vocaux",
+            "`/burstlogs` - Résumé des rafales d'arrivées",
             "`/setmodrole` - Définir le rôle modérateur",
             "`/setmuterole` - Définir le rôle mute",
             "`/antispam` - Configurer l'anti-spam",
             "`/antilinks` - Configurer l'anti-liens",
             "`/maxmentions` - Limite de mentions",
+            "`/trustlevel` - Niveau de confiance de l'auto-modération",
+            "`/warnconfig` - Décroissance des avertissements",
+            "`/bangroup` - Bannissements partagés entre serveurs",
+            "`/backup` - Sauvegarde des rôles et canaux",
             "`/setstatus` - Changer le statut du bot",
             "`/resetconfig` - Réinitialiser la config"
         ]
@@ -271,6 +468,8 @@ class Utility(commands.Cog):
             "`/ping` - Latence du bot",
             "`/serverinfo` - Infos du serveur",
             "`/userinfo` - Infos d'un utilisateur",
+            "`/find` - Rechercher un membre",
+            "`/activity` - Activité des messages",
             "`/avatar` - Avatar d'un utilisateur",
             "`/botinfo` - Informations du bot",
             "`/help` - Cette aide"
@@ -297,7 +496,7 @@ class Utility(commands.Cog):
         
         embed.set_footer(text="💡 Conseil: Configurez d'abord le canal de logs avec /setlogs")
         
-        await interaction.response.send_message(embed=embed)
+        return embed
 
 async def setup(bot):
     await bot.add_cog(Utility(bot))
@@ -1,6 +1,35 @@
 import discord
+import copy
 from datetime import datetime, timedelta
+import secrets
 from typing import Dict, Any, Optional
+from utils.activity import ActivityTracker
+from utils.bans import BanCache
+from utils.digest import ModerationDigest
+from utils.trust import TrustTracker
+from utils.cases import CaseStore
+from utils.warnings import WarningBuckets, active_warning_count, current_day
+
+class LogCategories:
+    """Catégories de logs activables par serveur (masque de bits)"""
+    MESSAGES = 1 << 0        # Suppressions et éditions de messages
+    MEMBERS = 1 << 1         # Arrivées et départs
+    BANS = 1 << 2            # Bannissements et débannissements
+    CHANNELS = 1 << 3        # Création, suppression et modification de canaux
+    ROLES = 1 << 4           # Création et suppression de rôles
+    MEMBER_UPDATES = 1 << 5  # Pseudos et rôles des membres
+    VOICE = 1 << 6           # Activité vocale
+    ALL = (1 << 7) - 1
+    
+    NAMES = {
+        'messages': (MESSAGES, "💬 Messages"),
+        'members': (MEMBERS, "👋 Arrivées/Départs"),
+        'bans': (BANS, "🔨 Bannissements"),
+        'channels': (CHANNELS, "📝 Canaux"),
+        'roles': (ROLES, "🎭 Rôles"),
+        'member_updates': (MEMBER_UPDATES, "👤 Modifications de membres"),
+        'voice': (VOICE, "🔊 Vocal")
+    }
 
 class BotConfig:
     def __init__(self):
@@ -10,6 +39,13 @@ class BotConfig:
         # Configuration par défaut
         self.default_config = {
             'logs_channel': None,
+            'logs_categories': LogCategories.ALL,  # masque des catégories de logs
+            'logs_transcript_format': 'txt',  # txt ou html
+            'logs_voice_mode': 'sessions',  # sessions, digest ou live
+            'logs_burst': {
+                'threshold': 10,  # arrivées/départs dans la fenêtre avant résumé
+                'window': 30  # secondes
+            },
             'mod_role': None,
             'mute_role': None,
             'auto_mod': {
@@ -17,7 +53,12 @@ class BotConfig:
                 'anti_links': True,
                 'max_mentions': 5,
                 'message_limit': 5,
-                'time_window': 10  # secondes
+                'time_window': 10,  # secondes
+                'trust_level': 0  # score de confiance dispensant de l'analyse des liens (0 = désactivé)
+            },
+            'warnings': {
+                'half_life_days': 30,  # un avertissement perd la moitié de son poids tous les N jours
+                'expiry_days': 90  # au-delà, il est oublié
             },
             'status': {
                 'type': 'watching',
@@ -27,16 +68,55 @@ class BotConfig:
         
         # Cache des infractions (anti-spam)
         self.user_messages: Dict[int, Dict[int, list]] = {}  # guild_id -> user_id -> messages
-        self.user_warnings: Dict[int, Dict[int, int]] = {}  # guild_id -> user_id -> count
+        self.user_warnings: Dict[int, Dict[int, WarningBuckets]] = {}  # guild_id -> user_id -> avertissements par jour
+        
+        # Messages par minute et par heure de chaque serveur et canal
+        self.activity = ActivityTracker()
+        
+        # Agrégats du digest de modération (sanctions, auto-modération, arrivées et départs)
+        self.digest = ModerationDigest()
+        
+        # Scores de confiance des membres (recalculés par paliers, jamais à chaque message)
+        self.trust = TrustTracker(self.get_warning_score)
+        
+        # Masques de logs effectifs précalculés (0 si aucun canal de logs)
+        self.log_masks: Dict[int, int] = {}
+        
+        # Dossiers de modération numérotés (base locale indexée)
+        self.cases = CaseStore()
+        
+        # Listes des bannis par serveur (chargées à la demande, tenues à jour par les événements)
+        self.bans = BanCache()
+        
+        # Groupes de bannissements partagés: nom -> {'owner': guild_id, 'code': str, 'members': set}
+        self.ban_groups: Dict[str, Dict[str, Any]] = {}
+        self.ban_group_of: Dict[int, str] = {}  # guild_id -> nom du groupe
     
     def get_guild_config(self, guild_id: int) -> Dict[str, Any]:
         """Récupère la configuration d'un serveur"""
         if guild_id not in self.guilds_config:
-            self.guilds_config[guild_id] = self.default_config.copy()
+            self.guilds_config[guild_id] = copy.deepcopy(self.default_config)
         return self.guilds_config[guild_id]
     
+    def reset_guild_config(self, guild_id: int) -> None:
+        """Réinitialise la configuration d'un serveur"""
+        self.guilds_config.pop(guild_id, None)
+        self.log_masks.pop(guild_id, None)
+    
+    def get_log_mask(self, guild_id: int) -> int:
+        """Récupère le masque des catégories de logs actives d'un serveur"""
+        mask = self.log_masks.get(guild_id)
+        if mask is None:
+            config = self.get_guild_config(guild_id)
+            mask = config['logs_categories'] if config.get('logs_channel') else 0
+            self.log_masks[guild_id] = mask
+        return mask
+    
     def set_guild_setting(self, guild_id: int, key: str, value: Any) -> None:
         """Définit un paramètre pour un serveur"""
+        if key.startswith('logs_'):
+            self.log_masks.pop(guild_id, None)
+        
         config = self.get_guild_config(guild_id)
         keys = key.split('.')
         
@@ -87,26 +167,89 @@ class BotConfig:
             return 0
         return len(self.user_messages[guild_id][user_id])
     
+    def get_ban_group(self, guild_id: int) -> Optional[str]:
+        """Nom du groupe de bannissements partagés d'un serveur"""
+        return self.ban_group_of.get(guild_id)
+    
+    def create_ban_group(self, name: str, guild_id: int) -> str:
+        """Crée un groupe dont le serveur est propriétaire et renvoie son code d'accès"""
+        code = secrets.token_hex(4)
+        self.ban_groups[name] = {'owner': guild_id, 'code': code, 'members': {guild_id}}
+        self.ban_group_of[guild_id] = name
+        return code
+    
+    def join_ban_group(self, name: str, guild_id: int, code: str) -> bool:
+        """Ajoute un serveur à un groupe si le code est valide"""
+        group = self.ban_groups.get(name)
+        if group is None or not secrets.compare_digest(group['code'], code):
+            return False
+        group['members'].add(guild_id)
+        self.ban_group_of[guild_id] = name
+        return True
+    
+    def leave_ban_group(self, guild_id: int) -> None:
+        """Retire un serveur de son groupe (la propriété passe à un autre membre)"""
+        name = self.ban_group_of.pop(guild_id, None)
+        group = self.ban_groups.get(name)
+        if group is None:
+            return
+        group['members'].discard(guild_id)
+        if not group['members']:
+            del self.ban_groups[name]
+        elif group['owner'] == guild_id:
+            group['owner'] = min(group['members'])
+    
+    def _warning_settings(self, guild_id: int):
+        half_life = self.get_guild_setting(guild_id, 'warnings.half_life_days', 30)
+        expiry = self.get_guild_setting(guild_id, 'warnings.expiry_days', 90)
+        return half_life, expiry
+    
     def add_warning(self, guild_id: int, user_id: int) -> int:
-        """Ajoute un avertissement à un utilisateur"""
+        """Ajoute un avertissement à un utilisateur et renvoie son nombre d'avertissements actifs"""
         if guild_id not in self.user_warnings:
             self.user_warnings[guild_id] = {}
         if user_id not in self.user_warnings[guild_id]:
-            self.user_warnings[guild_id][user_id] = 0
+            self.user_warnings[guild_id][user_id] = WarningBuckets()
         
-        self.user_warnings[guild_id][user_id] += 1
-        return self.user_warnings[guild_id][user_id]
+        self.user_warnings[guild_id][user_id].add(current_day())
+        self.trust.invalidate(guild_id, user_id)
+        return self.get_warning_count(guild_id, user_id)
+    
+    def get_warning_score(self, guild_id: int, user_id: int) -> float:
+        """Score d'avertissements actif (avec décroissance dans le temps)"""
+        buckets = self.user_warnings.get(guild_id, {}).get(user_id)
+        if buckets is None:
+            return 0.0
+        
+        half_life, expiry = self._warning_settings(guild_id)
+        today = current_day()
+        buckets.compact(today, expiry)
+        if not buckets:
+            del self.user_warnings[guild_id][user_id]
+            return 0.0
+        return buckets.score(today, half_life, expiry)
     
     def get_warning_count(self, guild_id: int, user_id: int) -> int:
-        """Récupère le nombre d'avertissements d'un utilisateur"""
-        if guild_id not in self.user_warnings:
-            return 0
-        return self.user_warnings[guild_id].get(user_id, 0)
+        """Récupère le nombre d'avertissements actifs d'un utilisateur"""
+        return active_warning_count(self.get_warning_score(guild_id, user_id))
     
     def clear_warnings(self, guild_id: int, user_id: int) -> None:
         """Efface les avertissements d'un utilisateur"""
         if guild_id in self.user_warnings and user_id in self.user_warnings[guild_id]:
             del self.user_warnings[guild_id][user_id]
+        self.trust.invalidate(guild_id, user_id)
+    
+    def compact_warnings(self) -> None:
+        """Compacte les avertissements de tous les serveurs et oublie les membres sans avertissement actif"""
+        today = current_day()
+        for guild_id, users in list(self.user_warnings.items()):
+            _, expiry = self._warning_settings(guild_id)
+            for user_id, buckets in list(users.items()):
+                buckets.compact(today, expiry)
+                if not buckets:
+                    del users[user_id]
+            if not users:
+                del self.user_warnings[guild_id]
 
 # Couleurs pour les embeds
 class Colors:
@@ -5,6 +5,7 @@ import asyncio
 import os
 import logging
 from config.settings import BotConfig
+from utils.jobs import JobManager
 import threading
 import time
 from http.server import HTTPServer, BaseHTTPRequestHandler
@@ -114,6 +115,7 @@ class FrenchBot(commands.Bot):
             case_insensitive=True
         )
         self.config = BotConfig()
+        self.jobs = JobManager()
         self.keep_alive_server = None
         
     async def setup_hook(self):
@@ -123,6 +125,8 @@ class FrenchBot(commands.Bot):
             'cogs.moderation',
             'cogs.configuration', 
             'cogs.anti_spam',
+            'cogs.ban_sync',
+            'cogs.backup',
             'cogs.utility'
         ]
         
@@ -0,0 +1,99 @@
+import time
+from array import array
+from typing import Dict, List, Optional
+
+MINUTE_SLOTS = 24 * 60  # 24 heures par minute
+HOUR_SLOTS = 30 * 24  # 30 jours par heure
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+class Ring:
+    """Tampon circulaire de compteurs (array('I')) indexé par période absolue"""
+
+    __slots__ = ('counts', 'last')
+
+    def __init__(self, size: int):
+        self.counts = array('I', bytes(4 * size))
+        self.last = -1  # dernière période écrite
+
+    def add(self, period: int, amount: int = 1) -> None:
+        size = len(self.counts)
+        if period > self.last:
+            if self.last < 0 or period - self.last >= size:
+                self.counts = array('I', bytes(4 * size))
+            else:
+                # Remise à zéro des périodes écoulées sans message
+                for skipped in range(self.last + 1, period + 1):
+                    self.counts[skipped % size] = 0
+            self.last = period
+        elif period <= self.last - size:
+            return
+        self.counts[period % size] += amount
+
+    def window(self, now: int) -> List[int]:
+        """Compteurs des `size` dernières périodes jusqu'à `now` inclus, du plus ancien au plus récent"""
+        size = len(self.counts)
+        values = []
+        for period in range(now - size + 1, now + 1):
+            if period > self.last or period <= self.last - size or period < 0:
+                values.append(0)
+            else:
+                values.append(self.counts[period % size])
+        return values
+
+class ActivitySeries:
+    """Messages par minute (24 h) et par heure (30 jours)"""
+
+    __slots__ = ('minutes', 'hours')
+
+    def __init__(self):
+        self.minutes = Ring(MINUTE_SLOTS)
+        self.hours = Ring(HOUR_SLOTS)
+
+    def add(self, minute: int) -> None:
+        self.minutes.add(minute)
+        self.hours.add(minute // 60)
+
+class ActivityTracker:
+    """Séries d'activité de chaque serveur et de chaque canal"""
+
+    def __init__(self):
+        self.guilds: Dict[int, ActivitySeries] = {}
+        self.channels: Dict[int, ActivitySeries] = {}
+
+    def record(self, guild_id: int, channel_id: int) -> None:
+        """Compte un message (chemin critique: deux recherches de dictionnaire et quatre incréments)"""
+        minute = int(time.time()) // 60
+        series = self.guilds.get(guild_id)
+        if series is None:
+            series = self.guilds[guild_id] = ActivitySeries()
+        series.add(minute)
+        series = self.channels.get(channel_id)
+        if series is None:
+            series = self.channels[channel_id] = ActivitySeries()
+        series.add(minute)
+
+    def get(self, guild_id: int, channel_id: Optional[int] = None) -> Optional[ActivitySeries]:
+        return self.channels.get(channel_id) if channel_id is not None else self.guilds.get(guild_id)
+
+    def drop_channel(self, channel_id: int) -> None:
+        self.channels.pop(channel_id, None)
+
+    def drop_guild(self, guild_id: int, channel_ids) -> None:
+        self.guilds.pop(guild_id, None)
+        for channel_id in channel_ids:
+            self.channels.pop(channel_id, None)
+
+def current_minute() -> int:
+    return int(time.time()) // 60
+
+def bucket(values: List[int], size: int) -> List[int]:
+    """Regroupe une série en paquets de `size` valeurs additionnées"""
+    return [sum(values[index:index + size]) for index in range(0, len(values), size)]
+
+def sparkline(values: List[int]) -> str:
+    """Représentation compacte d'une série en caractères de bloc"""
+    peak = max(values) if values else 0
+    if not peak:
+        return SPARK_CHARS[0] * len(values)
+    top = len(SPARK_CHARS) - 1
+    return "".join(SPARK_CHARS[round(value * top / peak)] for value in values)
@@ -0,0 +1,94 @@
+import discord
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+class AuditLogCorrelator:
+    """Attribue les événements à leur auteur avec un seul appel au journal d'audit par fenêtre"""
+
+    def __init__(self, delay: float = 1.5, ttl: int = 60, tolerance: int = 10, max_own_actions: int = 500):
+        self.delay = delay  # attente avant lecture pour regrouper les événements simultanés
+        self.ttl = ttl  # durée de vie des entrées en cache (secondes)
+        self.tolerance = tolerance  # écart maximal entre l'entrée d'audit et l'événement
+        self.max_own_actions = max_own_actions  # actions du bot conservées par serveur
+
+        # guild_id -> (action, target_id) -> (auteur, raison, date)
+        self.entries: Dict[int, Dict[Tuple[discord.AuditLogAction, int], tuple]] = {}
+        # Actions effectuées par le bot lui-même, connues sans lecture du journal
+        self.own_actions: Dict[int, Dict[Tuple[discord.AuditLogAction, int], tuple]] = {}
+        self.pending_fetch: Dict[int, asyncio.Task] = {}
+
+    def expect(self, guild_id: int, action: discord.AuditLogAction, target_id: int,
+               moderator: discord.abc.User, reason: str = None) -> None:
+        """Signale une action que le bot s'apprête à effectuer"""
+        actions = self.own_actions.setdefault(guild_id, {})
+        actions.pop((action, target_id), None)  # réinsérée en fin: le dictionnaire reste trié par date
+        actions[(action, target_id)] = (moderator, reason, datetime.utcnow())
+
+        # Élagage à l'insertion: sans lecture du journal (logs désactivés), rien d'autre ne le ferait
+        if len(actions) > self.max_own_actions:
+            cutoff = datetime.utcnow() - timedelta(seconds=self.ttl)
+            for key in [key for key, value in actions.items() if value[2] <= cutoff]:
+                del actions[key]
+            while len(actions) > self.max_own_actions:
+                del actions[next(iter(actions))]
+
+    async def attribute(self, guild: discord.Guild, action: discord.AuditLogAction,
+                        target_id: int) -> Optional[Tuple[discord.abc.User, Optional[str]]]:
+        """Renvoie (auteur, raison) d'un événement, ou None si inconnu"""
+        since = datetime.utcnow() - timedelta(seconds=self.tolerance)
+
+        own = self.own_actions.get(guild.id, {}).pop((action, target_id), None)
+        if own and own[2] > since:
+            return own[0], own[1]
+
+        entry = self._lookup(guild.id, action, target_id, since)
+        if entry:
+            return entry
+
+        if not guild.me or not guild.me.guild_permissions.view_audit_log:
+            return None
+
+        # Un seul appel REST par serveur pour tous les événements en attente
+        task = self.pending_fetch.get(guild.id)
+        if task is None:
+            task = asyncio.create_task(self._fetch(guild))
+            self.pending_fetch[guild.id] = task
+        await task
+
+        return self._lookup(guild.id, action, target_id, since)
+
+    def _lookup(self, guild_id: int, action: discord.AuditLogAction, target_id: int, since: datetime):
+        entry = self.entries.get(guild_id, {}).get((action, target_id))
+        if entry and entry[2] > since:
+            return entry[0], entry[1]
+        return None
+
+    async def _fetch(self, guild: discord.Guild) -> None:
+        try:
+            await asyncio.sleep(self.delay)
+            fetched = {}
+            async for entry in guild.audit_logs(limit=50):
+                target_id = getattr(entry.target, 'id', None)
+                # L'auteur peut être absent (compte supprimé, hors cache): l'entrée n'attribue rien
+                if target_id is None or entry.user is None:
+                    continue
+                # Les entrées arrivent de la plus récente à la plus ancienne
+                fetched.setdefault(
+                    (entry.action, target_id),
+                    (entry.user, entry.reason, entry.created_at.replace(tzinfo=None))
+                )
+            self.entries.setdefault(guild.id, {}).update(fetched)
+            self._prune(guild.id)
+        except (discord.Forbidden, discord.HTTPException):
+            pass
+        finally:
+            self.pending_fetch.pop(guild.id, None)
+
+    def _prune(self, guild_id: int) -> None:
+        """Supprime les entrées expirées pour borner la mémoire"""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl)
+        for store in (self.entries, self.own_actions):
+            cache = store.get(guild_id, {})
+            for key in [key for key, value in cache.items() if value[2] <= cutoff]:
+                del cache[key]
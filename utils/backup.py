@@ -0,0 +1,291 @@
+import discord
+import asyncio
+import gzip
+import json
+import os
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+BACKUP_VERSION = 1
+BACKUP_DIR = 'data/backups'
+BACKUP_KEEP = 10  # sauvegardes conservées par serveur
+
+# Types de canaux restaurables
+RESTORABLE_TYPES = {
+    discord.ChannelType.category.value,
+    discord.ChannelType.text.value,
+    discord.ChannelType.news.value,
+    discord.ChannelType.voice.value
+}
+
+def snapshot_guild(guild: discord.Guild) -> dict:
+    """Sérialise les rôles, l'arborescence des canaux et leurs permissions sous forme compacte
+
+    Rôles: [id, nom, couleur, permissions, affiché séparément, mentionnable, position]
+    Canaux: [id, type, nom, id catégorie, position, permissions, options]
+    Permissions: [id cible, 1 si membre, autorisé, refusé]
+    """
+    roles = [
+        [role.id, role.name, role.color.value, role.permissions.value, role.hoist, role.mentionable, role.position]
+        for role in guild.roles if not role.managed
+    ]
+
+    channels = []
+    for channel in guild.channels:
+        if channel.type.value not in RESTORABLE_TYPES:
+            continue
+        overwrites = [
+            [target.id, int(isinstance(target, (discord.Member, discord.User))), *(p.value for p in overwrite.pair())]
+            for target, overwrite in channel.overwrites.items()
+        ]
+        options = {}
+        if isinstance(channel, discord.TextChannel):
+            options = {'topic': channel.topic, 'nsfw': channel.nsfw, 'slowmode_delay': channel.slowmode_delay}
+        elif isinstance(channel, discord.VoiceChannel):
+            options = {'bitrate': channel.bitrate, 'user_limit': channel.user_limit}
+        channels.append([channel.id, channel.type.value, channel.name, channel.category_id,
+                         channel.position, overwrites, options])
+
+    return {
+        'v': BACKUP_VERSION,
+        'guild': guild.id,
+        'created': datetime.now(timezone.utc).isoformat(),
+        'roles': roles,
+        'channels': channels
+    }
+
+def _guild_dir(guild_id: int) -> str:
+    return os.path.join(BACKUP_DIR, str(guild_id))
+
+def write_backup(guild_id: int, snapshot: dict) -> str:
+    """Écrit une sauvegarde compressée et supprime les plus anciennes; renvoie son nom"""
+    directory = _guild_dir(guild_id)
+    os.makedirs(directory, exist_ok=True)
+    name = datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')
+    with gzip.open(os.path.join(directory, f'{name}.json.gz'), 'wt', encoding='utf-8') as stream:
+        json.dump(snapshot, stream, separators=(',', ':'), ensure_ascii=False)
+
+    for old in list_backups(guild_id)[BACKUP_KEEP:]:
+        os.remove(os.path.join(directory, f'{old}.json.gz'))
+    return name
+
+def list_backups(guild_id: int) -> List[str]:
+    """Noms des sauvegardes d'un serveur, de la plus récente à la plus ancienne"""
+    directory = _guild_dir(guild_id)
+    if not os.path.isdir(directory):
+        return []
+    return sorted((entry[:-len('.json.gz')] for entry in os.listdir(directory) if entry.endswith('.json.gz')),
+                  reverse=True)
+
+def read_backup(guild_id: int, name: str) -> Optional[dict]:
+    """Lit une sauvegarde (None si introuvable ou illisible)"""
+    if os.sep in name or name not in list_backups(guild_id):
+        return None
+    try:
+        with gzip.open(os.path.join(_guild_dir(guild_id), f'{name}.json.gz'), 'rt', encoding='utf-8') as stream:
+            snapshot = json.load(stream)
+    except (OSError, ValueError):
+        return None
+    return snapshot if snapshot.get('v') == BACKUP_VERSION else None
+
+class RestorePlan:
+    """Différence minimale entre une sauvegarde et l'état actuel du serveur
+
+    Seuls les éléments absents ou modifiés sont recréés ou rétablis; les éléments
+    ajoutés depuis la sauvegarde ne sont jamais supprimés.
+    """
+
+    def __init__(self, guild: discord.Guild, snapshot: dict):
+        self.guild = guild
+        self.role_creates: List[list] = []
+        self.role_edits: List[tuple] = []  # (rôle, modifications)
+        self.channel_creates: List[list] = []
+        self.channel_edits: List[tuple] = []  # (canal, ligne de sauvegarde)
+        self.role_order = [row[0] for row in sorted(snapshot['roles'], key=lambda row: row[6])]
+        # Ancien ID de rôle -> rôle actuel (rempli au fur et à mesure des créations)
+        self.role_map: Dict[int, discord.abc.Snowflake] = {}
+        self.channel_map: Dict[int, discord.abc.Snowflake] = {}
+        self._diff_roles(snapshot['roles'])
+        self._diff_channels(snapshot['channels'])
+
+    @property
+    def total(self) -> int:
+        return len(self.role_creates) + len(self.role_edits) + len(self.channel_creates) + len(self.channel_edits)
+
+    def _diff_roles(self, rows: list) -> None:
+        top = self.guild.me.top_role
+        for row in rows:
+            role_id, name, color, permissions, hoist, mentionable, _ = row
+            role = self.guild.get_role(role_id)
+            if role is None:
+                if role_id == self.guild.id:
+                    continue
+                self.role_creates.append(row)
+                continue
+
+            self.role_map[role_id] = role
+            if role.managed or (not role.is_default() and role >= top):
+                continue
+            changes = {}
+            if role.permissions.value != permissions:
+                changes['permissions'] = discord.Permissions(permissions)
+            if not role.is_default():
+                if role.name != name:
+                    changes['name'] = name
+                if role.color.value != color:
+                    changes['color'] = color
+                if role.hoist != hoist:
+                    changes['hoist'] = hoist
+                if role.mentionable != mentionable:
+                    changes['mentionable'] = mentionable
+            if changes:
+                self.role_edits.append((role, changes))
+
+    def _diff_channels(self, rows: list) -> None:
+        missing_roles = {row[0] for row in self.role_creates}
+        missing_channels = {row[0] for row in rows if self.guild.get_channel(row[0]) is None}
+
+        # Les catégories d'abord pour que leurs canaux puissent y être recréés
+        for row in sorted(rows, key=lambda row: row[1] != discord.ChannelType.category.value):
+            channel = self.guild.get_channel(row[0])
+            if channel is None:
+                self.channel_creates.append(row)
+                continue
+
+            self.channel_map[row[0]] = channel
+            # Un canal qui dépend d'un rôle ou d'une catégorie à recréer sera aussi à corriger
+            depends_on_missing = row[3] in missing_channels or any(
+                not is_member and target_id in missing_roles for target_id, is_member, _, _ in row[5]
+            )
+            if depends_on_missing or self.channel_changes(channel, row):
+                self.channel_edits.append((channel, row))
+
+    def overwrites_for(self, rows: list) -> Dict[discord.abc.Snowflake, discord.PermissionOverwrite]:
+        """Permissions d'une sauvegarde, avec les rôles recréés remplacés par leur nouvel ID"""
+        overwrites = {}
+        for target_id, is_member, allow, deny in rows:
+            if is_member:
+                target = discord.Object(id=target_id, type=discord.Member)
+            else:
+                # Les rôles gérés (bots, intégrations) ne sont pas sauvegardés mais existent toujours
+                target = self.role_map.get(target_id) or self.guild.get_role(target_id)
+                if target is None:
+                    continue
+            overwrites[target] = discord.PermissionOverwrite.from_pair(discord.Permissions(allow), discord.Permissions(deny))
+        return overwrites
+
+    def channel_changes(self, channel, row: list) -> dict:
+        """Modifications nécessaires pour ramener un canal existant à son état sauvegardé"""
+        _, _, name, category_id, _, overwrites, options = row
+        changes = {}
+        if channel.name != name:
+            changes['name'] = name
+        if not isinstance(channel, discord.CategoryChannel):
+            category = self.channel_map.get(category_id) if category_id else None
+            # Catégorie sauvegardée non recréée (échec): le canal reste dans sa catégorie actuelle
+            unresolved = category_id is not None and category is None
+            if not unresolved and (category.id if category else None) != channel.category_id:
+                changes['category'] = category
+        for key, value in options.items():
+            if getattr(channel, key, value) != value:
+                changes[key] = value
+
+        merged = self.merged_overwrites(channel, overwrites)
+        wanted = {target.id: overwrite.pair() for target, overwrite in merged.items()}
+        current = {target.id: overwrite.pair() for target, overwrite in channel.overwrites.items()}
+        if wanted != current:
+            changes['overwrites'] = merged
+        return changes
+
+    def merged_overwrites(self, channel, rows: list) -> Dict[discord.abc.Snowflake, discord.PermissionOverwrite]:
+        """Permissions sauvegardées appliquées par-dessus celles du canal
+
+        Seules les cibles que la sauvegarde sait restaurer sont rétablies; les autres
+        permissions existantes (rôles gérés, cibles ajoutées depuis) sont conservées.
+        """
+        restored = self.overwrites_for(rows)
+        restored_ids = {target.id for target in restored}
+        merged = {target: overwrite for target, overwrite in channel.overwrites.items() if target.id not in restored_ids}
+        merged.update(restored)
+        return merged
+
+async def apply_plan(plan: RestorePlan, reason: str, concurrency: int = 5,
+                     on_progress: Optional[Callable[[int, int], Awaitable[None]]] = None) -> tuple:
+    """Applique une restauration en parallèle limité; renvoie (réussites, échecs)"""
+    guild = plan.guild
+    semaphore = asyncio.Semaphore(concurrency)
+    counters = {'done': 0, 'failed': 0}
+
+    async def run(action):
+        async with semaphore:
+            try:
+                await action()
+                counters['done'] += 1
+            except discord.HTTPException:
+                counters['failed'] += 1
+        if on_progress:
+            await on_progress(counters['done'] + counters['failed'], plan.total)
+
+    async def create_role(row):
+        role_id, name, color, permissions, hoist, mentionable, _ = row
+        plan.role_map[role_id] = await guild.create_role(
+            name=name, color=color, permissions=discord.Permissions(permissions),
+            hoist=hoist, mentionable=mentionable, reason=reason
+        )
+
+    async def create_channel(row):
+        channel_id, channel_type, name, category_id, position, overwrites, options = row
+        kwargs = {'overwrites': plan.overwrites_for(overwrites), 'position': position, 'reason': reason}
+        category = plan.channel_map.get(category_id) if category_id else None
+        if channel_type == discord.ChannelType.category.value:
+            created = await guild.create_category(name, **kwargs)
+        elif channel_type == discord.ChannelType.voice.value:
+            created = await guild.create_voice_channel(name, category=category, **kwargs, **options)
+        else:
+            created = await guild.create_text_channel(
+                name, category=category, news=channel_type == discord.ChannelType.news.value, **kwargs, **options
+            )
+        plan.channel_map[channel_id] = created
+
+    async def edit_channel(channel, row):
+        changes = plan.channel_changes(channel, row)
+        if changes:
+            await channel.edit(reason=reason, **changes)
+
+    # 1. Rôles: recréation et rétablissement en parallèle, puis un seul appel pour l'ordre
+    await asyncio.gather(
+        *(run(lambda row=row: create_role(row)) for row in plan.role_creates),
+        *(run(lambda role=role, changes=changes: role.edit(reason=reason, **changes)) for role, changes in plan.role_edits)
+    )
+    await _restore_role_order(plan, reason)
+
+    # 2. Catégories, puis 3. canaux (qui peuvent dépendre d'une catégorie recréée)
+    category = discord.ChannelType.category.value
+    for is_category in (True, False):
+        await asyncio.gather(
+            *(run(lambda row=row: create_channel(row))
+              for row in plan.channel_creates if (row[1] == category) == is_category),
+            *(run(lambda channel=channel, row=row: edit_channel(channel, row))
+              for channel, row in plan.channel_edits if (row[1] == category) == is_category)
+        )
+
+    return counters['done'], counters['failed']
+
+async def _restore_role_order(plan: RestorePlan, reason: str) -> None:
+    """Rétablit l'ordre relatif des rôles sauvegardés en un seul appel si nécessaire"""
+    guild = plan.guild
+    top = guild.me.top_role
+    roles = [plan.role_map[role_id] for role_id in plan.role_order
+             if role_id in plan.role_map and isinstance(plan.role_map[role_id], discord.Role)]
+    movable = [role for role in roles if not role.is_default() and not role.managed and role < top]
+    if not movable:
+        return
+
+    # Les rôles déplaçables se partagent les positions qu'ils occupent déjà
+    slots = sorted(role.position for role in movable)
+    positions = {role: slot for role, slot in zip(movable, slots) if role.position != slot}
+    if positions:
+        try:
+            await guild.edit_role_positions(positions, reason=reason)
+        except discord.HTTPException:
+            pass
@@ -0,0 +1,121 @@
+import discord
+import asyncio
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+class BanCache:
+    """Liste des bannis de chaque serveur, chargée une seule fois puis tenue à jour par les événements
+
+    Deux tableaux triés (noms en minuscules et IDs en texte) permettent une recherche par préfixe.
+    """
+
+    def __init__(self):
+        self.bans: Dict[int, Dict[int, str]] = {}  # guild_id -> user_id -> nom
+        self._by_name: Dict[int, List[Tuple[str, int]]] = {}  # guild_id -> [(nom en minuscules, user_id)] trié
+        self._by_id: Dict[int, List[str]] = {}  # guild_id -> [user_id en texte] trié
+        self._loading: Dict[int, asyncio.Task] = {}
+        # Événements reçus pendant un chargement, rejoués ensuite: guild_id -> [(user_id, nom ou None)]
+        self._pending: Dict[int, List[tuple]] = {}
+
+    def is_loaded(self, guild_id: int) -> bool:
+        return guild_id in self.bans
+
+    async def ensure(self, guild: discord.Guild) -> Optional[Dict[int, str]]:
+        """Renvoie les bannis du serveur, en les chargeant au premier appel (None si impossible)"""
+        cached = self.bans.get(guild.id)
+        if cached is not None:
+            return cached
+
+        # Les appels simultanés partagent un seul chargement
+        task = self._loading.get(guild.id)
+        if task is None:
+            task = asyncio.create_task(self._load(guild))
+            self._loading[guild.id] = task
+        await asyncio.shield(task)
+        return self.bans.get(guild.id)
+
+    async def _load(self, guild: discord.Guild) -> None:
+        self._pending[guild.id] = []
+        try:
+            fetched = {}
+            async for entry in guild.bans(limit=None):
+                fetched[entry.user.id] = str(entry.user)
+
+            for user_id, name in self._pending.get(guild.id, []):
+                if name is None:
+                    fetched.pop(user_id, None)
+                else:
+                    fetched[user_id] = name
+            self.bans[guild.id] = fetched
+            self._by_name[guild.id] = sorted((name.lower(), user_id) for user_id, name in fetched.items())
+            self._by_id[guild.id] = sorted(str(user_id) for user_id in fetched)
+        except discord.HTTPException:
+            pass
+        finally:
+            self._pending.pop(guild.id, None)
+            self._loading.pop(guild.id, None)
+
+    def add(self, guild_id: int, user) -> None:
+        """Enregistre un bannissement (ignoré si la liste n'est pas chargée)"""
+        name = str(user) if not isinstance(user, discord.Object) else self.bans.get(guild_id, {}).get(user.id, "")
+        self._apply(guild_id, user.id, name)
+
+    def remove(self, guild_id: int, user_id: int) -> None:
+        """Enregistre un débannissement"""
+        self._apply(guild_id, user_id, None)
+
+    def _apply(self, guild_id: int, user_id: int, name: Optional[str]) -> None:
+        if guild_id in self._pending:
+            self._pending[guild_id].append((user_id, name))
+
+        cached = self.bans.get(guild_id)
+        if cached is None:
+            return
+
+        # Mise à jour incrémentale des index triés
+        by_name = self._by_name[guild_id]
+        by_id = self._by_id[guild_id]
+        previous = cached.pop(user_id, None)
+        if previous is not None:
+            del by_name[bisect_left(by_name, (previous.lower(), user_id))]
+            del by_id[bisect_left(by_id, str(user_id))]
+        if name is not None:
+            cached[user_id] = name
+            insort(by_name, (name.lower(), user_id))
+            insort(by_id, str(user_id))
+
+    def is_banned(self, guild_id: int, user_id: int) -> Optional[bool]:
+        """True/False si la liste est chargée, None sinon"""
+        cached = self.bans.get(guild_id)
+        return None if cached is None else user_id in cached
+
+    def search(self, guild_id: int, query: str, limit: int = 25) -> List[Tuple[int, str]]:
+        """Bannis dont le nom ou l'ID commence par la recherche: [(user_id, nom)]"""
+        cached = self.bans.get(guild_id)
+        if not cached:
+            return []
+
+        query = query.strip().lower()
+        results: Dict[int, str] = {}
+        if query.isdigit():
+            by_id = self._by_id[guild_id]
+            index = bisect_left(by_id, query)
+            while index < len(by_id) and len(results) < limit and by_id[index].startswith(query):
+                user_id = int(by_id[index])
+                results[user_id] = cached[user_id]
+                index += 1
+
+        by_name = self._by_name[guild_id]
+        index = bisect_left(by_name, (query, 0))
+        while index < len(by_name) and len(results) < limit and by_name[index][0].startswith(query):
+            user_id = by_name[index][1]
+            results[user_id] = cached[user_id]
+            index += 1
+
+        return list(results.items())
+
+    def drop(self, guild_id: int) -> None:
+        """Oublie la liste d'un serveur (départ du bot)"""
+        self.bans.pop(guild_id, None)
+        self._by_name.pop(guild_id, None)
+        self._by_id.pop(guild_id, None)
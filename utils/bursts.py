@@ -0,0 +1,66 @@
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Deque, Dict, List, Tuple
+
+# Tranches d'âge de compte pour les résumés (limite en jours, libellé)
+ACCOUNT_AGE_BUCKETS = [
+    (1, "< 1 jour"),
+    (7, "< 7 jours"),
+    (30, "< 30 jours"),
+    (365, "< 1 an"),
+    (None, "> 1 an")
+]
+
+class BurstDetector:
+    """Détecte les pics d'arrivées/départs par serveur et accumule les membres concernés"""
+
+    def __init__(self):
+        self.events: Dict[Tuple[int, str], Deque[datetime]] = {}  # (guild_id, kind) -> timestamps
+        self.pending: Dict[Tuple[int, str], dict] = {}  # (guild_id, kind) -> résumé en cours
+
+    def record(self, guild_id: int, kind: str, threshold: int, window: int) -> bool:
+        """Enregistre un événement et indique si le serveur est en rafale"""
+        now = datetime.utcnow()
+        key = (guild_id, kind)
+        timestamps = self.events.setdefault(key, deque())
+        timestamps.append(now)
+
+        cutoff = now - timedelta(seconds=window)
+        while timestamps and timestamps[0] <= cutoff:
+            timestamps.popleft()
+
+        return key in self.pending or len(timestamps) >= threshold
+
+    def add(self, guild_id: int, kind: str, window: int, member_id: int, name: str, created_at: datetime) -> None:
+        """Ajoute un membre au résumé en cours"""
+        now = datetime.utcnow()
+        summary = self.pending.setdefault(
+            (guild_id, kind),
+            {'since': now, 'until': now + timedelta(seconds=window), 'members': []}
+        )
+        summary['members'].append((member_id, name, created_at))
+
+    def due(self) -> List[Tuple[int, str, dict]]:
+        """Retire et renvoie les résumés dont la fenêtre est écoulée"""
+        now = datetime.utcnow()
+        ready = [key for key, summary in self.pending.items() if summary['until'] <= now]
+        result = [(guild_id, kind, self.pending.pop((guild_id, kind))) for guild_id, kind in ready]
+
+        # Libérer les fenêtres inactives depuis plus d'une heure
+        stale = now - timedelta(hours=1)
+        for key in [key for key, timestamps in self.events.items() if not timestamps or timestamps[-1] <= stale]:
+            del self.events[key]
+
+        return result
+
+def account_age_distribution(created_dates: List[datetime]) -> List[Tuple[str, int]]:
+    """Répartit des dates de création de compte par tranche d'âge"""
+    now = datetime.utcnow()
+    counts = [0] * len(ACCOUNT_AGE_BUCKETS)
+    for created_at in created_dates:
+        age_days = (now - created_at.replace(tzinfo=None)).days
+        for index, (limit, _) in enumerate(ACCOUNT_AGE_BUCKETS):
+            if limit is None or age_days < limit:
+                counts[index] += 1
+                break
+    return [(label, count) for (_, label), count in zip(ACCOUNT_AGE_BUCKETS, counts)]
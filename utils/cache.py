@@ -0,0 +1,49 @@
+import discord
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+class ResponseCache:
+    """Cache des embeds de réponse par (serveur, commande), avec durée de vie et invalidation"""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        # (guild_id ou None, commande) -> (expiration monotone, embed)
+        self.entries: Dict[Tuple[Optional[int], str], Tuple[float, discord.Embed]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, guild_id: Optional[int], command: str) -> Optional[discord.Embed]:
+        """Copie de l'embed en cache s'il n'a pas expiré, horodatée au moment de l'envoi"""
+        entry = self.entries.get((guild_id, command))
+        if entry is None or entry[0] <= time.monotonic():
+            self.misses += 1
+            return None
+        self.hits += 1
+        embed = entry[1].copy()
+        if embed.timestamp is not None:
+            embed.timestamp = datetime.utcnow()
+        return embed
+
+    def set(self, guild_id: Optional[int], command: str, embed: discord.Embed, ttl: float) -> None:
+        if len(self.entries) >= self.max_entries:
+            self._evict()
+        self.entries[(guild_id, command)] = (time.monotonic() + ttl, embed)
+
+    def invalidate(self, guild_id: Optional[int], *commands: str) -> None:
+        """Oublie les réponses d'un serveur (toutes, ou seulement celles des commandes indiquées)"""
+        if commands:
+            for command in commands:
+                self.entries.pop((guild_id, command), None)
+        else:
+            for key in [key for key in self.entries if key[0] == guild_id]:
+                del self.entries[key]
+
+    def _evict(self) -> None:
+        """Supprime les entrées expirées, ou la plus proche de l'expiration si aucune ne l'est"""
+        now = time.monotonic()
+        expired = [key for key, (expires, _) in self.entries.items() if expires <= now]
+        if not expired:
+            expired = [min(self.entries, key=lambda key: self.entries[key][0])]
+        for key in expired:
+            del self.entries[key]
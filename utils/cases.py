@@ -0,0 +1,135 @@
+import asyncio
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import List, Optional
+
+# Libellés des types de sanctions
+CASE_ACTIONS = {
+    'kick': "👢 Expulsion",
+    'ban': "🔨 Bannissement",
+    'unban': "✅ Débannissement",
+    'mute': "🔇 Mute",
+    'unmute': "🔊 Démute",
+    'timeout': "⏱️ Timeout",
+    'warn': "⚠️ Avertissement",
+    'automod': "🤖 Auto-modération"
+}
+
+class Case:
+    """Dossier de modération numéroté"""
+
+    __slots__ = ('guild_id', 'case_id', 'action', 'target_id', 'target_name', 'moderator_id',
+                 'moderator_name', 'reason', 'duration', 'created_at')
+
+    def __init__(self, guild_id, case_id, action, target_id, target_name, moderator_id,
+                 moderator_name, reason, duration, created_at):
+        self.guild_id = guild_id
+        self.case_id = case_id
+        self.action = action
+        self.target_id = target_id
+        self.target_name = target_name
+        self.moderator_id = moderator_id
+        self.moderator_name = moderator_name
+        self.reason = reason
+        self.duration = duration  # minutes, None si permanent
+        self.created_at = datetime.fromisoformat(created_at)
+
+    @property
+    def label(self) -> str:
+        return CASE_ACTIONS.get(self.action, self.action)
+
+class CaseStore:
+    """Base locale et indexée des dossiers de modération (SQLite)"""
+
+    COLUMNS = ('guild_id, case_id, action, target_id, target_name, moderator_id, '
+               'moderator_name, reason, duration, created_at')
+
+    def __init__(self, path: str = 'data/cases.db'):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript('''
+            CREATE TABLE IF NOT EXISTS cases (
+                guild_id INTEGER NOT NULL,
+                case_id INTEGER NOT NULL,
+                action TEXT NOT NULL,
+                target_id INTEGER NOT NULL,
+                target_name TEXT,
+                moderator_id INTEGER NOT NULL,
+                moderator_name TEXT,
+                reason TEXT,
+                duration INTEGER,
+                created_at TEXT NOT NULL,
+                PRIMARY KEY (guild_id, case_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_cases_target ON cases (guild_id, target_id, case_id);
+        ''')
+        self._db.commit()
+
+    async def add(self, guild_id: int, action: str, target, moderator, reason: str,
+                  duration: Optional[int] = None) -> int:
+        """Enregistre un dossier et renvoie son numéro"""
+        case_ids = await self.add_many(guild_id, action, [target], moderator, reason, duration)
+        return case_ids[0]
+
+    async def add_many(self, guild_id: int, action: str, targets: list, moderator, reason: str,
+                       duration: Optional[int] = None) -> List[int]:
+        """Enregistre un dossier par cible en une seule transaction"""
+        created_at = datetime.now(timezone.utc).isoformat()
+        rows = [
+            # Un simple ID (utilisateur hors du serveur et hors cache) n'a pas de nom à enregistrer
+            (action, target.id, str(target) if hasattr(target, 'name') else None,
+             moderator.id, str(moderator), reason, duration, created_at)
+            for target in targets
+        ]
+        return await asyncio.to_thread(self._insert, guild_id, rows)
+
+    def _insert(self, guild_id: int, rows: list) -> List[int]:
+        with self._lock, self._db:
+            (last_id,) = self._db.execute(
+                'SELECT COALESCE(MAX(case_id), 0) FROM cases WHERE guild_id = ?', (guild_id,)
+            ).fetchone()
+            case_ids = list(range(last_id + 1, last_id + 1 + len(rows)))
+            self._db.executemany(
+                f'INSERT INTO cases ({self.COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [(guild_id, case_id, *row) for case_id, row in zip(case_ids, rows)]
+            )
+        return case_ids
+
+    async def get(self, guild_id: int, case_id: int) -> Optional[Case]:
+        """Récupère un dossier par son numéro"""
+        rows = await asyncio.to_thread(
+            self._query,
+            f'SELECT {self.COLUMNS} FROM cases WHERE guild_id = ? AND case_id = ?',
+            (guild_id, case_id)
+        )
+        return Case(*rows[0]) if rows else None
+
+    async def count_for(self, guild_id: int, target_id: int) -> int:
+        """Nombre de dossiers d'un utilisateur"""
+        rows = await asyncio.to_thread(
+            self._query,
+            'SELECT COUNT(*) FROM cases WHERE guild_id = ? AND target_id = ?',
+            (guild_id, target_id)
+        )
+        return rows[0][0]
+
+    async def page_for(self, guild_id: int, target_id: int, before_case: Optional[int] = None,
+                       limit: int = 10) -> List[Case]:
+        """Page de l'historique d'un utilisateur, du plus récent au plus ancien (pagination par curseur)"""
+        rows = await asyncio.to_thread(
+            self._query,
+            f'SELECT {self.COLUMNS} FROM cases WHERE guild_id = ? AND target_id = ? AND case_id < ? '
+            'ORDER BY case_id DESC LIMIT ?',
+            (guild_id, target_id, before_case if before_case is not None else 2 ** 62, limit)
+        )
+        return [Case(*row) for row in rows]
+
+    def _query(self, sql: str, params: tuple) -> list:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
@@ -1,6 +1,8 @@
 import discord
 from discord.ext import commands
-from typing import Union
+import asyncio
+import logging
+from typing import Dict, Optional, Union
 
 def is_moderator():
     """Vérifie si l'utilisateur a les permissions de modération"""
@@ -55,6 +57,22 @@ def bot_has_permissions(**perms):
     
     return discord.app_commands.check(predicate)
 
+def user_has_permissions(**perms):
+    """Vérifie si l'utilisateur a les permissions Discord nécessaires"""
+    async def predicate(interaction: discord.Interaction) -> bool:
+        if not isinstance(interaction.user, discord.Member):
+            return False
+        
+        user_perms = interaction.user.guild_permissions
+        
+        for perm, value in perms.items():
+            if getattr(user_perms, perm) != value:
+                return False
+        
+        return True
+    
+    return discord.app_commands.check(predicate)
+
 async def can_moderate_member(moderator: discord.Member, target: discord.Member) -> bool:
     """Vérifie si un modérateur peut modérer un membre"""
     # Ne peut pas se modérer soi-même
@@ -95,27 +113,69 @@ async def get_mute_role(guild: discord.Guild, bot_config) -> Union[discord.Role,
             reason="Création automatique du rôle de mute"
         )
         
-        # Configurer les permissions pour tous les canaux
-        for channel in guild.channels:
-            try:
-                if isinstance(channel, discord.TextChannel):
-                    await channel.set_permissions(
-                        mute_role,
-                        send_messages=False,
-                        add_reactions=False,
-                        reason="Configuration du rôle de mute"
-                    )
-                elif isinstance(channel, discord.VoiceChannel):
-                    await channel.set_permissions(
-                        mute_role,
-                        speak=False,
-                        reason="Configuration du rôle de mute"
-                    )
-            except discord.Forbidden:
-                continue
-        
+        # Les permissions des canaux sont configurées en arrière-plan
         bot_config.set_guild_setting(guild.id, 'mute_role', mute_role.id)
+        start_mute_provisioning(guild, mute_role)
         return mute_role
     
     except discord.Forbidden:
         return None
+
+# guild_id -> progression de la configuration du rôle de mute
+mute_provisioning: Dict[int, Dict[str, int]] = {}
+_provisioning_tasks = set()
+
+def mute_overwrite_for(channel) -> Optional[discord.PermissionOverwrite]:
+    """Permissions du rôle de mute adaptées au type de canal"""
+    if isinstance(channel, discord.CategoryChannel):
+        return discord.PermissionOverwrite(send_messages=False, add_reactions=False, speak=False)
+    if isinstance(channel, (discord.VoiceChannel, discord.StageChannel)):
+        return discord.PermissionOverwrite(speak=False)
+    if isinstance(channel, (discord.TextChannel, discord.ForumChannel)):
+        return discord.PermissionOverwrite(send_messages=False, add_reactions=False)
+    return None
+
+async def apply_mute_overwrite(channel, mute_role: discord.Role) -> bool:
+    """Applique les permissions du rôle de mute à un canal (sans appel si déjà en place)"""
+    overwrite = mute_overwrite_for(channel)
+    if overwrite is None or channel.overwrites_for(mute_role) == overwrite:
+        return False
+    
+    await channel.set_permissions(mute_role, overwrite=overwrite, reason="Configuration du rôle de mute")
+    return True
+
+def start_mute_provisioning(guild: discord.Guild, mute_role: discord.Role, concurrency: int = 5) -> Dict[str, int]:
+    """Lance la configuration du rôle de mute sur tous les canaux en tâche de fond"""
+    progress = mute_provisioning.get(guild.id)
+    if progress is not None and progress['done'] < progress['total']:
+        return progress
+    
+    progress = {'done': 0, 'total': len(guild.channels), 'failed': 0}
+    mute_provisioning[guild.id] = progress
+    task = asyncio.create_task(_provision_mute_role(guild, mute_role, progress, concurrency))
+    _provisioning_tasks.add(task)
+    task.add_done_callback(_provisioning_tasks.discard)
+    return progress
+
+async def _provision_mute_role(guild: discord.Guild, mute_role: discord.Role,
+                               progress: Dict[str, int], concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def provision(channel):
+        async with semaphore:
+            try:
+                await apply_mute_overwrite(channel, mute_role)
+            except discord.HTTPException:
+                progress['failed'] += 1
+            progress['done'] += 1
+    
+    # Les catégories d'abord, puis les canaux (les canaux déjà conformes ne coûtent aucun appel)
+    categories = [channel for channel in guild.channels if isinstance(channel, discord.CategoryChannel)]
+    channels = [channel for channel in guild.channels if not isinstance(channel, discord.CategoryChannel)]
+    await asyncio.gather(*(provision(channel) for channel in categories))
+    await asyncio.gather(*(provision(channel) for channel in channels))
+    
+    logging.info(
+        f"🔇 Rôle de mute configuré sur {guild.name}: "
+        f"{progress['done'] - progress['failed']}/{progress['total']} canaux"
+    )
@@ -0,0 +1,101 @@
+import heapq
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+# Nombre de membres retenus dans le classement des sanctionnés
+DIGEST_TOP = 10
+# Actions qui ne comptent pas comme une infraction du membre visé
+NON_OFFENSES = {'unban', 'unmute'}
+
+# Libellés des règles d'auto-modération
+AUTOMOD_RULES = {
+    'spam': "💬 Spam",
+    'links': "🔗 Liens",
+    'mentions': "📢 Mentions"
+}
+
+class TopK:
+    """Classement exact des k plus grands compteurs, tenu à jour à chaque incrément (tas min de k entrées)"""
+
+    def __init__(self, k: int):
+        self.k = k
+        self.counts: Dict[int, int] = {}
+        self.heap: List[list] = []  # [compteur, id], le plus petit en tête
+        self.entries: Dict[int, list] = {}
+
+    def add(self, key: int, amount: int = 1) -> None:
+        count = self.counts.get(key, 0) + amount
+        self.counts[key] = count
+
+        entry = self.entries.get(key)
+        if entry is not None:
+            entry[0] = count
+            heapq.heapify(self.heap)  # O(k)
+        elif len(self.heap) < self.k:
+            entry = self.entries[key] = [count, key]
+            heapq.heappush(self.heap, entry)
+        elif count > self.heap[0][0]:
+            # Les compteurs ne font que croître: un membre hors du tas ne dépasse jamais sa tête
+            entry = self.entries[key] = [count, key]
+            evicted = heapq.heapreplace(self.heap, entry)
+            del self.entries[evicted[1]]
+
+    def top(self) -> List[Tuple[int, int]]:
+        """(id, compteur) du plus grand au plus petit"""
+        return [(key, count) for count, key in sorted(self.heap, reverse=True)]
+
+class DigestCounters:
+    """Agrégats d'un serveur depuis le dernier digest"""
+
+    __slots__ = ('since', 'actions', 'automod', 'joins', 'leaves', 'offenders')
+
+    def __init__(self):
+        self.since = datetime.utcnow()
+        self.actions = Counter()  # type de sanction -> nombre
+        self.automod = Counter()  # règle -> déclenchements
+        self.joins = 0
+        self.leaves = 0
+        self.offenders = TopK(DIGEST_TOP)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.actions or self.automod or self.joins or self.leaves)
+
+class ModerationDigest:
+    """Compteurs de chaque serveur, mis à jour au fil des événements et vidés à chaque digest"""
+
+    def __init__(self):
+        self.guilds: Dict[int, DigestCounters] = {}
+
+    def _counters(self, guild_id: int) -> DigestCounters:
+        counters = self.guilds.get(guild_id)
+        if counters is None:
+            counters = self.guilds[guild_id] = DigestCounters()
+        return counters
+
+    def record_action(self, guild_id: int, action: str, target_ids: List[int]) -> None:
+        counters = self._counters(guild_id)
+        counters.actions[action] += len(target_ids)
+        if action not in NON_OFFENSES:
+            for target_id in target_ids:
+                counters.offenders.add(target_id)
+
+    def record_automod(self, guild_id: int, rule: str, user_id: int) -> None:
+        counters = self._counters(guild_id)
+        counters.automod[rule] += 1
+        counters.offenders.add(user_id)
+
+    def record_join(self, guild_id: int) -> None:
+        self._counters(guild_id).joins += 1
+
+    def record_leave(self, guild_id: int) -> None:
+        self._counters(guild_id).leaves += 1
+
+    def drain(self) -> Dict[int, DigestCounters]:
+        """Renvoie les agrégats de tous les serveurs et repart de zéro"""
+        guilds, self.guilds = self.guilds, {}
+        return guilds
+
+    def drop(self, guild_id: int) -> None:
+        self.guilds.pop(guild_id, None)
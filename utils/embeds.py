@@ -1,5 +1,5 @@
 import discord
-from datetime import datetime
+from datetime import datetime, timezone
 from config.settings import Colors
 
 class EmbedBuilder:
@@ -76,6 +76,81 @@ class EmbedBuilder:
         
         return embed
     
+    @staticmethod
+    def case_detail(case) -> discord.Embed:
+        """Embed détaillant un dossier de modération"""
+        embed = discord.Embed(
+            title=f"📁 Cas #{case.case_id} - {case.label}",
+            color=Colors.MODERATION,
+            timestamp=case.created_at
+        )
+        
+        embed.add_field(name="👤 Utilisateur", value=f"<@{case.target_id}>\n`{case.target_name or case.target_id}`", inline=True)
+        embed.add_field(name="👮 Modérateur", value=f"<@{case.moderator_id}>\n`{case.moderator_name}`", inline=True)
+        if case.duration:
+            embed.add_field(name="⏱️ Durée", value=f"{case.duration} minutes", inline=True)
+        embed.add_field(name="📝 Raison", value=(case.reason or "Aucune raison spécifiée")[:1024], inline=False)
+        embed.set_footer(text=f"ID: {case.target_id}")
+        
+        return embed
+    
+    @staticmethod
+    def case_history(user, cases: list, page: int, total: int, per_page: int) -> discord.Embed:
+        """Embed d'une page de l'historique de modération d'un utilisateur"""
+        lines = [
+            f"**#{case.case_id}** {case.label} • <t:{int(case.created_at.timestamp())}:d> • "
+            f"{(case.reason or 'Aucune raison')[:80]}"
+            for case in cases
+        ]
+        embed = discord.Embed(
+            title=f"📁 Historique - {user}",
+            description="\n".join(lines) or "*Aucun dossier*",
+            color=Colors.MODERATION,
+            timestamp=datetime.utcnow()
+        )
+        
+        pages = max(1, -(-total // per_page))
+        embed.set_footer(text=f"Page {page + 1}/{pages} • {total} dossier(s) | ID: {user.id}")
+        if hasattr(user, 'display_avatar'):
+            embed.set_thumbnail(url=user.display_avatar.url)
+        
+        return embed
+    
+    @staticmethod
+    def job_progress(job) -> discord.Embed:
+        """Embed de progression d'une tâche de fond"""
+        embed = discord.Embed(
+            title=f"⚙️ Tâche #{job.id} - {job.name}",
+            description=job.progress or "*En attente...*",
+            color=Colors.INFO,
+            timestamp=datetime.utcnow()
+        )
+        embed.set_footer(text=f"/jobs cancel:{job.id} pour annuler")
+        return embed
+    
+    @staticmethod
+    def job_list(jobs: list, statuses: dict) -> discord.Embed:
+        """Embed de la liste des tâches de fond d'un serveur"""
+        lines = []
+        for job in jobs:
+            line = f"**#{job.id}** {statuses.get(job.status, job.status)} • {job.name} • <@{job.owner_id}>"
+            if job.status == 'scheduled' and job.run_at:
+                line += f" • <t:{int(job.run_at.replace(tzinfo=timezone.utc).timestamp())}:R>"
+            elif job.status == 'failed' and job.error:
+                line += f"\n└ {job.error[:80]}"
+            elif job.progress and not job.finished:
+                line += f"\n└ {job.progress[:80]}"
+            lines.append(line)
+    
+        embed = discord.Embed(
+            title="⚙️ Tâches de fond",
+            description="\n".join(lines)[:4096] or "*Aucune tâche*",
+            color=Colors.INFO,
+            timestamp=datetime.utcnow()
+        )
+        embed.set_footer(text="/jobs cancel:<id> pour annuler une tâche")
+        return embed
+    
     @staticmethod
     def message_delete(message: discord.Message) -> discord.Embed:
         """Embed pour message supprimé"""
@@ -98,6 +173,22 @@ class EmbedBuilder:
         
         return embed
     
+    @staticmethod
+    def bulk_delete(channel, deleted: int, cached: int) -> discord.Embed:
+        """Embed pour suppression de messages en masse"""
+        embed = discord.Embed(
+            title="🗑️ Messages Supprimés en Masse",
+            color=Colors.DELETE,
+            timestamp=datetime.utcnow()
+        )
+        
+        embed.add_field(name="📍 Canal", value=channel.mention if channel else "*Inconnu*", inline=True)
+        embed.add_field(name="🔢 Nombre", value=str(deleted), inline=True)
+        embed.add_field(name="💾 En cache", value=f"{cached}/{deleted}", inline=True)
+        embed.set_footer(text="Transcription complète en pièce jointe")
+        
+        return embed
+    
     @staticmethod
     def message_edit(before: discord.Message, after: discord.Message) -> discord.Embed:
         """Embed pour message édité"""
@@ -160,6 +251,81 @@ class EmbedBuilder:
         
         return embed
     
+    @staticmethod
+    def member_burst(joined: bool, count: int, seconds: int, distribution: list, member_count: int) -> discord.Embed:
+        """Embed résumant une rafale d'arrivées ou de départs"""
+        action = "ont rejoint" if joined else "ont quitté"
+        embed = discord.Embed(
+            title="👥 Rafale d'Arrivées" if joined else "👥 Rafale de Départs",
+            description=f"**{count}** membres {action} le serveur ces {seconds} dernières secondes.",
+            color=Colors.JOIN if joined else Colors.LEAVE,
+            timestamp=datetime.utcnow()
+        )
+        
+        if joined:
+            lines = [f"{label}: **{amount}**" for label, amount in distribution if amount]
+            embed.add_field(name="📅 Âge des comptes", value="\n".join(lines) or "*Aucun*", inline=True)
+        embed.add_field(name="👥 Nombre de membres", value=str(member_count), inline=True)
+        embed.set_footer(text="Liste des IDs en pièce jointe")
+        
+        return embed
+    
+    @staticmethod
+    def voice_session(member: discord.Member, channels: list, duration: str, moves: int) -> discord.Embed:
+        """Embed résumant une session vocale terminée"""
+        embed = discord.Embed(
+            title="🔊 Session Vocale",
+            color=Colors.LOGS,
+            timestamp=datetime.utcnow()
+        )
+        
+        embed.add_field(name="👤 Membre", value=f"{member.mention}\n`{member}`", inline=True)
+        embed.add_field(name="⏱️ Durée", value=duration, inline=True)
+        embed.add_field(name="🔄 Changements", value=str(moves), inline=True)
+        embed.add_field(name="📍 Canaux visités", value=" → ".join(channels)[:1024] or "*Inconnu*", inline=False)
+        
+        embed.set_thumbnail(url=member.display_avatar.url)
+        embed.set_footer(text=f"ID: {member.id}")
+        
+        return embed
+    
+    @staticmethod
+    def voice_digest(lines: list, total_sessions: int, total_duration: str) -> discord.Embed:
+        """Embed de digest périodique des sessions vocales"""
+        description = "\n".join(lines[:20])
+        if len(lines) > 20:
+            description += f"\n... et {len(lines) - 20} autre(s) session(s)"
+        
+        embed = discord.Embed(
+            title="🔊 Digest Vocal",
+            description=description[:4096],
+            color=Colors.LOGS,
+            timestamp=datetime.utcnow()
+        )
+        
+        embed.add_field(name="🔢 Sessions", value=str(total_sessions), inline=True)
+        embed.add_field(name="⏱️ Durée cumulée", value=total_duration, inline=True)
+        
+        return embed
+    
+    @staticmethod
+    def moderation_digest(actions: list, automod: list, offenders: list, joins: int, leaves: int,
+                          since: datetime) -> discord.Embed:
+        """Embed du digest quotidien de modération"""
+        embed = discord.Embed(
+            title="📋 Digest de Modération",
+            description=f"Activité depuis <t:{int(since.replace(tzinfo=timezone.utc).timestamp())}:f>",
+            color=Colors.MODERATION,
+            timestamp=datetime.utcnow()
+        )
+        
+        embed.add_field(name="🔨 Sanctions", value="\n".join(actions) or "*Aucune*", inline=True)
+        embed.add_field(name="🤖 Auto-modération", value="\n".join(automod) or "*Aucune*", inline=True)
+        embed.add_field(name="👥 Membres", value=f"📥 Arrivées: **{joins}**\n📤 Départs: **{leaves}**", inline=True)
+        embed.add_field(name="⚠️ Membres les plus sanctionnés", value="\n".join(offenders)[:1024] or "*Aucun*", inline=False)
+        
+        return embed
+    
     @staticmethod
     def auto_moderation(action: str, user: discord.Member, reason: str, details: str = "") -> discord.Embed:
         """Embed pour actions de modération automatique"""
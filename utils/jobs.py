@@ -0,0 +1,147 @@
+import discord
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+from utils.embeds import EmbedBuilder
+
+# Libellés des états de tâche
+JOB_STATUSES = {
+    'scheduled': "🕒 Programmée",
+    'queued': "⏳ En attente",
+    'running': "⚙️ En cours",
+    'done': "✅ Terminée",
+    'failed': "❌ Échouée",
+    'cancelled': "🛑 Annulée"
+}
+
+# Durée de validité d'un jeton d'interaction (15 minutes), avec une marge
+INTERACTION_TOKEN_LIFETIME = 14 * 60
+
+class Job:
+    """Tâche de fond identifiée, avec progression affichée dans un message édité"""
+
+    def __init__(self, job_id: int, guild_id: int, owner_id: int, name: str,
+                 message: Optional[discord.Message] = None, fallback: Optional[discord.abc.Messageable] = None):
+        self.id = job_id
+        self.guild_id = guild_id
+        self.owner_id = owner_id
+        self.name = name
+        self.message = message
+        # Destination d'un message classique quand celui de l'interaction n'est plus modifiable
+        self.fallback = fallback
+        self._token_expires_at = None
+        if isinstance(message, (discord.WebhookMessage, discord.InteractionMessage)):
+            self._token_expires_at = time.monotonic() + INTERACTION_TOKEN_LIFETIME
+        self.status = 'queued'
+        self.progress = ""
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.run_at: Optional[datetime] = None
+        self.task: Optional[asyncio.Task] = None
+        self._last_report = 0.0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('done', 'failed', 'cancelled')
+
+    async def report(self, progress: str, embed: Optional[discord.Embed] = None, force: bool = False) -> None:
+        """Met à jour la progression et édite le message associé (au plus toutes les 2 secondes)"""
+        self.progress = progress
+        if self.message is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_report < 2.0:
+            return
+        self._last_report = now
+
+        embed = embed or EmbedBuilder.job_progress(self)
+        if self._token_expires_at is not None and now >= self._token_expires_at:
+            await self._fall_back(embed)
+            return
+        try:
+            await self.message.edit(embed=embed)
+        except discord.HTTPException:
+            await self._fall_back(embed)
+
+    async def _fall_back(self, embed: discord.Embed) -> None:
+        """Remplace le message lié au jeton d'interaction par un message classique (ou abandonne l'affichage)"""
+        self.message = None
+        self._token_expires_at = None
+        if self.fallback is None:
+            return
+        try:
+            self.message = await self.fallback.send(embed=embed)
+        except discord.HTTPException:
+            pass
+
+class JobManager:
+    """Exécute les commandes longues sur un nombre borné de workers, hors des interactions"""
+
+    def __init__(self, max_workers: int = 4, history: int = 20):
+        self.max_workers = max_workers
+        self.history = history  # tâches terminées conservées par serveur
+        self.jobs: Dict[int, Dict[int, Job]] = {}  # guild_id -> job_id -> tâche
+        self._next_id = 1
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def submit(self, guild_id: int, owner_id: int, name: str, func: Callable[[Job], Awaitable[None]],
+               delay: float = 0, message: Optional[discord.Message] = None,
+               fallback: Optional[discord.abc.Messageable] = None) -> Job:
+        """Soumet une tâche (éventuellement différée) et renvoie immédiatement"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+
+        job = Job(self._next_id, guild_id, owner_id, name, message, fallback)
+        self._next_id += 1
+        self.jobs.setdefault(guild_id, {})[job.id] = job
+        job.task = asyncio.create_task(self._run(job, func, delay))
+        return job
+
+    async def _run(self, job: Job, func: Callable[[Job], Awaitable[None]], delay: float) -> None:
+        try:
+            if delay:
+                # Les tâches programmées (démutes...) sont courtes: elles n'attendent jamais un worker,
+                # sans quoi elles dépasseraient leur échéance derrière des tâches de masse
+                job.status = 'scheduled'
+                job.run_at = datetime.utcnow() + timedelta(seconds=delay)
+                await asyncio.sleep(delay)
+                job.status = 'running'
+                await func(job)
+            else:
+                job.status = 'queued'
+                async with self._semaphore:
+                    job.status = 'running'
+                    await func(job)
+            job.status = 'done'
+        except asyncio.CancelledError:
+            job.status = 'cancelled'
+        except Exception as e:
+            job.status = 'failed'
+            job.error = str(e)
+            logging.error(f"❌ Tâche #{job.id} ({job.name}) échouée: {e}")
+        finally:
+            self._trim(job.guild_id)
+
+    def list(self, guild_id: int) -> List[Job]:
+        """Tâches d'un serveur, les plus récentes d'abord"""
+        return sorted(self.jobs.get(guild_id, {}).values(), key=lambda job: job.id, reverse=True)
+
+    def get(self, guild_id: int, job_id: int) -> Optional[Job]:
+        return self.jobs.get(guild_id, {}).get(job_id)
+
+    def cancel(self, guild_id: int, job_id: int) -> bool:
+        """Annule une tâche non terminée"""
+        job = self.get(guild_id, job_id)
+        if job is None or job.finished or job.task is None:
+            return False
+        job.task.cancel()
+        return True
+
+    def _trim(self, guild_id: int) -> None:
+        """Ne garde qu'un historique borné de tâches terminées"""
+        jobs = self.jobs.get(guild_id, {})
+        finished = sorted((job for job in jobs.values() if job.finished), key=lambda job: job.id)
+        for job in finished[:-self.history]:
+            del jobs[job.id]
@@ -0,0 +1,33 @@
+import re
+from typing import List
+
+# Patterns pour détecter les liens
+URL_PATTERNS = [
+    re.compile(r'https?://(?:[-\w.])+(?:\:[0-9]+)?(?:/(?:[\w/_.])*(?:\?(?:[\w&=%.])*)?(?:\#(?:[\w.])*)?)?'),
+    re.compile(r'www\.(?:[-\w.])+(?:\:[0-9]+)?(?:/(?:[\w/_.])*(?:\?(?:[\w&=%.])*)?(?:\#(?:[\w.])*)?)?'),
+    re.compile(r'(?:discord\.gg|discordapp\.com/invite)/[a-zA-Z0-9]+'),
+    re.compile(r'[a-zA-Z0-9-]+\.(?:com|net|org|fr|be|ca|uk|de|es|it|pl|ru|jp|br|mx|au|nl|se|no|dk|fi|ch|at|pt|gr|cz|hu|bg|ro|hr|sk|si|ee|lv|lt|ie|lu|mt|cy)(?:/[^\s]*)?')
+]
+
+def may_contain_link(content: str) -> bool:
+    """Préfiltre commun: tout lien reconnu par URL_PATTERNS contient un point ou '://'"""
+    return bool(content) and ('.' in content or '://' in content)
+
+def find_links(content: str) -> List[str]:
+    """Détecte les liens dans un texte"""
+    if not may_contain_link(content):
+        return []
+    found_links = []
+    content = content.lower()
+    
+    for pattern in URL_PATTERNS:
+        found_links.extend(pattern.findall(content))
+    
+    return found_links
+
+def has_links(content: str) -> bool:
+    """Indique si un texte contient au moins un lien (s'arrête au premier trouvé)"""
+    if not may_contain_link(content):
+        return False
+    content = content.lower()
+    return any(pattern.search(content) for pattern in URL_PATTERNS)
@@ -0,0 +1,184 @@
+import discord
+import asyncio
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+# Membres indexés entre deux pauses lors de la construction (pour ne pas bloquer la boucle)
+BUILD_CHUNK = 2000
+# Un trigramme présent chez plus de cette proportion de membres est trop peu discriminant
+COMMON_TRIGRAM_RATIO = 0.2
+
+def normalize(text: str) -> str:
+    """Minuscules, sans accents ni caractères non alphanumériques"""
+    decomposed = unicodedata.normalize('NFKD', text).casefold()
+    return "".join(char for char in decomposed if char.isalnum())
+
+def trigrams(key: str) -> Set[str]:
+    """Trigrammes d'un nom normalisé (avec marqueurs de début et de fin)"""
+    padded = f"  {key} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+def member_keys(member: discord.Member) -> Tuple[str, ...]:
+    """Noms indexés d'un membre: nom d'utilisateur, nom global et pseudo"""
+    keys = []
+    for name in (member.name, member.global_name, member.nick):
+        if name:
+            key = normalize(name)
+            if key and key not in keys:
+                keys.append(key)
+    return tuple(keys)
+
+class MemberIndex:
+    """Index de recherche d'un serveur: tableau trié pour les préfixes et trigrammes pour l'approximatif"""
+
+    def __init__(self):
+        self.keys: Dict[int, Tuple[str, ...]] = {}  # member_id -> noms normalisés
+        self.sorted_keys: List[Tuple[str, int]] = []  # (nom, member_id) trié
+        self.postings: Dict[str, Set[int]] = {}  # trigramme -> member_ids
+        self.ready = False
+
+    async def build(self, guild: discord.Guild) -> None:
+        """Construit l'index par paquets; les événements reçus entre-temps sont déjà appliqués"""
+        members = list(guild.members)
+        for index in range(0, len(members), BUILD_CHUNK):
+            for member in members[index:index + BUILD_CHUNK]:
+                # Ignore les membres partis ou déjà indexés par un événement plus récent
+                if member.id not in self.keys and guild.get_member(member.id) is not None:
+                    self._index(member.id, member_keys(member))
+            await asyncio.sleep(0)
+
+        self.sorted_keys = sorted((key, member_id) for member_id, keys in self.keys.items() for key in keys)
+        self.ready = True
+
+    def _index(self, member_id: int, keys: Tuple[str, ...]) -> None:
+        self.keys[member_id] = keys
+        for key in keys:
+            for trigram in trigrams(key):
+                self.postings.setdefault(trigram, set()).add(member_id)
+            if self.ready:
+                insort(self.sorted_keys, (key, member_id))
+
+    def add(self, member: discord.Member) -> None:
+        """Indexe ou réindexe un membre"""
+        keys = member_keys(member)
+        if self.keys.get(member.id) == keys:
+            return
+        self.remove(member.id)
+        self._index(member.id, keys)
+
+    def remove(self, member_id: int) -> None:
+        keys = self.keys.pop(member_id, None)
+        if not keys:
+            return
+        for key in keys:
+            for trigram in trigrams(key):
+                posting = self.postings.get(trigram)
+                if posting is not None:
+                    posting.discard(member_id)
+                    if not posting:
+                        del self.postings[trigram]
+            if self.ready:
+                position = bisect_left(self.sorted_keys, (key, member_id))
+                if position < len(self.sorted_keys) and self.sorted_keys[position] == (key, member_id):
+                    del self.sorted_keys[position]
+
+    def search(self, query: str, limit: int = 10) -> List[int]:
+        """IDs des membres correspondants: préfixes exacts d'abord, puis correspondances approximatives"""
+        stripped = query.strip()
+        if stripped.isdigit() and int(stripped) in self.keys:
+            return [int(stripped)]
+
+        normalized = normalize(query)
+        if not normalized:
+            return []
+
+        results: List[int] = []
+        position = bisect_left(self.sorted_keys, (normalized, 0))
+        while position < len(self.sorted_keys) and len(results) < limit:
+            key, member_id = self.sorted_keys[position]
+            if not key.startswith(normalized):
+                break
+            if member_id not in results:
+                results.append(member_id)
+            position += 1
+
+        if len(results) < limit:
+            for member_id in self._fuzzy(normalized, limit * 5):
+                if member_id not in results:
+                    results.append(member_id)
+                    if len(results) >= limit:
+                        break
+        return results
+
+    def _fuzzy(self, normalized: str, candidates: int) -> List[int]:
+        """Classe les membres par similarité de trigrammes (indice de Jaccard)"""
+        query_trigrams = trigrams(normalized)
+        postings = sorted((self.postings.get(trigram, set()) for trigram in query_trigrams), key=len)
+        postings = [posting for posting in postings if posting]
+        if not postings:
+            return []
+
+        # Les trigrammes trop fréquents sont ignorés s'il en reste de plus sélectifs
+        limit = max(1, int(len(self.keys) * COMMON_TRIGRAM_RATIO))
+        selective = [posting for posting in postings if len(posting) <= limit] or postings[:1]
+
+        counts = Counter()
+        for posting in selective:
+            counts.update(posting)
+
+        scored = []
+        for member_id, _ in counts.most_common(candidates):
+            best = 0.0
+            for key in self.keys.get(member_id, ()):
+                key_trigrams = trigrams(key)
+                shared = len(query_trigrams & key_trigrams)
+                best = max(best, shared / len(query_trigrams | key_trigrams))
+            scored.append((best, member_id))
+        scored.sort(reverse=True)
+        return [member_id for score, member_id in scored if score > 0.2]
+
+class MemberSearch:
+    """Index de recherche de chaque serveur, construits à la demande puis tenus à jour"""
+
+    def __init__(self):
+        self.indexes: Dict[int, MemberIndex] = {}
+        self._building: Dict[int, asyncio.Task] = {}
+
+    async def get(self, guild: discord.Guild) -> MemberIndex:
+        index = self.indexes.get(guild.id)
+        if index is not None and index.ready:
+            return index
+
+        task = self._building.get(guild.id)
+        if task is None or index is None:
+            index = MemberIndex()
+            self.indexes[guild.id] = index
+            task = asyncio.create_task(index.build(guild))
+            self._building[guild.id] = task
+            task.add_done_callback(lambda done: self._built(guild.id, done))
+        await asyncio.shield(task)
+        # Index local: le serveur a pu être oublié (drop) pendant la construction
+        return index
+
+    def _built(self, guild_id: int, task: asyncio.Task) -> None:
+        # Une construction relancée après un drop ne doit pas être oubliée par l'ancienne
+        if self._building.get(guild_id) is task:
+            del self._building[guild_id]
+
+    def _loaded(self, guild_id: int) -> Optional[MemberIndex]:
+        return self.indexes.get(guild_id)
+
+    def member_added(self, member: discord.Member) -> None:
+        index = self._loaded(member.guild.id)
+        if index is not None:
+            index.add(member)
+
+    def member_removed(self, member: discord.Member) -> None:
+        index = self._loaded(member.guild.id)
+        if index is not None:
+            index.remove(member.id)
+
+    def drop(self, guild_id: int) -> None:
+        self.indexes.pop(guild_id, None)
@@ -0,0 +1,77 @@
+import discord
+import asyncio
+import logging
+from typing import List
+
+class DMQueue:
+    """File d'envoi des messages privés de sanction, traitée en tâche de fond
+
+    Parallélisme borné, nouvelles tentatives sur les erreurs transitoires et abandon
+    immédiat quand l'utilisateur refuse les MPs.
+    """
+
+    def __init__(self, workers: int = 3, max_retries: int = 3, max_size: int = 1000):
+        self.workers = workers
+        self.max_retries = max_retries
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self._tasks: List[asyncio.Task] = []
+
+        # Métriques
+        self.sent = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        for _ in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker()))
+
+    def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+
+    def enqueue(self, user: discord.abc.User, embed: discord.Embed) -> asyncio.Future:
+        """Programme un MP; le résultat (envoyé ou non) est disponible via le futur renvoyé"""
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((user, embed, future))
+        except asyncio.QueueFull:
+            self.failed += 1
+            future.set_result(False)
+        return future
+
+    async def _worker(self) -> None:
+        while True:
+            user, embed, future = await self.queue.get()
+            try:
+                delivered = await self._deliver(user, embed)
+            except Exception as e:
+                logging.error(f"❌ Erreur d'envoi de MP à {user}: {e}")
+                self.failed += 1
+                delivered = False
+            finally:
+                self.queue.task_done()
+            if not future.done():
+                future.set_result(delivered)
+
+    async def _deliver(self, user: discord.abc.User, embed: discord.Embed) -> bool:
+        for attempt in range(self.max_retries + 1):
+            try:
+                await user.send(embed=embed)
+                self.sent += 1
+                return True
+            except (discord.Forbidden, discord.NotFound):
+                # MPs fermés ou utilisateur introuvable: inutile de réessayer
+                self.failed += 1
+                return False
+            except discord.HTTPException as e:
+                if e.status < 500 and e.status != 429:
+                    self.failed += 1
+                    return False
+            except (OSError, asyncio.TimeoutError):
+                pass
+            
+            if attempt < self.max_retries:
+                await asyncio.sleep(2 ** attempt)
+
+        self.failed += 1
+        return False
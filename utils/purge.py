@@ -0,0 +1,219 @@
+import discord
+import asyncio
+import re
+import time
+from datetime import timedelta
+from typing import Awaitable, Callable, List, Optional, Pattern
+from utils.links import has_links
+
+# Discord refuse la suppression groupée des messages de plus de 14 jours (marge de sécurité incluse)
+BULK_DELETE_MAX_AGE = timedelta(days=14) - timedelta(minutes=5)
+BULK_DELETE_CHUNK = 100
+
+# Expressions régulières fournies par les modérateurs: longueur maximale
+MAX_PATTERN_LENGTH = 100
+
+class PurgeResult:
+    """Bilan d'une suppression de messages"""
+
+    __slots__ = ('scanned', 'deleted', 'bulk_requests', 'single_requests', 'failed', 'cancelled')
+
+    def __init__(self):
+        self.scanned = 0
+        self.deleted = 0
+        self.bulk_requests = 0
+        self.single_requests = 0
+        self.failed = 0
+        self.cancelled = False
+
+    @property
+    def history_requests(self) -> int:
+        """Nombre de pages d'historique lues (100 messages par page)"""
+        return max(1, -(-self.scanned // 100))
+
+    @property
+    def requests(self) -> int:
+        """Nombre total d'appels REST (lecture et suppression)"""
+        return self.history_requests + self.bulk_requests + self.single_requests
+
+def build_message_filter(member_id: Optional[int] = None, bots: bool = False,
+                         attachments: bool = False, embeds: bool = False,
+                         min_mentions: int = 0, links: bool = False,
+                         pattern: Optional[Pattern] = None) -> Optional[Callable[[discord.Message], bool]]:
+    """Combine les filtres de suppression, évalués du moins coûteux au plus coûteux"""
+    checks = []
+    if member_id is not None:
+        checks.append(lambda message: message.author.id == member_id)
+    if bots:
+        checks.append(lambda message: message.author.bot)
+    if attachments:
+        checks.append(lambda message: bool(message.attachments))
+    if embeds:
+        checks.append(lambda message: bool(message.embeds))
+    if min_mentions:
+        checks.append(lambda message: len(message.raw_mentions) + len(message.raw_role_mentions) >= min_mentions)
+    if links:
+        checks.append(lambda message: has_links(message.content))
+    if pattern is not None:
+        checks.append(lambda message: pattern.search(message.content) is not None)
+
+    if not checks:
+        return None
+    if len(checks) == 1:
+        return checks[0]
+    return lambda message: all(check(message) for check in checks)
+
+def compile_user_pattern(regex: str) -> Pattern:
+    """Compile une expression de filtre en refusant celles au coût potentiellement exponentiel
+
+    Sont refusés les expressions trop longues, les références arrière et les groupes
+    répétés contenant eux-mêmes une répétition ou une alternative (ex: `(a+)+`, `(a|a)*`).
+    Lève re.error avec un message explicite.
+    """
+    if len(regex) > MAX_PATTERN_LENGTH:
+        raise re.error(f"expression trop longue (maximum {MAX_PATTERN_LENGTH} caractères)")
+    if re.search(r'\\[1-9]|\(\?P=', regex):
+        raise re.error("les références arrière ne sont pas autorisées")
+
+    # Pile des groupes ouverts: True si le groupe contient une répétition ou une alternative
+    groups = [False]
+    index = 0
+    while index < len(regex):
+        char = regex[index]
+        if char == '\\':
+            index += 2
+            continue
+        if char == '[':
+            # Classe de caractères: son contenu ne compte pas
+            index += 1
+            if index < len(regex) and regex[index] == ']':
+                index += 1
+            while index < len(regex) and regex[index] != ']':
+                index += 2 if regex[index] == '\\' else 1
+        elif char == '(':
+            groups.append(False)
+        elif char == ')' and len(groups) > 1:
+            risky = groups.pop()
+            following = regex[index + 1:index + 2]
+            if risky and following in ('*', '+', '{'):
+                raise re.error("les groupes répétés contenant une répétition ou une alternative ne sont pas autorisés")
+            groups[-1] = groups[-1] or risky
+        elif char in '*+{|':
+            groups[-1] = True
+        index += 1
+
+    return re.compile(regex, re.IGNORECASE)
+
+class StreamingPurger:
+    """Parcourt l'historique d'un canal à la volée et supprime les messages correspondants
+
+    Les messages récents sont supprimés par paquets de 100, les messages de plus de
+    14 jours un par un avec un délai entre chaque requête.
+    """
+
+    def __init__(self, channel: discord.abc.Messageable, amount: int,
+                 check: Optional[Callable[[discord.Message], bool]] = None,
+                 before: Optional[discord.abc.Snowflake] = None,
+                 after: Optional[discord.abc.Snowflake] = None,
+                 on_progress: Optional[Callable[[PurgeResult], Awaitable[None]]] = None,
+                 progress_interval: float = 3.0, single_delay: float = 1.2,
+                 reason: Optional[str] = None):
+        self.channel = channel
+        self.amount = amount
+        self.check = check
+        self.before = before
+        self.after = after
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        self.single_delay = single_delay
+        self.reason = reason
+        self.result = PurgeResult()
+        self._last_progress = 0.0
+
+    async def run(self) -> PurgeResult:
+        """Exécute la suppression et renvoie le bilan"""
+        cutoff = discord.utils.utcnow() - BULK_DELETE_MAX_AGE
+        batch: List[discord.Message] = []
+        matched = 0
+
+        try:
+            async for message in self.channel.history(limit=None, before=self.before,
+                                                      after=self.after, oldest_first=False):
+                self.result.scanned += 1
+                if self.check is not None and not self.check(message):
+                    await self._maybe_report()
+                    continue
+
+                matched += 1
+                if message.created_at > cutoff:
+                    batch.append(message)
+                    if len(batch) >= BULK_DELETE_CHUNK:
+                        await self._flush(batch)
+                        batch = []
+                else:
+                    # L'historique est parcouru du plus récent au plus ancien:
+                    # les messages suivants sont également trop anciens
+                    if batch:
+                        await self._flush(batch)
+                        batch = []
+                    await self._delete_single(message)
+
+                if matched >= self.amount:
+                    break
+                await self._maybe_report()
+
+            if batch:
+                await self._flush(batch)
+        except asyncio.CancelledError:
+            self.result.cancelled = True
+            raise
+
+        return self.result
+
+    async def _flush(self, batch: List[discord.Message]) -> None:
+        """Suppression groupée d'au plus 100 messages récents"""
+        try:
+            await self.channel.delete_messages(batch, reason=self.reason)
+            self.result.deleted += len(batch)
+        except discord.NotFound:
+            # Un message a déjà été supprimé: repli sur la suppression individuelle
+            for message in batch:
+                await self._delete_single(message)
+            return
+        except discord.Forbidden:
+            raise
+        except discord.HTTPException:
+            self.result.failed += len(batch)
+        if len(batch) > 1:
+            self.result.bulk_requests += 1
+        else:
+            self.result.single_requests += 1
+        await self._maybe_report()
+
+    async def _delete_single(self, message: discord.Message) -> None:
+        """Suppression individuelle limitée en débit"""
+        try:
+            await message.delete()
+            self.result.deleted += 1
+        except discord.NotFound:
+            pass
+        except discord.Forbidden:
+            raise
+        except discord.HTTPException:
+            self.result.failed += 1
+        self.result.single_requests += 1
+        await self._maybe_report()
+        await asyncio.sleep(self.single_delay)
+
+    async def _maybe_report(self) -> None:
+        """Signale la progression au plus une fois par intervalle"""
+        if self.on_progress is None:
+            return
+        now = time.monotonic()
+        if now - self._last_progress < self.progress_interval:
+            return
+        self._last_progress = now
+        try:
+            await self.on_progress(self.result)
+        except discord.HTTPException:
+            pass
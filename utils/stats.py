@@ -0,0 +1,83 @@
+import discord
+from typing import Dict
+
+# Regroupement des types de canaux affichés
+CHANNEL_KINDS = {
+    discord.ChannelType.text: 'text',
+    discord.ChannelType.news: 'text',
+    discord.ChannelType.forum: 'text',
+    discord.ChannelType.voice: 'voice',
+    discord.ChannelType.stage_voice: 'voice',
+    discord.ChannelType.category: 'category'
+}
+
+class GuildStats:
+    """Compteurs d'un serveur, mis à jour en O(1) à chaque événement"""
+
+    __slots__ = ('humans', 'bots', 'channels', 'boosts')
+
+    def __init__(self, guild: discord.Guild):
+        # Seul parcours complet: à l'initialisation, une fois le serveur chargé
+        self.bots = sum(1 for member in guild.members if member.bot)
+        self.humans = len(guild.members) - self.bots
+        self.channels = {'text': 0, 'voice': 0, 'category': 0, 'other': 0}
+        for channel in guild.channels:
+            self.channels[CHANNEL_KINDS.get(channel.type, 'other')] += 1
+        self.boosts = guild.premium_subscription_count or 0
+
+class StatsTracker:
+    """Statistiques de tous les serveurs, avec totaux globaux tenus à jour"""
+
+    def __init__(self):
+        self.guilds: Dict[int, GuildStats] = {}
+        self.total_humans = 0
+        self.total_bots = 0
+
+    def get(self, guild: discord.Guild) -> GuildStats:
+        """Statistiques d'un serveur (initialisées au premier accès si besoin)"""
+        stats = self.guilds.get(guild.id)
+        if stats is None:
+            stats = self.initialize(guild)
+        return stats
+
+    def initialize(self, guild: discord.Guild) -> GuildStats:
+        """(Ré)initialise les compteurs d'un serveur"""
+        self.remove(guild.id)
+        stats = GuildStats(guild)
+        self.guilds[guild.id] = stats
+        self.total_humans += stats.humans
+        self.total_bots += stats.bots
+        return stats
+
+    def remove(self, guild_id: int) -> None:
+        stats = self.guilds.pop(guild_id, None)
+        if stats is not None:
+            self.total_humans -= stats.humans
+            self.total_bots -= stats.bots
+
+    def member_joined(self, member: discord.Member, delta: int = 1) -> None:
+        stats = self.guilds.get(member.guild.id)
+        if stats is None:
+            return
+        if member.bot:
+            stats.bots += delta
+            self.total_bots += delta
+        else:
+            stats.humans += delta
+            self.total_humans += delta
+
+    def member_left(self, member: discord.Member) -> None:
+        self.member_joined(member, -1)
+
+    def channel_created(self, channel: discord.abc.GuildChannel, delta: int = 1) -> None:
+        stats = self.guilds.get(channel.guild.id)
+        if stats is not None:
+            stats.channels[CHANNEL_KINDS.get(channel.type, 'other')] += delta
+
+    def channel_deleted(self, channel: discord.abc.GuildChannel) -> None:
+        self.channel_created(channel, -1)
+
+    def guild_updated(self, guild: discord.Guild) -> None:
+        stats = self.guilds.get(guild.id)
+        if stats is not None:
+            stats.boosts = guild.premium_subscription_count or 0
@@ -0,0 +1,134 @@
+import discord
+import asyncio
+import gzip
+import html
+import io
+import os
+from datetime import datetime
+from typing import Awaitable, BinaryIO, Callable, Iterable, Optional, Tuple
+
+# Dossier des transcriptions archivées sur disque
+TRANSCRIPT_DIR = 'data/transcripts'
+
+class TranscriptWriter:
+    """Écrit une transcription de messages au fil de l'eau dans un flux binaire"""
+
+    FORMATS = ('txt', 'html')
+
+    def __init__(self, stream: BinaryIO, fmt: str = 'txt', title: str = "Transcription"):
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Format de transcription inconnu: {fmt}")
+        self.stream = stream
+        self.fmt = fmt
+        self.title = title
+        self.count = 0
+        self._closed = False
+        self._write_header()
+
+    def _write(self, text: str) -> None:
+        self.stream.write(text.encode('utf-8'))
+
+    def _write_header(self) -> None:
+        generated = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
+        if self.fmt == 'html':
+            self._write(
+                "<!DOCTYPE html>\n<html>\n<head><meta charset=\"utf-8\">"
+                f"<title>{html.escape(self.title)}</title>"
+                "<style>body{font-family:sans-serif;background:#36393f;color:#dcddde}"
+                ".msg{margin:4px 0}.author{font-weight:bold;color:#fff}"
+                ".time{color:#72767d;font-size:0.8em}.att{color:#00aff4}</style></head>\n<body>\n"
+                f"<h1>{html.escape(self.title)}</h1>\n<p class=\"time\">Générée le {generated}</p>\n"
+            )
+        else:
+            self._write(f"{self.title}\nGénérée le {generated}\n{'=' * 60}\n")
+
+    def write_message(self, message: discord.Message) -> None:
+        """Ajoute un message à la transcription"""
+        timestamp = message.created_at.strftime('%Y-%m-%d %H:%M:%S')
+        author = f"{message.author} ({message.author.id})"
+        attachments = [att.url for att in message.attachments]
+
+        if self.fmt == 'html':
+            parts = [
+                f"<div class=\"msg\"><span class=\"time\">[{timestamp}]</span> ",
+                f"<span class=\"author\">{html.escape(author)}</span>: ",
+                html.escape(message.content or "").replace("\n", "<br>")
+            ]
+            for url in attachments:
+                parts.append(f"<br><a class=\"att\" href=\"{html.escape(url)}\">📎 {html.escape(url)}</a>")
+            parts.append("</div>\n")
+            self._write("".join(parts))
+        else:
+            lines = [f"[{timestamp}] {author}: {message.content or ''}"]
+            lines.extend(f"    📎 {url}" for url in attachments)
+            if message.embeds:
+                lines.append(f"    ({len(message.embeds)} embed(s))")
+            self._write("\n".join(lines) + "\n")
+
+        self.count += 1
+
+    def write_note(self, note: str) -> None:
+        """Ajoute une ligne d'information hors message"""
+        if self.fmt == 'html':
+            self._write(f"<p class=\"time\">{html.escape(note)}</p>\n")
+        else:
+            self._write(f"-- {note}\n")
+
+    def close(self) -> None:
+        """Termine la transcription (pied de page)"""
+        if self._closed:
+            return
+        if self.fmt == 'html':
+            self._write(f"<p class=\"time\">{self.count} message(s)</p>\n</body>\n</html>\n")
+        else:
+            self._write(f"{'=' * 60}\n{self.count} message(s)\n")
+        self._closed = True
+
+def build_transcript_file(messages: Iterable[discord.Message], filename: str, fmt: str = 'txt',
+                          title: str = "Transcription", missing: int = 0) -> discord.File:
+    """Construit une pièce jointe Discord contenant la transcription des messages"""
+    buffer = io.BytesIO()
+    writer = TranscriptWriter(buffer, fmt, title)
+    for message in sorted(messages, key=lambda m: m.id):
+        writer.write_message(message)
+    if missing:
+        writer.write_note(f"{missing} message(s) non présents en cache (contenu indisponible)")
+    writer.close()
+    buffer.seek(0)
+    return discord.File(buffer, filename=f"{filename}.{fmt}")
+
+async def export_channel_history(channel: discord.TextChannel, fmt: str = 'txt',
+                                 on_progress: Optional[Callable[[int], Awaitable[None]]] = None,
+                                 page_size: int = 100) -> Tuple[str, int]:
+    """Archive tout l'historique d'un canal dans une transcription compressée sur disque
+
+    L'historique est lu au fil de l'eau et écrit page par page: seule une page
+    de messages est gardée en mémoire. Renvoie (chemin du fichier, nombre de messages).
+    """
+    directory = os.path.join(TRANSCRIPT_DIR, str(channel.guild.id))
+    await asyncio.to_thread(os.makedirs, directory, exist_ok=True)
+    path = os.path.join(directory, f"{channel.id}-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.{fmt}.gz")
+
+    page = io.BytesIO()
+    writer = TranscriptWriter(page, fmt, f"Historique de #{channel.name}")
+    archive = await asyncio.to_thread(gzip.open, path, 'wb')
+    try:
+        async for message in channel.history(limit=None, oldest_first=True):
+            writer.write_message(message)
+            if writer.count % page_size == 0:
+                await _flush_page(archive, page)
+                if on_progress:
+                    await on_progress(writer.count)
+        writer.close()
+        await _flush_page(archive, page)
+    finally:
+        await asyncio.to_thread(archive.close)
+    return path, writer.count
+
+async def _flush_page(archive, page: io.BytesIO) -> None:
+    """Compresse et écrit la page courante hors de la boucle d'événements, puis la vide"""
+    chunk = page.getvalue()
+    page.seek(0)
+    page.truncate()
+    if chunk:
+        await asyncio.to_thread(archive.write, chunk)
@@ -0,0 +1,70 @@
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Tuple
+
+# Un score n'est recalculé qu'après ce nombre de messages ou cette durée (jamais à chaque message)
+TRUST_MESSAGE_STEP = 25
+TRUST_REFRESH_SECONDS = 3600
+
+# Ancienneté et nombre de messages donnant le maximum de points (50 chacun)
+TENURE_FULL_DAYS = 90
+MESSAGES_FULL = 500
+# Points retirés par avertissement actif (score avec décroissance)
+WARNING_PENALTY = 25
+
+def trust_score(tenure_days: float, messages: int, warning_score: float) -> int:
+    """Score de confiance de 0 à 100"""
+    score = 50 * min(tenure_days / TENURE_FULL_DAYS, 1) + 50 * min(messages / MESSAGES_FULL, 1)
+    score -= WARNING_PENALTY * warning_score
+    return max(0, min(100, round(score)))
+
+class MemberTrust:
+    """Score en cache d'un membre et compteur de messages depuis le démarrage du bot"""
+
+    __slots__ = ('messages', 'score', 'next_messages', 'refresh_at')
+
+    def __init__(self):
+        self.messages = 0
+        self.score = 0
+        self.next_messages = 0  # recalcul dès le premier message
+        self.refresh_at = 0.0
+
+class TrustTracker:
+    """Scores de confiance par serveur, recalculés par paliers de messages, après un délai ou un avertissement"""
+
+    def __init__(self, warning_score: Callable[[int, int], float]):
+        self.warning_score = warning_score
+        self.members: Dict[Tuple[int, int], MemberTrust] = {}
+
+    def record_message(self, member) -> int:
+        """Compte un message et renvoie le score en cache (recalculé seulement s'il est périmé)"""
+        key = (member.guild.id, member.id)
+        trust = self.members.get(key)
+        if trust is None:
+            trust = self.members[key] = MemberTrust()
+
+        trust.messages += 1
+        if trust.messages >= trust.next_messages or time.monotonic() >= trust.refresh_at:
+            self._refresh(member, trust)
+        return trust.score
+
+    def _refresh(self, member, trust: MemberTrust) -> None:
+        tenure_days = 0.0
+        if member.joined_at:
+            tenure_days = (datetime.now(timezone.utc) - member.joined_at).total_seconds() / 86400
+        trust.score = trust_score(tenure_days, trust.messages, self.warning_score(member.guild.id, member.id))
+        trust.next_messages = trust.messages + TRUST_MESSAGE_STEP
+        trust.refresh_at = time.monotonic() + TRUST_REFRESH_SECONDS
+
+    def invalidate(self, guild_id: int, user_id: int) -> None:
+        """Force le recalcul au prochain message (avertissement ajouté ou effacé)"""
+        trust = self.members.get((guild_id, user_id))
+        if trust is not None:
+            trust.refresh_at = 0.0
+
+    def get(self, guild_id: int, user_id: int) -> int:
+        trust = self.members.get((guild_id, user_id))
+        return trust.score if trust else 0
+
+    def forget(self, guild_id: int, user_id: int) -> None:
+        self.members.pop((guild_id, user_id), None)
@@ -0,0 +1,76 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+class VoiceSession:
+    """Session vocale d'un membre: début, canaux visités et durée"""
+
+    __slots__ = ('member_id', 'start', 'channels', 'moves', 'end')
+
+    def __init__(self, member_id: int, channel_id: int, start: Optional[datetime]):
+        self.member_id = member_id
+        self.start = start
+        self.channels: List[int] = [channel_id]
+        self.moves = 0
+        self.end: Optional[datetime] = None
+
+    def move(self, channel_id: int) -> None:
+        """Enregistre un changement de canal"""
+        self.moves += 1
+        if channel_id not in self.channels:
+            self.channels.append(channel_id)
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Durée de la session en secondes (None si le début est inconnu)"""
+        if self.start is None:
+            return None
+        return ((self.end or datetime.utcnow()) - self.start).total_seconds()
+
+class VoiceSessionTracker:
+    """Suivi en mémoire des sessions vocales par serveur"""
+
+    def __init__(self):
+        self.active: Dict[Tuple[int, int], VoiceSession] = {}  # (guild_id, member_id) -> session
+        self.finished: Dict[int, List[VoiceSession]] = {}  # guild_id -> sessions terminées (digest)
+
+    def join(self, guild_id: int, member_id: int, channel_id: int) -> VoiceSession:
+        session = VoiceSession(member_id, channel_id, datetime.utcnow())
+        self.active[(guild_id, member_id)] = session
+        return session
+
+    def move(self, guild_id: int, member_id: int, from_id: int, to_id: int) -> VoiceSession:
+        session = self.active.get((guild_id, member_id))
+        if session is None:
+            # Session commencée avant le démarrage du bot
+            session = VoiceSession(member_id, from_id, None)
+            self.active[(guild_id, member_id)] = session
+        session.move(to_id)
+        return session
+
+    def leave(self, guild_id: int, member_id: int, channel_id: int) -> VoiceSession:
+        session = self.active.pop((guild_id, member_id), None)
+        if session is None:
+            session = VoiceSession(member_id, channel_id, None)
+        session.end = datetime.utcnow()
+        return session
+
+    def queue_for_digest(self, guild_id: int, session: VoiceSession) -> None:
+        self.finished.setdefault(guild_id, []).append(session)
+
+    def drain_digests(self) -> Dict[int, List[VoiceSession]]:
+        """Récupère et vide les sessions en attente de digest"""
+        finished, self.finished = self.finished, {}
+        return finished
+
+def format_duration(seconds: Optional[float]) -> str:
+    """Formate une durée en texte lisible"""
+    if seconds is None:
+        return "Inconnue"
+    seconds = int(seconds)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, secs = divmod(remainder, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}"
+    if minutes:
+        return f"{minutes}min {secs:02d}s"
+    return f"{secs}s"
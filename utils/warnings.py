@@ -0,0 +1,71 @@
+import math
+import time
+from array import array
+from typing import Optional
+
+def current_day() -> int:
+    """Numéro du jour courant (jours depuis l'epoch UTC)"""
+    return int(time.time() // 86400)
+
+class WarningBuckets:
+    """Avertissements d'un membre, comptés par jour dans un petit tableau
+
+    La mémoire reste bornée: les jours au-delà de la durée d'expiration sont compactés.
+    """
+
+    __slots__ = ('start_day', 'counts')
+
+    def __init__(self):
+        self.start_day: Optional[int] = None
+        self.counts = array('H')  # counts[i] = avertissements du jour start_day + i
+
+    def add(self, day: int) -> None:
+        """Ajoute un avertissement au jour donné"""
+        if self.start_day is None:
+            self.start_day = day
+        offset = day - self.start_day
+        if offset >= len(self.counts):
+            self.counts.extend([0] * (offset + 1 - len(self.counts)))
+        if self.counts[offset] < 0xFFFF:
+            self.counts[offset] += 1
+
+    def compact(self, today: int, expiry_days: int) -> None:
+        """Supprime les jours expirés"""
+        if self.start_day is None:
+            return
+        expired = (today - expiry_days + 1) - self.start_day
+        if expired <= 0:
+            return
+        if expired >= len(self.counts):
+            self.start_day = None
+            self.counts = array('H')
+            return
+        del self.counts[:expired]
+        self.start_day += expired
+        # Retirer aussi les jours vides en tête
+        while self.counts and self.counts[0] == 0:
+            del self.counts[0]
+            self.start_day += 1
+        if not self.counts:
+            self.start_day = None
+
+    def score(self, today: int, half_life_days: float, expiry_days: int) -> float:
+        """Score actif: chaque avertissement perd la moitié de son poids par demi-vie (O(jours))"""
+        if self.start_day is None:
+            return 0.0
+        total = 0.0
+        for offset, count in enumerate(self.counts):
+            if not count:
+                continue
+            age = today - (self.start_day + offset)
+            if age >= expiry_days:
+                continue
+            total += count if half_life_days <= 0 else count * 0.5 ** (age / half_life_days)
+        return total
+
+    def __bool__(self) -> bool:
+        return self.start_day is not None
+
+def active_warning_count(score: float) -> int:
+    """Nombre d'avertissements actifs utilisé pour les sanctions (arrondi au plus proche)"""
+    return math.floor(score + 0.5)